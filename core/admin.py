@@ -1,7 +1,9 @@
 from django.contrib import admin
 from .models.academic import Discente, Disciplina, Livro
 from .models.simulation import MatriculaSimulada, ReservaSimulada
-from .models.enrollment import Matricula, MatriculaDisciplina, ReservaLivro
+from .models.enrollment import (
+    Matricula, MatriculaDisciplina, EsperaDisciplina, ReservaLivro, EsperaLivro,
+)
 
 @admin.register(Discente)
 class DiscenteAdmin(admin.ModelAdmin):
@@ -35,8 +37,9 @@ class ReservaSimuladaAdmin(admin.ModelAdmin):
 
 @admin.register(Matricula)
 class MatriculaAdmin(admin.ModelAdmin):
-    list_display = ("id", "discente", "periodo", "ativa", "criada_em")
+    list_display = ("id", "discente", "periodo", "ativa", "disciplinas_ativas", "criada_em")
     list_filter = ("ativa", "periodo")
+    list_select_related = ("discente",)
     search_fields = ("discente__nome",)
 
 
@@ -44,11 +47,28 @@ class MatriculaAdmin(admin.ModelAdmin):
 class MatriculaDisciplinaAdmin(admin.ModelAdmin):
     list_display = ("id", "matricula", "disciplina", "ativa", "adicionada_em")
     list_filter = ("ativa", "disciplina__curso")
+    list_select_related = ("matricula__discente", "disciplina")
     search_fields = ("matricula__discente__nome", "disciplina__nome")
 
 
+@admin.register(EsperaDisciplina)
+class EsperaDisciplinaAdmin(admin.ModelAdmin):
+    list_display = ("id", "disciplina", "periodo", "senha", "discente", "ativa", "promovida_em")
+    list_filter = ("ativa", "periodo")
+    list_select_related = ("discente", "disciplina")
+    search_fields = ("discente__nome", "disciplina__nome")
+
+
 @admin.register(ReservaLivro)
 class ReservaLivroAdmin(admin.ModelAdmin):
     list_display = ("id", "discente", "livro", "ativa", "reservada_em")
     list_filter = ("ativa", "livro__status")
     search_fields = ("discente__nome", "livro__titulo")
+
+
+@admin.register(EsperaLivro)
+class EsperaLivroAdmin(admin.ModelAdmin):
+    list_display = ("id", "livro", "senha", "discente", "ativa", "atendida_em")
+    list_filter = ("ativa",)
+    list_select_related = ("discente", "livro")
+    search_fields = ("discente__nome", "livro__titulo")
@@ -9,6 +9,8 @@ class CoreConfig(AppConfig):
     _inicializado = False
 
     def ready(self):
+        from . import signals  # noqa: F401
+
         if 'runserver' not in sys.argv and 'gunicorn' not in sys.argv[0]:
             return
         if os.environ.get("RUN_MAIN") != "true":
@@ -17,36 +19,61 @@ class CoreConfig(AppConfig):
             return
         CoreConfig._inicializado = True
 
-        from .models import (
-            Discente, Disciplina, Livro,
-            Matricula, MatriculaDisciplina, ReservaLivro,
-            MatriculaSimulada, ReservaSimulada
-        )
+        from django.conf import settings
+        from .services.warmup_service import WarmupService
 
-        print("\n" + "=" * 60)
-        print("LIMPEZA DE SESSAO: Removendo dados persistidos anteriores...")
-        print("=" * 60)
+        if getattr(settings, "SINCRONIZACAO_INCREMENTAL", False):
+            sincronizar = self._sincronizar_incremental
+        else:
+            sincronizar = self._limpar_e_recarregar
 
-        MatriculaDisciplina.objects.all().delete()
-        Matricula.objects.all().delete()
-        ReservaLivro.objects.all().delete()
-        Discente.objects.all().delete()
-        Disciplina.objects.all().delete()
-        Livro.objects.all().delete()
-        MatriculaSimulada.objects.all().delete()
-        ReservaSimulada.objects.all().delete()
+        if getattr(settings, "SNAPSHOT_HABILITADO", False):
+            from .services.initialization_service import InitializationService
 
-        print("[OK] Banco de dados limpo com sucesso!\n")
+            sucesso, msg = InitializationService.hidratar_do_snapshot()
+            print(f"\n[{'OK' if sucesso else 'INFO'}] {msg}")
+            if sucesso:
+                # Cache já utilizável: atualiza do upstream sem apagar nada.
+                print("[INFO] Atualizando a partir dos microsservicos em background...\n")
+                WarmupService.iniciar_em_background(
+                    self._sincronizar_incremental, ao_concluir=self._reportar
+                )
+                return
 
-        print("INICIALIZACAO: Consumindo Microsservicos (Cache Unico)...")
-        print("=" * 60)
+        if getattr(settings, "INICIALIZACAO_EM_BACKGROUND", False):
+            print("\n[INFO] Sincronizacao de startup rodando em background "
+                  "(estado em /health/). Servindo dados locais enquanto isso.\n")
+            WarmupService.iniciar_em_background(sincronizar, ao_concluir=self._reportar)
+            return
 
-        from .services.initialization_service import InitializationService
-        sucesso, msg = InitializationService.inicializar_sistema(forcar_reinicializacao=True)
+        sucesso, msg = WarmupService.executar(sincronizar)
+        self._reportar(sucesso, msg)
 
+    @staticmethod
+    def _reportar(sucesso: bool, msg: str) -> None:
         if sucesso:
             print(f"[OK] {msg}")
         else:
             print(f"[ERRO] Falha na sincronizacao: {msg}")
 
         print("=" * 60 + "\n")
+
+    @staticmethod
+    def _sincronizar_incremental() -> tuple[bool, str]:
+        from .services.initialization_service import InitializationService
+
+        print("\n" + "=" * 60)
+        print("SINCRONIZACAO INCREMENTAL: Mantendo cache local e aplicando diferencas...")
+        print("=" * 60)
+
+        return InitializationService.sincronizar_incremental()
+
+    @staticmethod
+    def _limpar_e_recarregar() -> tuple[bool, str]:
+        from .services.initialization_service import InitializationService
+
+        print("\n" + "=" * 60)
+        print("INICIALIZACAO: Limpando a sessao anterior e consumindo Microsservicos (Cache Unico)...")
+        print("=" * 60)
+
+        return InitializationService.inicializar_sistema(forcar_reinicializacao=True, limpar=True)
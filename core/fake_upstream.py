@@ -0,0 +1,192 @@
+'''Servidor HTTP local que imita os três microsserviços externos.
+
+Serve os mesmos contratos de msAluno, msDisciplina e biblioteca com dados
+sintéticos determinísticos (mesma semente, mesmos dados), para rodar
+benchmarks de gateway e de sincronização sem depender da AWS:
+
+- GET /msAluno                          lista de discentes
+- GET /msAluno/<id>                     um discente (404 se não existir)
+- GET /disciplinaServico/msDisciplina   lista de disciplinas
+- GET /acervo/biblioteca                lista de livros
+
+Latência, taxa de erro e corpo lento são configuráveis, e as listas
+respondem com ETag (e 304 para If-None-Match igual).
+'''
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+
+CAMINHOS = {
+    'discentes': '/msAluno',
+    'disciplinas': '/disciplinaServico/msDisciplina',
+    'livros': '/acervo/biblioteca',
+}
+
+_CURSOS = ['Engenharia de Software', 'Ciência da Computação', 'Sistemas de Informação', 'Direito']
+_MODALIDADES = ['Presencial', 'EAD']
+_STATUS_DISCENTE = ['Ativo', 'Ativo', 'Ativo', 'Trancado', 'Formado']
+_STATUS_LIVRO = ['Disponível', 'Disponível', 'Disponível', 'Emprestado']
+
+
+@dataclass
+class ConfiguracaoFake:
+    discentes: int = 1000
+    disciplinas: int = 100
+    livros: int = 5000
+    latencia: float = 0.0        # segundos antes de responder
+    jitter: float = 0.0          # variação aleatória somada à latência (0..jitter)
+    taxa_erro: float = 0.0       # fração das requisições respondida com 503
+    corpo_lento: float = 0.0     # segundos para transmitir cada corpo, em pedaços
+    semente: int = 42
+
+
+def gerar_dados(config: ConfiguracaoFake) -> Dict[str, List[Dict[str, Any]]]:
+    '''Gera os três catálogos de forma determinística a partir da semente.'''
+    rng = random.Random(config.semente)
+    discentes = [
+        {
+            'id': i,
+            'nome': f'Discente {i}',
+            'curso': rng.choice(_CURSOS),
+            'modalidade': rng.choice(_MODALIDADES),
+            'status': rng.choice(_STATUS_DISCENTE),
+        }
+        for i in range(1, config.discentes + 1)
+    ]
+    disciplinas = [
+        {
+            'id': i,
+            'curso': rng.choice(_CURSOS),
+            'nome': f'Disciplina {i}',
+            'vagas': rng.randint(0, 60),
+        }
+        for i in range(1, config.disciplinas + 1)
+    ]
+    livros = [
+        {
+            'id': i,
+            'titulo': f'Livro {i}',
+            'autor': f'Autor {rng.randint(1, 500)}',
+            'ano': rng.randint(1950, 2025),
+            'status': rng.choice(_STATUS_LIVRO),
+        }
+        for i in range(1, config.livros + 1)
+    ]
+    return {'discentes': discentes, 'disciplinas': disciplinas, 'livros': livros}
+
+
+class ServidorFake(ThreadingHTTPServer):
+    '''ThreadingHTTPServer com os catálogos já serializados em memória.'''
+
+    daemon_threads = True
+
+    def __init__(self, endereco: Tuple[str, int], config: ConfiguracaoFake) -> None:
+        super().__init__(endereco, _Handler)
+        self.config = config
+        self.dados = gerar_dados(config)
+        self.discentes_por_id = {d['id']: d for d in self.dados['discentes']}
+        # Corpo e ETag pré-calculados: o custo medido é o do cliente, não o do fake.
+        self.corpos: Dict[str, Tuple[bytes, str]] = {}
+        for fonte, itens in self.dados.items():
+            corpo = json.dumps(itens, ensure_ascii=False).encode('utf-8')
+            self.corpos[CAMINHOS[fonte]] = (corpo, '"%s"' % hashlib.sha1(corpo).hexdigest())
+        self._rng = random.Random(config.semente + 1)
+        self._rng_lock = threading.Lock()
+        self.requisicoes = 0
+
+    @property
+    def url_base(self) -> str:
+        host, porta = self.server_address[:2]
+        return f'http://{host}:{porta}'
+
+    def urls(self) -> Dict[str, str]:
+        '''URLs base de cada serviço, no formato das settings MS_*_BASE_URL.'''
+        return {fonte: self.url_base + caminho for fonte, caminho in CAMINHOS.items()}
+
+    def sortear(self) -> Tuple[float, bool]:
+        '''(latência, erro?) da próxima requisição.'''
+        with self._rng_lock:
+            self.requisicoes += 1
+            atraso = self.config.latencia + self._rng.uniform(0, self.config.jitter)
+            return atraso, self._rng.random() < self.config.taxa_erro
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: ServidorFake
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:
+        atraso, erro = self.server.sortear()
+        if atraso:
+            time.sleep(atraso)
+        if erro:
+            self._responder(503, b'{"erro": "falha injetada"}', {'Retry-After': '0'})
+            return
+
+        caminho = self.path.split('?', 1)[0].rstrip('/')
+        if caminho in self.server.corpos:
+            corpo, etag = self.server.corpos[caminho]
+            if self.headers.get('If-None-Match') == etag:
+                self._responder(304, b'', {'ETag': etag})
+            else:
+                self._responder(200, corpo, {'ETag': etag})
+            return
+
+        prefixo = CAMINHOS['discentes'] + '/'
+        if caminho.startswith(prefixo) and caminho[len(prefixo):].isdigit():
+            discente = self.server.discentes_por_id.get(int(caminho[len(prefixo):]))
+            if discente is None:
+                self._responder(404, b'{"erro": "discente nao encontrado"}')
+            else:
+                self._responder(200, json.dumps(discente, ensure_ascii=False).encode('utf-8'))
+            return
+
+        self._responder(404, b'{"erro": "rota desconhecida"}')
+
+    def _responder(self, status: int, corpo: bytes, headers: Dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        if status != 304:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        for nome, valor in (headers or {}).items():
+            self.send_header(nome, valor)
+        self.end_headers()
+
+        if not corpo:
+            return
+        if not self.server.config.corpo_lento:
+            self.wfile.write(corpo)
+            return
+
+        # Corpo lento: 20 pedaços espalhados ao longo de `corpo_lento` segundos.
+        pedacos = 20
+        tamanho = max(1, -(-len(corpo) // pedacos))
+        for inicio in range(0, len(corpo), tamanho):
+            self.wfile.write(corpo[inicio:inicio + tamanho])
+            self.wfile.flush()
+            time.sleep(self.server.config.corpo_lento / pedacos)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def iniciar_em_background(
+    config: ConfiguracaoFake | None = None,
+    host: str = '127.0.0.1',
+    porta: int = 0,
+) -> ServidorFake:
+    '''Sobe o servidor em um thread daemon (porta 0: porta livre qualquer).
+
+    Pare com `servidor.shutdown()` e `servidor.server_close()`.
+    '''
+    servidor = ServidorFake((host, porta), config or ConfiguracaoFake())
+    threading.Thread(target=servidor.serve_forever, name='upstream-fake', daemon=True).start()
+    return servidor
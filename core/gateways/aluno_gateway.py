@@ -1,12 +1,127 @@
 '''Gateway para o microsserviço de Discentes (msAluno).'''
 
-from .base_client import BaseHttpClient
+import threading
 
-MS_ALUNO_BASE_URL = "https://rmi6vdpsq8.execute-api.us-east-2.amazonaws.com/msAluno"
+from django.conf import settings
 
-client = BaseHttpClient(MS_ALUNO_BASE_URL)
+from .base_client import HttpResult
+from .cache import TTLCache
+from .single_flight import SingleFlight
+from .upstreams import criar_cliente, obter_upstream
 
+UPSTREAM = obter_upstream("discentes")
+MS_ALUNO_BASE_URL = UPSTREAM.url
 
-def buscar_discente_por_id(discente_id: int):
-    '''Obtém dados de um discente pelo ID.'''
-    return client.get(str(discente_id))
+client = criar_cliente("discentes")
+
+# Lista completa do msAluno, com o timeout de leitura do catálogo.
+client_lista = criar_cliente("discentes", catalogo=True)
+
+cache_discentes = TTLCache(
+    max_itens=getattr(settings, "GATEWAY_DISCENTE_CACHE_MAX", 1024),
+    ttl=UPSTREAM.cache_ttl,
+    ttl_negativo=getattr(settings, "GATEWAY_DISCENTE_CACHE_TTL_NEGATIVO", 10.0),
+    stale=getattr(settings, "GATEWAY_DISCENTE_CACHE_STALE", 0.0),
+)
+
+# Buscas simultâneas do mesmo discente viram uma única chamada ao upstream.
+buscas_em_andamento = SingleFlight()
+
+_revalidando: set[int] = set()
+_revalidando_lock = threading.Lock()
+
+
+def buscar_discente_por_id(discente_id: int, usar_cache: bool = True) -> HttpResult:
+    '''Obtém dados de um discente pelo ID.
+
+    Com `usar_cache`, respostas recentes (inclusive 404) são servidas do
+    cache em memória sem ir ao upstream; entradas obsoletas dentro da
+    janela de stale-while-revalidate são servidas e atualizadas em background.
+    '''
+    if not usar_cache:
+        return _buscar_e_guardar(discente_id)
+
+    estado, valor = cache_discentes.obter(discente_id)
+    if estado == TTLCache.FRESCO:
+        return _resultado_do_cache(valor)
+    if estado == TTLCache.NEGATIVO:
+        return HttpResult(
+            ok=False,
+            data=None,
+            status_code=404,
+            error=f"Discente {discente_id} não encontrado (cache)",
+            elapsed=0.0,
+            do_cache=True,
+        )
+    if estado == TTLCache.OBSOLETO:
+        _revalidar_em_background(discente_id)
+        return _resultado_do_cache(valor)
+
+    return _buscar_e_guardar(discente_id)
+
+
+def listar_discentes() -> HttpResult:
+    '''Retorna todos os discentes do serviço externo em uma chamada.'''
+    return buscas_em_andamento.executar("listar", client_lista.get)
+
+
+async def buscar_discente_por_id_async(discente_id: int, usar_cache: bool = True) -> HttpResult:
+    '''Versão assíncrona de `buscar_discente_por_id`, com o mesmo cache.'''
+    if usar_cache:
+        estado, valor = cache_discentes.obter(discente_id)
+        if estado == TTLCache.FRESCO:
+            return _resultado_do_cache(valor)
+        if estado == TTLCache.NEGATIVO:
+            return HttpResult(
+                ok=False,
+                data=None,
+                status_code=404,
+                error=f"Discente {discente_id} não encontrado (cache)",
+                elapsed=0.0,
+                do_cache=True,
+            )
+        if estado == TTLCache.OBSOLETO:
+            _revalidar_em_background(discente_id)
+            return _resultado_do_cache(valor)
+
+    from .async_client import AsyncHttpClient
+
+    result = await criar_cliente("discentes", AsyncHttpClient).aget(str(discente_id))
+    _guardar_resultado(discente_id, result)
+    return result
+
+
+def _resultado_do_cache(data) -> HttpResult:
+    return HttpResult(ok=True, data=data, status_code=200, error=None, elapsed=0.0, do_cache=True)
+
+
+def _buscar_e_guardar(discente_id: int) -> HttpResult:
+    def buscar() -> HttpResult:
+        result = client.get(str(discente_id))
+        _guardar_resultado(discente_id, result)
+        return result
+
+    return buscas_em_andamento.executar(discente_id, buscar)
+
+
+def _guardar_resultado(discente_id: int, result: HttpResult) -> None:
+    if result.ok and result.data:
+        cache_discentes.guardar(discente_id, result.data)
+    elif result.status_code == 404:
+        cache_discentes.guardar_negativo(discente_id)
+
+
+def _revalidar_em_background(discente_id: int) -> None:
+    with _revalidando_lock:
+        if discente_id in _revalidando:
+            return
+        _revalidando.add(discente_id)
+
+    def alvo() -> None:
+        try:
+            _buscar_e_guardar(discente_id)
+        finally:
+            with _revalidando_lock:
+                _revalidando.discard(discente_id)
+
+    threading.Thread(target=alvo, name=f"revalidar-discente-{discente_id}", daemon=True).start()
@@ -0,0 +1,143 @@
+'''Cliente HTTP assíncrono (httpx) para deploys ASGI.
+
+Reaproveita do `BaseHttpClient` o disjuntor, os validadores condicionais,
+a política de retentativas e a interpretação das respostas; só o
+transporte e a espera entre tentativas passam a ser assíncronos.
+'''
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import weakref
+from typing import Mapping, Optional, Tuple
+
+import httpx
+from django.conf import settings
+
+from .base_client import (
+    BaseHttpClient,
+    HttpResult,
+    _cabecalhos_condicionais,
+    _chave,
+    _obter_validadores,
+)
+
+# Um AsyncClient por event loop: conexões httpx não podem ser usadas fora
+# do loop em que foram abertas.
+_clientes: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+_clientes_lock = threading.Lock()
+
+# Equivalentes ao requests.ConnectionError do cliente síncrono: o pedido
+# não chegou ao servidor (ou a conexão caiu), então repetir é seguro. Os
+# demais erros (ex.: ReadTimeout) não são repetidos, mas contam como falha
+# no breaker.
+_ERROS_RETENTAVEIS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+
+
+def obter_cliente_async() -> httpx.AsyncClient:
+    '''Retorna o pool httpx compartilhado do event loop atual.'''
+    loop = asyncio.get_running_loop()
+    with _clientes_lock:
+        cliente = _clientes.get(loop)
+        if cliente is None or cliente.is_closed:
+            maxsize = getattr(settings, "GATEWAY_HTTP_POOL_MAXSIZE", 10)
+            cliente = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=maxsize * getattr(settings, "GATEWAY_HTTP_POOL_CONNECTIONS", 10),
+                    max_keepalive_connections=maxsize,
+                ),
+            )
+            _clientes[loop] = cliente
+        return cliente
+
+
+async def fechar_cliente_async() -> None:
+    '''Fecha o pool do event loop atual (ex.: no shutdown do lifespan ASGI).'''
+    loop = asyncio.get_running_loop()
+    with _clientes_lock:
+        cliente = _clientes.pop(loop, None)
+    if cliente is not None:
+        await cliente.aclose()
+
+
+class AsyncHttpClient(BaseHttpClient):
+    '''Versão assíncrona do BaseHttpClient: `aget` não bloqueia o event loop.'''
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._adormir = asyncio.sleep
+
+    async def aget(
+        self,
+        path: str = "",
+        params: Optional[Mapping[str, str]] = None,
+        prazo: float | None = None,
+    ) -> HttpResult:
+        '''GET assíncrono com as mesmas retentativas e prazo do `get`.'''
+        url = self._url(path)
+        chave = _chave(url, params)
+        prazo = prazo if prazo is not None else self.prazo
+
+        inicio = time.time()
+        limite = inicio + prazo if prazo is not None else None
+        retentativas = 0
+
+        breaker = self.breaker
+
+        while True:
+            if not breaker.permitir():
+                if retentativas == 0:
+                    return self._resultado_circuito_aberto(inicio)
+                break
+
+            # Cancelamento (wait_for, cliente desconectado) também conta como
+            # falha: a vaga de teste do meio-aberto não fica ocupada
+            with breaker.falha_em_excecao():
+                result, espera, retentavel = await self._atentar(
+                    url, params, chave, self._timeout(limite)
+                )
+            self._registrar(breaker, self._falhou(result))
+
+            espera = self._espera(retentavel, retentativas, espera, limite)
+            if espera is None:
+                break
+
+            await self._adormir(espera)
+            retentativas += 1
+
+        result.elapsed = time.time() - inicio
+        result.retentativas = retentativas
+        return result
+
+    async def _atentar(
+        self,
+        url: str,
+        params: Optional[Mapping[str, str]],
+        chave: str,
+        timeout: float,
+    ) -> Tuple[HttpResult, float | None, bool]:
+        cache = _obter_validadores(chave) if self.condicional else None
+        inicio = time.time()
+
+        try:
+            resp = await obter_cliente_async().get(
+                url,
+                params=params,
+                headers=_cabecalhos_condicionais(cache),
+                timeout=self._timeout_httpx(timeout),
+                follow_redirects=True,
+            )
+        except httpx.HTTPError as exc:
+            return self._falha_de_rede(
+                url, exc, time.time() - inicio, isinstance(exc, _ERROS_RETENTAVEIS)
+            )
+
+        return self._interpretar(resp, url, chave, cache, time.time() - inicio)
+
+    def _timeout_httpx(self, leitura: float) -> httpx.Timeout:
+        conexao = self.timeout_conexao if self.timeout_conexao is not None else leitura
+        return httpx.Timeout(leitura, connect=min(conexao, leitura))
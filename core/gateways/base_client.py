@@ -1,10 +1,23 @@
 from __future__ import annotations
 
+import random
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Mapping, Optional
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import urlencode
 
 import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from .circuit_breaker import CircuitBreaker, obter_breaker
+from .hedging import obter_hedger
+from .streaming import em_lotes, iterar_array_json
 
 
 @dataclass(slots=True)
@@ -16,54 +29,489 @@ class HttpResult:
     status_code: int | None
     error: str | None
     elapsed: float
+    revalidado: bool = False  # True quando veio de um 304 (payload local revalidado)
+    do_cache: bool = False  # True quando servido do cache em memória, sem rede
+    retentativas: int = 0  # Quantas vezes o GET foi repetido após falha
+    circuito_aberto: bool = False  # True quando rejeitado na hora pelo circuit breaker
+
+
+@dataclass(slots=True)
+class _Validadores:
+    '''Validadores HTTP e payload já interpretado da última resposta 200.'''
+
+    etag: str | None
+    last_modified: str | None
+    data: Any
+
+
+_validadores: "OrderedDict[str, _Validadores]" = OrderedDict()
+_validadores_lock = threading.Lock()
+
+
+def _obter_validadores(chave: str) -> _Validadores | None:
+    with _validadores_lock:
+        entrada = _validadores.get(chave)
+        if entrada is not None:
+            _validadores.move_to_end(chave)
+        return entrada
+
+
+def _guardar_validadores(chave: str, entrada: _Validadores) -> None:
+    limite = getattr(settings, "GATEWAY_HTTP_VALIDADORES_MAX", 1024)
+    with _validadores_lock:
+        _validadores[chave] = entrada
+        _validadores.move_to_end(chave)
+        while len(_validadores) > limite:
+            _validadores.popitem(last=False)
+
+
+def limpar_validadores() -> None:
+    '''Esquece todos os ETag/Last-Modified guardados.'''
+    with _validadores_lock:
+        _validadores.clear()
+
+
+_sessoes: Dict[str, requests.Session] = {}
+_sessoes_lock = threading.Lock()
+
+
+def obter_sessao(base_url: str, tamanho_pool: int | None = None) -> requests.Session:
+    '''Retorna a sessão HTTP compartilhada (pool keep-alive) de uma URL base.
+
+    Clientes que apontam para a mesma URL base reaproveitam as mesmas
+    conexões TCP/TLS já abertas. O tamanho do pool é definido por quem cria
+    a sessão primeiro (padrão: `GATEWAY_HTTP_POOL_MAXSIZE`).
+    '''
+    chave = base_url.rstrip("/")
+    sessao = _sessoes.get(chave)
+    if sessao is not None:
+        return sessao
+
+    with _sessoes_lock:
+        sessao = _sessoes.get(chave)
+        if sessao is None:
+            adapter = HTTPAdapter(
+                pool_connections=getattr(settings, "GATEWAY_HTTP_POOL_CONNECTIONS", 4),
+                pool_maxsize=tamanho_pool or getattr(settings, "GATEWAY_HTTP_POOL_MAXSIZE", 10),
+                pool_block=False,
+            )
+            sessao = requests.Session()
+            sessao.mount("https://", adapter)
+            sessao.mount("http://", adapter)
+            _sessoes[chave] = sessao
+        return sessao
+
+
+_executor_hedge: ThreadPoolExecutor | None = None
+_executor_hedge_lock = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    '''Pool de threads das cópias (hedge) dos GETs, criado sob demanda.'''
+    global _executor_hedge
+    with _executor_hedge_lock:
+        if _executor_hedge is None:
+            _executor_hedge = ThreadPoolExecutor(
+                max_workers=getattr(settings, "GATEWAY_HEDGE_THREADS", 16),
+                thread_name_prefix="gateway-hedge",
+            )
+        return _executor_hedge
+
+
+def fechar_sessoes() -> None:
+    '''Fecha todas as sessões abertas e esvazia o registro de pools.'''
+    with _sessoes_lock:
+        for sessao in _sessoes.values():
+            sessao.close()
+        _sessoes.clear()
 
 
 class BaseHttpClient:
-    '''Cliente HTTP simples com timeout e medição de tempo.'''
+    '''Cliente HTTP com timeout, medição de tempo e conexões reaproveitadas.
+
+    Com `condicional=True`, guarda ETag/Last-Modified de cada URL e envia
+    If-None-Match/If-Modified-Since nas chamadas seguintes; um 304 devolve
+    o payload guardado sem baixar nem interpretar o corpo de novo.
+
+    GETs são idempotentes, então falhas de conexão, 5xx e 429 são repetidas
+    até `max_retentativas` vezes com backoff exponencial e jitter (ou o
+    `Retry-After` do servidor), sem nunca ultrapassar o `prazo` total.
+
+    Cada tentativa passa pelo circuit breaker da URL base: com o circuito
+    aberto, o GET falha na hora com `circuito_aberto=True`.
 
-    def __init__(self, base_url: str, timeout: float = 3.0) -> None:
+    Com `hedge=True`, se a tentativa não responder dentro do percentil de
+    latência recente da URL base, um segundo GET idêntico é disparado por
+    um pool de threads; a original segue na thread de quem chama e, se
+    falhar, vale a cópia (limitado pelo orçamento de carga extra; métricas
+    em `hedging.estado_hedgers()`).
+
+    `timeout` limita a leitura; `timeout_conexao`, se informado, limita só
+    o estabelecimento da conexão. Os gateways criam seus clientes a partir
+    do registro `GATEWAY_UPSTREAMS` (ver `upstreams.criar_cliente`).
+    '''
+
+    STATUS_RETENTAVEIS = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 3.0,
+        condicional: bool = True,
+        max_retentativas: int | None = None,
+        prazo: float | None = None,
+        timeout_conexao: float | None = None,
+        tamanho_pool: int | None = None,
+        hedge: bool = False,
+    ) -> None:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
+        self.timeout_conexao = timeout_conexao
+        self.tamanho_pool = tamanho_pool
+        self.hedge = hedge
+        self.condicional = condicional
+        self.max_retentativas = (
+            max_retentativas if max_retentativas is not None
+            else getattr(settings, "GATEWAY_HTTP_RETENTATIVAS", 2)
+        )
+        self.prazo = prazo
+        self.backoff_base = getattr(settings, "GATEWAY_HTTP_BACKOFF_BASE", 0.2)
+        self.backoff_max = getattr(settings, "GATEWAY_HTTP_BACKOFF_MAX", 2.0)
+        self._dormir = time.sleep
+
+    @property
+    def session(self) -> requests.Session:
+        return obter_sessao(self.base_url, self.tamanho_pool)
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return obter_breaker(self.base_url)
+
+    def get(
+        self,
+        path: str = "",
+        params: Optional[Mapping[str, str]] = None,
+        prazo: float | None = None,
+    ) -> HttpResult:
+        '''GET com retentativas.
+
+        Args:
+            path: Caminho relativo à URL base
+            params: Query string
+            prazo: Orçamento total em segundos para todas as tentativas
+                (padrão: o `prazo` do cliente; sem prazo, só o timeout de
+                cada tentativa limita)
+        '''
+        url = self._url(path)
+        chave = _chave(url, params)
+        prazo = prazo if prazo is not None else self.prazo
 
-    def get(self, path: str = "", params: Optional[Mapping[str, str]] = None) -> HttpResult:
-        url = f"{self.base_url}/{path.lstrip('/')}" if path else self.base_url
         inicio = time.time()
+        limite = inicio + prazo if prazo is not None else None
+        retentativas = 0
 
-        try:
-            resp = requests.get(url, params=params, timeout=self.timeout)
-            elapsed = time.time() - inicio
+        breaker = self.breaker
+
+        while True:
+            if not breaker.permitir():
+                if retentativas == 0:
+                    return self._resultado_circuito_aberto(inicio)
+                break
+
+            with breaker.falha_em_excecao():
+                result, espera, retentavel = self._tentar(url, params, chave, self._timeout(limite))
+            self._registrar(breaker, self._falhou(result))
+
+            espera = self._espera(retentavel, retentativas, espera, limite)
+            if espera is None:
+                break
+
+            self._dormir(espera)
+            retentativas += 1
+
+        result.elapsed = time.time() - inicio
+        result.retentativas = retentativas
+        return result
+
+    def iterar_array(
+        self,
+        path: str = "",
+        params: Optional[Mapping[str, str]] = None,
+        tamanho_lote: int = 500,
+    ) -> Iterator[List[Any]]:
+        '''Lê um array JSON em streaming e devolve os elementos em lotes.
+
+        O corpo é interpretado à medida que chega, então o pico de memória
+        depende do tamanho do lote e não do tamanho do catálogo. Não há
+        retentativas nem cache condicional no meio de um stream.
+
+        Raises:
+            requests.RequestException: falha de rede, HTTP de erro ou
+                circuito aberto.
+            ValueError: corpo que não é um array JSON válido.
+        '''
+        url = self._url(path)
+        breaker = self.breaker
+        if not breaker.permitir():
+            raise requests.ConnectionError(
+                f"Circuito aberto para {self.base_url}: serviço indisponível"
+            )
 
+        # Um desfecho por chamada, registrado quando o stream termina: qualquer
+        # exceção (timeout de leitura, erro no meio do stream, corpo inválido)
+        # conta como falha antes de ser propagada
+        with breaker.falha_em_excecao():
+            resp = self.session.get(
+                url, params=params, timeout=self._timeouts(self.timeout), stream=True
+            )
+
+        with resp:
+            if resp.status_code >= 400:
+                self._registrar(breaker, resp.status_code in self.STATUS_RETENTAVEIS)
+                resp.raise_for_status()
             try:
-                data: Any | None = resp.json()
-            except Exception:
-                data = resp.text
-
-            if elapsed > self.timeout:
-                print(f"[WARN] Tempo de resposta > {self.timeout}s: {elapsed:.2f}s ({url})")
-
-            if resp.ok:
-                return HttpResult(
-                    ok=True,
-                    data=data,
-                    status_code=resp.status_code,
-                    error=None,
-                    elapsed=elapsed,
-                )
+                with breaker.falha_em_excecao():
+                    pedacos = resp.iter_content(chunk_size=64 * 1024)
+                    yield from em_lotes(iterar_array_json(pedacos), tamanho_lote)
+            except GeneratorExit:
+                # Quem consome parou antes do fim; o upstream respondeu bem
+                breaker.registrar_sucesso()
+                raise
+            breaker.registrar_sucesso()
+
+    def _tentar(
+        self,
+        url: str,
+        params: Optional[Mapping[str, str]],
+        chave: str,
+        timeout: float,
+    ) -> Tuple[HttpResult, float | None, bool]:
+        '''Uma única tentativa: (resultado, Retry-After em segundos, retentável?).'''
+        if self.hedge:
+            return self._tentar_com_hedge(url, params, chave, timeout)
+        return self._requisitar(url, params, chave, timeout)
+
+    def _tentar_com_hedge(
+        self,
+        url: str,
+        params: Optional[Mapping[str, str]],
+        chave: str,
+        timeout: float,
+    ) -> Tuple[HttpResult, float | None, bool]:
+        '''Tentativa com hedge: a original na thread de quem chama, a cópia no pool.
+
+        Passado o atraso do hedger sem resposta da original, um worker do
+        pool dispara a cópia. Vale a original se der certo; se falhar, vale
+        a cópia (esperada até o fim do seu timeout), quando houver uma ok.
+        '''
+        hedger = obter_hedger(self.base_url)
+        hedger.registrar_requisicao()
+        inicio = time.time()
+        original_respondeu = threading.Event()
+
+        def copia() -> Tuple[HttpResult, float | None, bool] | None:
+            if original_respondeu.wait(hedger.atraso()):
+                return None
+            restante = timeout - (time.time() - inicio)
+            if restante <= 0 or not hedger.autorizar_hedge():
+                return None
+            return self._requisitar(url, params, chave, restante)
+
+        segunda = _executor().submit(copia)
+        try:
+            tentativa = self._requisitar(url, params, chave, timeout)
+        finally:
+            original_respondeu.set()
+
+        if not tentativa[0].ok:
+            hedge = segunda.result()
+            if hedge is not None and hedge[0].ok:
+                hedger.registrar_vitoria()
+                tentativa = hedge
+
+        hedger.registrar_latencia(time.time() - inicio)
+        return tentativa
+
+    def _requisitar(
+        self,
+        url: str,
+        params: Optional[Mapping[str, str]],
+        chave: str,
+        timeout: float,
+    ) -> Tuple[HttpResult, float | None, bool]:
+        cache = _obter_validadores(chave) if self.condicional else None
+        inicio = time.time()
+
+        try:
+            resp = self.session.get(
+                url,
+                params=params,
+                headers=_cabecalhos_condicionais(cache),
+                timeout=self._timeouts(timeout),
+            )
+        except requests.RequestException as exc:
+            return self._falha_de_rede(
+                url, exc, time.time() - inicio, isinstance(exc, requests.ConnectionError)
+            )
+
+        return self._interpretar(resp, url, chave, cache, time.time() - inicio)
+
+    # ------------------------------------------------------------------ #
+    # Partes comuns aos clientes síncrono e assíncrono
+    # ------------------------------------------------------------------ #
+    def _url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}" if path else self.base_url
+
+    def _timeout(self, limite: float | None) -> float:
+        '''Timeout da próxima tentativa, sem passar do prazo total.'''
+        if limite is None:
+            return self.timeout
+        return min(self.timeout, max(limite - time.time(), 0.001))
+
+    def _timeouts(self, leitura: float) -> float | Tuple[float, float]:
+        '''Timeout no formato do requests: (conexão, leitura) quando separados.'''
+        if self.timeout_conexao is None:
+            return leitura
+        return min(self.timeout_conexao, leitura), leitura
+
+    def _falhou(self, result: HttpResult) -> bool:
+        '''Desfecho para o breaker, independente de o GET ser retentável.
+
+        Qualquer falha de rede (inclusive timeout de leitura de um upstream
+        travado, que não é repetido) e os status retentáveis contam como
+        falha; 4xx é erro de quem chamou, não do serviço.
+        '''
+        return result.status_code is None or result.status_code in self.STATUS_RETENTAVEIS
 
+    @staticmethod
+    def _registrar(breaker: CircuitBreaker, falhou: bool) -> None:
+        if falhou:
+            breaker.registrar_falha()
+        else:
+            breaker.registrar_sucesso()
+
+    def _espera(
+        self,
+        retentavel: bool,
+        retentativas: int,
+        retry_after: float | None,
+        limite: float | None,
+    ) -> float | None:
+        '''Quanto esperar antes da próxima tentativa; None encerra as tentativas.'''
+        if not retentavel or retentativas >= self.max_retentativas:
+            return None
+
+        espera = retry_after
+        if espera is None:
+            teto = min(self.backoff_max, self.backoff_base * (2 ** retentativas))
+            espera = random.uniform(0, teto)
+
+        if limite is not None and time.time() + espera >= limite:
+            return None
+        return espera
+
+    def _resultado_circuito_aberto(self, inicio: float) -> HttpResult:
+        return HttpResult(
+            ok=False,
+            data=None,
+            status_code=None,
+            error=f"Circuito aberto para {self.base_url}: serviço indisponível",
+            elapsed=time.time() - inicio,
+            circuito_aberto=True,
+        )
+
+    def _interpretar(
+        self,
+        resp: Any,
+        url: str,
+        chave: str,
+        cache: _Validadores | None,
+        elapsed: float,
+    ) -> Tuple[HttpResult, float | None, bool]:
+        '''Converte a resposta (requests ou httpx) em HttpResult.'''
+        if resp.status_code == 304 and cache is not None:
             return HttpResult(
-                ok=False,
-                data=data,
+                ok=True,
+                data=cache.data,
                 status_code=resp.status_code,
-                error=f"Erro HTTP {resp.status_code} ao acessar {url}",
+                error=None,
                 elapsed=elapsed,
-            )
+                revalidado=True,
+            ), None, False
+
+        try:
+            data: Any | None = resp.json()
+        except Exception:
+            data = resp.text
+
+        if elapsed > self.timeout:
+            print(f"[WARN] Tempo de resposta > {self.timeout}s: {elapsed:.2f}s ({url})")
+
+        if resp.status_code < 400:
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+            if self.condicional and (etag or last_modified):
+                _guardar_validadores(chave, _Validadores(etag, last_modified, data))
 
-        except requests.RequestException as exc:
-            elapsed = time.time() - inicio
             return HttpResult(
-                ok=False,
-                data=None,
-                status_code=None,
-                error=f"Falha de rede ao acessar {url}: {exc}",
+                ok=True,
+                data=data,
+                status_code=resp.status_code,
+                error=None,
                 elapsed=elapsed,
-            )
+            ), None, False
+
+        return HttpResult(
+            ok=False,
+            data=data,
+            status_code=resp.status_code,
+            error=f"Erro HTTP {resp.status_code} ao acessar {url}",
+            elapsed=elapsed,
+        ), _retry_after(resp.headers.get("Retry-After")), resp.status_code in self.STATUS_RETENTAVEIS
+
+    @staticmethod
+    def _falha_de_rede(
+        url: str,
+        exc: Exception,
+        elapsed: float,
+        retentavel: bool,
+    ) -> Tuple[HttpResult, float | None, bool]:
+        return HttpResult(
+            ok=False,
+            data=None,
+            status_code=None,
+            error=f"Falha de rede ao acessar {url}: {exc}",
+            elapsed=elapsed,
+        ), None, retentavel
+
+
+def _chave(url: str, params: Optional[Mapping[str, str]]) -> str:
+    '''Chave dos validadores condicionais: URL + query string ordenada.'''
+    return f"{url}?{urlencode(sorted(params.items()))}" if params else url
+
+
+def _cabecalhos_condicionais(cache: _Validadores | None) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    if cache is not None:
+        if cache.etag:
+            headers["If-None-Match"] = cache.etag
+        if cache.last_modified:
+            headers["If-Modified-Since"] = cache.last_modified
+    return headers
+
+
+def _retry_after(valor: str | None) -> float | None:
+    '''Converte o cabeçalho Retry-After (segundos ou data HTTP) em segundos.'''
+    if not valor:
+        return None
+    try:
+        return max(float(valor), 0.0)
+    except ValueError:
+        pass
+    try:
+        quando = parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    if quando.tzinfo is None:
+        quando = quando.replace(tzinfo=timezone.utc)
+    return max((quando - datetime.now(timezone.utc)).total_seconds(), 0.0)
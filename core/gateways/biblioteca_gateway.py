@@ -1,14 +1,36 @@
 '''Gateway para o microsserviço de Biblioteca (biblioteca).'''
 
-from .base_client import BaseHttpClient
+from .base_client import HttpResult
+from .cache import TTLCache
+from .single_flight import SingleFlight
+from .upstreams import criar_cliente, obter_upstream
 
-MS_BIBLIOTECA_BASE_URL = (
-    "https://qiiw8bgxka.execute-api.us-east-2.amazonaws.com/acervo/biblioteca"
-)
+UPSTREAM = obter_upstream("livros")
+MS_BIBLIOTECA_BASE_URL = UPSTREAM.url
 
-client = BaseHttpClient(MS_BIBLIOTECA_BASE_URL)
+client = criar_cliente("livros")
 
+# Com CACHE_TTL > 0 no registro, o catálogo é servido da memória nesse intervalo.
+cache_catalogo = TTLCache(max_itens=1, ttl=UPSTREAM.cache_ttl)
 
-def listar_livros():
+buscas_em_andamento = SingleFlight()
+
+
+def listar_livros() -> HttpResult:
     '''Retorna todos os livros do acervo disponibilizado pelo serviço externo.'''
-    return client.get()
+    if UPSTREAM.cache_ttl > 0:
+        estado, data = cache_catalogo.obter("livros")
+        if estado == TTLCache.FRESCO:
+            return HttpResult(ok=True, data=data, status_code=200, error=None, elapsed=0.0, do_cache=True)
+
+    result = buscas_em_andamento.executar("listar", client.get)
+    if result.ok and UPSTREAM.cache_ttl > 0:
+        cache_catalogo.guardar("livros", result.data)
+    return result
+
+
+async def listar_livros_async() -> HttpResult:
+    '''Versão assíncrona de `listar_livros` (httpx).'''
+    from .async_client import AsyncHttpClient
+
+    return await criar_cliente("livros", AsyncHttpClient).aget()
@@ -0,0 +1,105 @@
+'''Cache em memória com TTL e descarte LRU para respostas dos gateways.'''
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+@dataclass(slots=True)
+class _Entrada:
+    valor: Any
+    expira_em: float
+    negativo: bool
+
+
+class TTLCache:
+    '''Cache limitado, seguro entre threads, com TTL, LRU e cache negativo.
+
+    - Entradas frescas (dentro do TTL) são servidas direto.
+    - Com `stale` > 0, entradas vencidas há menos de `stale` segundos ainda
+      são servidas como OBSOLETO, para o chamador revalidar em background.
+    - Entradas negativas (ex.: 404) vivem `ttl_negativo` segundos.
+    - Acima de `max_itens`, a entrada menos usada recentemente é descartada.
+    '''
+
+    FRESCO = "fresco"
+    OBSOLETO = "obsoleto"
+    NEGATIVO = "negativo"
+
+    def __init__(
+        self,
+        max_itens: int,
+        ttl: float,
+        ttl_negativo: float = 0.0,
+        stale: float = 0.0,
+        relogio: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_itens = max_itens
+        self.ttl = ttl
+        self.ttl_negativo = ttl_negativo
+        self.stale = stale
+        self._relogio = relogio
+        self._itens: "OrderedDict[Hashable, _Entrada]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._contadores = dict.fromkeys(
+            ("hits", "hits_obsoletos", "hits_negativos", "misses", "evictions"), 0
+        )
+
+    def obter(self, chave: Hashable) -> Tuple[str | None, Any]:
+        '''Retorna (estado, valor); estado None significa miss.'''
+        agora = self._relogio()
+        with self._lock:
+            entrada = self._itens.get(chave)
+            if entrada is None:
+                self._contadores["misses"] += 1
+                return None, None
+
+            if agora < entrada.expira_em:
+                self._itens.move_to_end(chave)
+                if entrada.negativo:
+                    self._contadores["hits_negativos"] += 1
+                    return self.NEGATIVO, None
+                self._contadores["hits"] += 1
+                return self.FRESCO, entrada.valor
+
+            if not entrada.negativo and agora < entrada.expira_em + self.stale:
+                self._itens.move_to_end(chave)
+                self._contadores["hits_obsoletos"] += 1
+                return self.OBSOLETO, entrada.valor
+
+            del self._itens[chave]
+            self._contadores["misses"] += 1
+            return None, None
+
+    def guardar(self, chave: Hashable, valor: Any) -> None:
+        self._inserir(chave, _Entrada(valor, self._relogio() + self.ttl, negativo=False))
+
+    def guardar_negativo(self, chave: Hashable) -> None:
+        if self.ttl_negativo > 0:
+            self._inserir(chave, _Entrada(None, self._relogio() + self.ttl_negativo, negativo=True))
+
+    def invalidar(self, chave: Hashable) -> None:
+        with self._lock:
+            self._itens.pop(chave, None)
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._itens.clear()
+            for nome in self._contadores:
+                self._contadores[nome] = 0
+
+    def estatisticas(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._contadores, "tamanho": len(self._itens)}
+
+    def _inserir(self, chave: Hashable, entrada: _Entrada) -> None:
+        with self._lock:
+            self._itens[chave] = entrada
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+                self._contadores["evictions"] += 1
@@ -0,0 +1,174 @@
+'''Circuit breaker por URL base dos microsserviços.'''
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator
+
+from django.conf import settings
+
+
+class CircuitBreaker:
+    '''Disjuntor com estados fechado, aberto e meio-aberto.
+
+    - fechado: chamadas passam; o resultado das últimas `janela` chamadas
+      é registrado. Com pelo menos `min_chamadas` e taxa de falha maior ou
+      igual a `taxa_falha`, o circuito abre.
+    - aberto: chamadas falham na hora, sem rede, até passar o `cooldown`.
+    - meio-aberto: uma chamada de teste passa; sucesso fecha o circuito,
+      falha o reabre por mais um `cooldown`. Um teste sem resultado depois
+      de um `cooldown` conta como falha, para a vaga de teste não ficar
+      presa se quem a pegou nunca registrar o desfecho.
+    '''
+
+    FECHADO = "fechado"
+    ABERTO = "aberto"
+    MEIO_ABERTO = "meio-aberto"
+
+    def __init__(
+        self,
+        nome: str,
+        janela: int = 20,
+        min_chamadas: int = 5,
+        taxa_falha: float = 0.5,
+        cooldown: float = 30.0,
+        relogio: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.nome = nome
+        self.min_chamadas = min_chamadas
+        self.taxa_falha = taxa_falha
+        self.cooldown = cooldown
+        self._relogio = relogio
+        self._resultados: deque[bool] = deque(maxlen=janela)
+        self._estado = self.FECHADO
+        self._aberto_em = 0.0
+        self._teste_em_andamento = False
+        self._teste_iniciado_em = 0.0
+        self._aberturas = 0
+        self._rejeitadas = 0
+        self._lock = threading.Lock()
+
+    @property
+    def estado(self) -> str:
+        with self._lock:
+            return self._estado_atual()
+
+    def permitir(self) -> bool:
+        '''Diz se a chamada pode seguir para a rede.'''
+        with self._lock:
+            estado = self._estado_atual()
+            if estado == self.FECHADO:
+                return True
+            if estado == self.MEIO_ABERTO and not self._teste_em_andamento:
+                self._estado = self.MEIO_ABERTO
+                self._teste_em_andamento = True
+                self._teste_iniciado_em = self._relogio()
+                return True
+            self._rejeitadas += 1
+            return False
+
+    def registrar_sucesso(self) -> None:
+        with self._lock:
+            if self._estado == self.ABERTO:
+                # Resposta atrasada de uma chamada anterior à abertura: não
+                # reabre o tráfego; só a chamada de teste fecha o circuito
+                return
+            if self._estado == self.MEIO_ABERTO:
+                self._estado = self.FECHADO
+                self._teste_em_andamento = False
+                self._resultados.clear()
+            self._resultados.append(True)
+
+    def registrar_falha(self) -> None:
+        with self._lock:
+            if self._estado != self.FECHADO:
+                self._abrir()
+                return
+            self._resultados.append(False)
+            total = len(self._resultados)
+            falhas = total - sum(self._resultados)
+            if total >= self.min_chamadas and falhas / total >= self.taxa_falha:
+                self._abrir()
+
+    @contextmanager
+    def falha_em_excecao(self) -> Iterator[None]:
+        '''Registra falha se o bloco levantar qualquer exceção (inclusive
+        cancelamento), e então a propaga.
+
+        Envolve o trecho entre `permitir()` e o registro do resultado, para
+        que nenhuma saída inesperada deixe a vaga de teste ocupada. O
+        fechamento de um gerador (GeneratorExit) não conta como falha.
+        '''
+        try:
+            yield
+        except GeneratorExit:
+            raise
+        except BaseException:
+            self.registrar_falha()
+            raise
+
+    def resumo(self) -> Dict[str, Any]:
+        with self._lock:
+            total = len(self._resultados)
+            falhas = total - sum(self._resultados)
+            return {
+                "estado": self._estado_atual(),
+                "taxa_falha": round(falhas / total, 2) if total else 0.0,
+                "chamadas_na_janela": total,
+                "aberturas": self._aberturas,
+                "rejeitadas": self._rejeitadas,
+            }
+
+    def _estado_atual(self) -> str:
+        if (
+            self._estado == self.MEIO_ABERTO
+            and self._teste_em_andamento
+            and self._relogio() - self._teste_iniciado_em >= self.cooldown
+        ):
+            # Teste abandonado: conta como falha e reabre o circuito
+            self._abrir()
+        if self._estado == self.ABERTO and self._relogio() - self._aberto_em >= self.cooldown:
+            return self.MEIO_ABERTO
+        return self._estado
+
+    def _abrir(self) -> None:
+        self._estado = self.ABERTO
+        self._aberto_em = self._relogio()
+        self._teste_em_andamento = False
+        self._aberturas += 1
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def obter_breaker(base_url: str) -> CircuitBreaker:
+    '''Retorna o disjuntor compartilhado de uma URL base (criado sob demanda).'''
+    chave = base_url.rstrip("/")
+    with _breakers_lock:
+        breaker = _breakers.get(chave)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                chave,
+                janela=getattr(settings, "GATEWAY_CIRCUITO_JANELA", 20),
+                min_chamadas=getattr(settings, "GATEWAY_CIRCUITO_MIN_CHAMADAS", 5),
+                taxa_falha=getattr(settings, "GATEWAY_CIRCUITO_TAXA_FALHA", 0.5),
+                cooldown=getattr(settings, "GATEWAY_CIRCUITO_COOLDOWN", 30.0),
+            )
+            _breakers[chave] = breaker
+        return breaker
+
+
+def estado_breakers() -> Dict[str, Dict[str, Any]]:
+    '''Resumo de todos os disjuntores, por URL base.'''
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.nome: breaker.resumo() for breaker in breakers}
+
+
+def resetar_breakers() -> None:
+    with _breakers_lock:
+        _breakers.clear()
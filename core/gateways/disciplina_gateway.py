@@ -1,14 +1,36 @@
 '''Gateway para o microsserviço de Disciplinas (msDisciplina).'''
 
-from .base_client import BaseHttpClient
+from .base_client import HttpResult
+from .cache import TTLCache
+from .single_flight import SingleFlight
+from .upstreams import criar_cliente, obter_upstream
 
-MS_DISCIPLINA_BASE_URL = (
-    "https://sswfuybfs8.execute-api.us-east-2.amazonaws.com/disciplinaServico/msDisciplina"
-)
+UPSTREAM = obter_upstream("disciplinas")
+MS_DISCIPLINA_BASE_URL = UPSTREAM.url
 
-client = BaseHttpClient(MS_DISCIPLINA_BASE_URL)
+client = criar_cliente("disciplinas")
 
+# Com CACHE_TTL > 0 no registro, o catálogo é servido da memória nesse intervalo.
+cache_catalogo = TTLCache(max_itens=1, ttl=UPSTREAM.cache_ttl)
 
-def listar_disciplinas():
+buscas_em_andamento = SingleFlight()
+
+
+def listar_disciplinas() -> HttpResult:
     '''Retorna todas as disciplinas disponibilizadas pelo serviço externo.'''
-    return client.get()
+    if UPSTREAM.cache_ttl > 0:
+        estado, data = cache_catalogo.obter("disciplinas")
+        if estado == TTLCache.FRESCO:
+            return HttpResult(ok=True, data=data, status_code=200, error=None, elapsed=0.0, do_cache=True)
+
+    result = buscas_em_andamento.executar("listar", client.get)
+    if result.ok and UPSTREAM.cache_ttl > 0:
+        cache_catalogo.guardar("disciplinas", result.data)
+    return result
+
+
+async def listar_disciplinas_async() -> HttpResult:
+    '''Versão assíncrona de `listar_disciplinas` (httpx).'''
+    from .async_client import AsyncHttpClient
+
+    return await criar_cliente("disciplinas", AsyncHttpClient).aget()
@@ -0,0 +1,114 @@
+'''Requisições "hedged" por URL base: percentil de latência e orçamento.'''
+
+from __future__ import annotations
+
+import math
+import threading
+from collections import deque
+from typing import Any, Dict
+
+from django.conf import settings
+
+
+class Hedger:
+    '''Decide quando disparar uma segunda tentativa idêntica de um GET.
+
+    Guarda a latência das últimas `janela` respostas e sugere esperar o
+    percentil `percentil` delas (nunca menos que `atraso_min`) antes do
+    hedge. Enquanto não houver `min_amostras`, usa `atraso_min`.
+
+    O orçamento limita a carga extra: entre as últimas `janela` requisições,
+    no máximo a fração `carga_max` pode ter disparado um hedge.
+    '''
+
+    def __init__(
+        self,
+        nome: str,
+        percentil: float = 95.0,
+        atraso_min: float = 0.05,
+        carga_max: float = 0.1,
+        janela: int = 200,
+        min_amostras: int = 20,
+    ) -> None:
+        self.nome = nome
+        self.percentil = percentil
+        self.atraso_min = atraso_min
+        self.carga_max = carga_max
+        self.min_amostras = min_amostras
+        self._latencias: deque[float] = deque(maxlen=janela)
+        self._disparos: deque[bool] = deque(maxlen=janela)
+        self._contadores = dict.fromkeys(
+            ("requisicoes", "hedges", "hedges_venceram", "sem_orcamento"), 0
+        )
+        self._lock = threading.Lock()
+
+    def atraso(self) -> float:
+        '''Quanto esperar pela primeira tentativa antes de disparar o hedge.'''
+        with self._lock:
+            if len(self._latencias) < self.min_amostras:
+                return self.atraso_min
+            ordenadas = sorted(self._latencias)
+        indice = min(len(ordenadas) - 1, math.ceil(self.percentil / 100 * len(ordenadas)) - 1)
+        return max(self.atraso_min, ordenadas[indice])
+
+    def registrar_requisicao(self) -> None:
+        with self._lock:
+            self._contadores["requisicoes"] += 1
+            self._disparos.append(False)
+
+    def autorizar_hedge(self) -> bool:
+        '''Consome orçamento para um hedge da requisição atual, se houver.'''
+        with self._lock:
+            disparados = sum(self._disparos)
+            if disparados + 1 > self.carga_max * max(len(self._disparos), 1):
+                self._contadores["sem_orcamento"] += 1
+                return False
+            if self._disparos:
+                self._disparos[-1] = True
+            self._contadores["hedges"] += 1
+            return True
+
+    def registrar_latencia(self, segundos: float) -> None:
+        with self._lock:
+            self._latencias.append(segundos)
+
+    def registrar_vitoria(self) -> None:
+        with self._lock:
+            self._contadores["hedges_venceram"] += 1
+
+    def resumo(self) -> Dict[str, Any]:
+        atraso = self.atraso()
+        with self._lock:
+            return {**self._contadores, "atraso_atual": round(atraso, 4)}
+
+
+_hedgers: Dict[str, Hedger] = {}
+_hedgers_lock = threading.Lock()
+
+
+def obter_hedger(base_url: str) -> Hedger:
+    '''Retorna o Hedger compartilhado de uma URL base (criado sob demanda).'''
+    chave = base_url.rstrip("/")
+    with _hedgers_lock:
+        hedger = _hedgers.get(chave)
+        if hedger is None:
+            hedger = Hedger(
+                chave,
+                percentil=getattr(settings, "GATEWAY_HEDGE_PERCENTIL", 95.0),
+                atraso_min=getattr(settings, "GATEWAY_HEDGE_ATRASO_MIN", 0.05),
+                carga_max=getattr(settings, "GATEWAY_HEDGE_CARGA_MAX", 0.1),
+            )
+            _hedgers[chave] = hedger
+        return hedger
+
+
+def estado_hedgers() -> Dict[str, Dict[str, Any]]:
+    '''Métricas de hedging de todas as URLs base.'''
+    with _hedgers_lock:
+        hedgers = list(_hedgers.values())
+    return {hedger.nome: hedger.resumo() for hedger in hedgers}
+
+
+def resetar_hedgers() -> None:
+    with _hedgers_lock:
+        _hedgers.clear()
@@ -0,0 +1,69 @@
+'''Coalescência de chamadas idênticas concorrentes (single-flight).'''
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Voo:
+    __slots__ = ("pronto", "resultado", "erro", "seguidores")
+
+    def __init__(self) -> None:
+        self.pronto = threading.Event()
+        self.resultado: Any = None
+        self.erro: BaseException | None = None
+        self.seguidores = 0
+
+
+class SingleFlight:
+    '''Garante no máximo uma execução em andamento por chave.
+
+    O primeiro chamador de uma chave executa a função; quem chega com a
+    mesma chave enquanto ela roda espera e recebe o mesmo resultado (ou a
+    mesma exceção). Nada é guardado depois que a execução termina: a
+    próxima chamada dispara uma execução nova.
+    '''
+
+    def __init__(self) -> None:
+        self._voos: Dict[Hashable, _Voo] = {}
+        self._lock = threading.Lock()
+        self._contadores = dict.fromkeys(("execucoes", "compartilhadas"), 0)
+
+    def executar(self, chave: Hashable, funcao: Callable[[], T]) -> T:
+        with self._lock:
+            voo = self._voos.get(chave)
+            lider = voo is None
+            if lider:
+                voo = self._voos[chave] = _Voo()
+                self._contadores["execucoes"] += 1
+            else:
+                voo.seguidores += 1
+                self._contadores["compartilhadas"] += 1
+
+        if not lider:
+            voo.pronto.wait()
+            if voo.erro is not None:
+                raise voo.erro
+            return voo.resultado
+
+        try:
+            voo.resultado = funcao()
+        except BaseException as exc:
+            voo.erro = exc
+            raise
+        finally:
+            with self._lock:
+                del self._voos[chave]
+            voo.pronto.set()
+        return voo.resultado
+
+    def em_andamento(self, chave: Hashable) -> bool:
+        with self._lock:
+            return chave in self._voos
+
+    def estatisticas(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._contadores, "em_andamento": len(self._voos)}
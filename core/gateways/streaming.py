@@ -0,0 +1,91 @@
+'''Leitura incremental de arrays JSON grandes vindos dos microsserviços.'''
+
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator, List
+
+_ESPACOS = " \t\n\r"
+
+
+def iterar_array_json(pedacos: Iterable[bytes]) -> Iterator[Any]:
+    '''Interpreta um array JSON de nível superior à medida que os bytes chegam.
+
+    Cada elemento é devolvido assim que termina de chegar, sem montar a
+    lista inteira em memória; o buffer guarda apenas o elemento em curso.
+
+    Raises:
+        ValueError: se o corpo não for um array JSON válido.
+    '''
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    abriu = False
+    terminou = False
+    fim_dos_dados = False
+    iterador = iter(pedacos)
+
+    while not terminou:
+        # Descarta o que já foi consumido para o buffer não crescer.
+        if pos:
+            buffer = buffer[pos:]
+            pos = 0
+
+        if not fim_dos_dados:
+            pedaco = next(iterador, None)
+            if pedaco is None:
+                fim_dos_dados = True
+                buffer += utf8.decode(b"", final=True)
+            else:
+                buffer += utf8.decode(pedaco)
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in _ESPACOS:
+                pos += 1
+            if pos >= len(buffer):
+                break
+
+            if not abriu:
+                if buffer[pos] != "[":
+                    raise ValueError("Resposta não é um array JSON")
+                abriu = True
+                pos += 1
+                continue
+
+            if buffer[pos] == "]":
+                terminou = True
+                break
+            if buffer[pos] == ",":
+                pos += 1
+                continue
+
+            try:
+                valor, fim = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if fim_dos_dados:
+                    raise ValueError("Array JSON truncado ou inválido")
+                break
+
+            # Um número no fim do buffer pode continuar no próximo pedaço.
+            if fim == len(buffer) and not fim_dos_dados:
+                break
+
+            pos = fim
+            yield valor
+
+        if fim_dos_dados and not terminou:
+            raise ValueError("Array JSON truncado ou inválido")
+
+
+def em_lotes(itens: Iterable[Any], tamanho: int) -> Iterator[List[Any]]:
+    '''Agrupa um iterável em listas de até `tamanho` elementos.'''
+    lote: List[Any] = []
+    for item in itens:
+        lote.append(item)
+        if len(lote) >= tamanho:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
@@ -1,8 +1,13 @@
-from dataclasses import dataclass
-from typing import List, Dict, Any
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Iterator, Tuple
+import asyncio
 import logging
 
+from .base_client import HttpResult
+from .single_flight import SingleFlight
+from .upstreams import criar_cliente, obter_upstream
+
 logger = logging.getLogger(__name__)
 
 
@@ -13,56 +18,116 @@ class ExternalData:
     livros: List[Dict[str, Any]]
     sucesso: bool
     erros: List[str]
+    tempos: Dict[str, float] = field(default_factory=dict)
+    fontes_com_erro: List[str] = field(default_factory=list)
 
 
 class UnifiedGateway:
-    TIMEOUT = 5.0
+    FONTES = ('discentes', 'disciplinas', 'livros')
+
+    # URL base de cada fonte (registro GATEWAY_UPSTREAMS); os demais ajustes
+    # (timeouts, pool, retentativas, prazo) também vêm do registro.
+    ENDPOINTS = {fonte: obter_upstream(fonte).url for fonte in FONTES}
 
-    ENDPOINTS = {
-        'discentes': 'https://rmi6vdpsq8.execute-api.us-east-2.amazonaws.com/msAluno',
-        'disciplinas': 'https://sswfuybfs8.execute-api.us-east-2.amazonaws.com/disciplinaServico/msDisciplina',
-        'livros': 'https://qiiw8bgxka.execute-api.us-east-2.amazonaws.com/acervo/biblioteca',
-    }
+    # Buscas simultâneas do mesmo catálogo compartilham a mesma chamada.
+    _buscas_em_andamento = SingleFlight()
 
     @classmethod
-    def consumir_todos_dados(cls) -> ExternalData:
-        discentes = []
-        disciplinas = []
-        livros = []
-        erros = []
-
-        try:
-            resp = requests.get(cls.ENDPOINTS['discentes'], timeout=cls.TIMEOUT)
-            if resp.ok:
-                discentes = resp.json()
-                logger.info(f"Consumidos {len(discentes)} discentes")
-            else:
-                erros.append(f"Erro ao buscar discentes: HTTP {resp.status_code}")
-        except Exception as e:
-            erros.append(f"Erro ao buscar discentes: {e}")
-            logger.error(f"Erro discentes: {e}")
-
-        try:
-            resp = requests.get(cls.ENDPOINTS['disciplinas'], timeout=cls.TIMEOUT)
-            if resp.ok:
-                disciplinas = resp.json()
-                logger.info(f"Consumidas {len(disciplinas)} disciplinas")
-            else:
-                erros.append(f"Erro ao buscar disciplinas: HTTP {resp.status_code}")
-        except Exception as e:
-            erros.append(f"Erro ao buscar disciplinas: {e}")
-            logger.error(f"Erro disciplinas: {e}")
-
-        try:
-            resp = requests.get(cls.ENDPOINTS['livros'], timeout=cls.TIMEOUT)
-            if resp.ok:
-                livros = resp.json()
-                logger.info(f"Consumidos {len(livros)} livros")
+    def _buscar_fonte(cls, fonte: str) -> Tuple[List[Dict[str, Any]], str | None, float]:
+        '''Busca uma única fonte e retorna (dados, erro, tempo em segundos).'''
+        client = criar_cliente(fonte, url=cls.ENDPOINTS[fonte], catalogo=True)
+        result = cls._buscas_em_andamento.executar(fonte, client.get)
+        return cls._avaliar_resultado(fonte, result)
+
+    @classmethod
+    async def _buscar_fonte_async(cls, fonte: str) -> Tuple[List[Dict[str, Any]], str | None, float]:
+        from .async_client import AsyncHttpClient
+
+        client = criar_cliente(fonte, AsyncHttpClient, url=cls.ENDPOINTS[fonte], catalogo=True)
+        return cls._avaliar_resultado(fonte, await client.aget())
+
+    @staticmethod
+    def _avaliar_resultado(fonte: str, result: HttpResult) -> Tuple[List[Dict[str, Any]], str | None, float]:
+        if not result.ok:
+            if result.status_code is not None:
+                erro = f"Erro ao buscar {fonte}: HTTP {result.status_code}"
             else:
-                erros.append(f"Erro ao buscar livros: HTTP {resp.status_code}")
-        except Exception as e:
-            erros.append(f"Erro ao buscar livros: {e}")
-            logger.error(f"Erro livros: {e}")
+                erro = f"Erro ao buscar {fonte}: {result.error}"
+            logger.error(erro)
+            return [], erro, result.elapsed
+
+        if not isinstance(result.data, list):
+            erro = f"Erro ao buscar {fonte}: resposta não é uma lista JSON"
+            logger.error(erro)
+            return [], erro, result.elapsed
+
+        origem = "revalidados (304)" if result.revalidado else "da rede"
+        logger.info(f"Consumidos {len(result.data)} {fonte} {origem} em {result.elapsed:.2f}s")
+        return result.data, None, result.elapsed
+
+    @classmethod
+    def iterar_lotes(cls, fonte: str, tamanho_lote: int = 500) -> Iterator[List[Dict[str, Any]]]:
+        '''Lê uma fonte em streaming, em lotes de até `tamanho_lote` registros.
+
+        Raises:
+            requests.RequestException: falha de rede ou HTTP de erro.
+            ValueError: resposta que não é um array JSON.
+        '''
+        client = criar_cliente(fonte, url=cls.ENDPOINTS[fonte], catalogo=True)
+        yield from client.iterar_array(tamanho_lote=tamanho_lote)
+
+    @classmethod
+    def consumir_todos_dados(cls, concorrente: bool = True) -> ExternalData:
+        '''Consome as três fontes externas.
+
+        Args:
+            concorrente: Se True, busca as fontes em paralelo (o tempo total
+                passa a ser o da fonte mais lenta). Se False, busca uma após
+                a outra.
+
+        Returns:
+            ExternalData com os dados, erros por fonte e o tempo de cada fonte.
+        '''
+        fontes = list(cls.ENDPOINTS)
+
+        if concorrente:
+            with ThreadPoolExecutor(max_workers=len(fontes)) as executor:
+                resultados = list(executor.map(cls._buscar_fonte, fontes))
+        else:
+            resultados = [cls._buscar_fonte(fonte) for fonte in fontes]
+
+        return cls._montar(fontes, resultados)
+
+    @classmethod
+    async def consumir_todos_dados_async(cls) -> ExternalData:
+        '''Versão assíncrona de `consumir_todos_dados` para deploys ASGI.
+
+        As três fontes são buscadas em paralelo no event loop, sem threads.
+        '''
+        fontes = list(cls.ENDPOINTS)
+        resultados = await asyncio.gather(*(cls._buscar_fonte_async(fonte) for fonte in fontes))
+        return cls._montar(fontes, resultados)
+
+    @staticmethod
+    def _montar(
+        fontes: List[str],
+        resultados: List[Tuple[List[Dict[str, Any]], str | None, float]],
+    ) -> ExternalData:
+        dados: Dict[str, List[Dict[str, Any]]] = {}
+        erros: List[str] = []
+        tempos: Dict[str, float] = {}
+        fontes_com_erro: List[str] = []
+
+        for fonte, (itens, erro, elapsed) in zip(fontes, resultados):
+            dados[fonte] = itens
+            tempos[fonte] = elapsed
+            if erro:
+                erros.append(erro)
+                fontes_com_erro.append(fonte)
+
+        discentes = dados['discentes']
+        disciplinas = dados['disciplinas']
+        livros = dados['livros']
 
         sucesso = len(discentes) > 0 or len(disciplinas) > 0 or len(livros) > 0
 
@@ -72,4 +137,6 @@ class UnifiedGateway:
             livros=livros,
             sucesso=sucesso,
             erros=erros,
+            tempos=tempos,
+            fontes_com_erro=fontes_com_erro,
         )
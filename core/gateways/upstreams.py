@@ -0,0 +1,83 @@
+'''Registro dos microsserviços externos: URL e ajustes de cada serviço.'''
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .base_client import BaseHttpClient
+
+
+@dataclass(frozen=True)
+class Upstream:
+    '''Configuração de um serviço, lida de `settings.GATEWAY_UPSTREAMS`.'''
+
+    nome: str
+    url: str
+    timeout_conexao: float
+    timeout_leitura: float
+    tamanho_pool: int
+    retentativas: int
+    prazo: float | None
+    cache_ttl: float
+    hedge: bool = False
+    timeout_lista: float | None = None
+
+    @property
+    def timeout_catalogo(self) -> float:
+        '''Timeout de leitura da lista completa (padrão: o de leitura).'''
+        return self.timeout_lista if self.timeout_lista is not None else self.timeout_leitura
+
+
+def obter_upstream(nome: str) -> Upstream:
+    '''Lê a configuração do serviço `nome` (discentes, disciplinas ou livros).
+
+    Raises:
+        ImproperlyConfigured: se o serviço não estiver no registro.
+    '''
+    registro: Dict[str, Dict[str, Any]] = getattr(settings, "GATEWAY_UPSTREAMS", {})
+    try:
+        conf = registro[nome]
+    except KeyError:
+        raise ImproperlyConfigured(f"Serviço '{nome}' ausente de GATEWAY_UPSTREAMS") from None
+
+    return Upstream(
+        nome=nome,
+        url=conf["URL"],
+        timeout_conexao=conf.get("TIMEOUT_CONEXAO", 2.0),
+        timeout_leitura=conf.get("TIMEOUT_LEITURA", 3.0),
+        tamanho_pool=conf.get("POOL", getattr(settings, "GATEWAY_HTTP_POOL_MAXSIZE", 10)),
+        retentativas=conf.get("RETENTATIVAS", getattr(settings, "GATEWAY_HTTP_RETENTATIVAS", 2)),
+        prazo=conf.get("PRAZO"),
+        cache_ttl=conf.get("CACHE_TTL", 0.0),
+        hedge=conf.get("HEDGE", False),
+        timeout_lista=conf.get("TIMEOUT_LISTA"),
+    )
+
+
+def criar_cliente(
+    nome: str,
+    classe: type[BaseHttpClient] = BaseHttpClient,
+    catalogo: bool = False,
+    **kwargs: Any,
+) -> BaseHttpClient:
+    '''Cria o cliente HTTP de um serviço com os ajustes do registro.
+
+    Com `catalogo=True` (lista completa do serviço), a leitura usa
+    `TIMEOUT_LISTA`. `kwargs` sobrescrevem o registro (ex.: `url=` nos testes).
+    '''
+    upstream = obter_upstream(nome)
+    leitura = upstream.timeout_catalogo if catalogo else upstream.timeout_leitura
+    return classe(
+        kwargs.pop("url", upstream.url),
+        timeout=kwargs.pop("timeout", leitura),
+        timeout_conexao=kwargs.pop("timeout_conexao", upstream.timeout_conexao),
+        tamanho_pool=kwargs.pop("tamanho_pool", upstream.tamanho_pool),
+        max_retentativas=kwargs.pop("max_retentativas", upstream.retentativas),
+        prazo=kwargs.pop("prazo", upstream.prazo),
+        hedge=kwargs.pop("hedge", upstream.hedge),
+        **kwargs,
+    )
@@ -0,0 +1,186 @@
+"""Comando Django que compara planos e tempos das consultas quentes com e sem os índices compostos."""
+
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.models import (
+    Discente, Disciplina, Livro,
+    Matricula, MatriculaDisciplina, ReservaLivro,
+)
+
+# IDs sintéticos bem acima dos reais para não colidir com dados existentes.
+ID_BASE = 10_000_000
+PERIODOS = ('2024.1', '2024.2')
+DISCIPLINAS_POR_MATRICULA = 5
+LOTE = 5_000
+
+
+def _indices_novos():
+    """Nomes dos índices e constraints adicionados pela migração 0004."""
+    for model in (Matricula, MatriculaDisciplina, ReservaLivro):
+        yield from (indice.name for indice in model._meta.indexes)
+        yield from (constraint.name for constraint in model._meta.constraints)
+
+
+class Command(BaseCommand):
+    help = 'Compara planos e tempos das consultas de matrícula/reserva com e sem os índices compostos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--linhas',
+            type=int,
+            default=200_000,
+            help='Linhas de MatriculaDisciplina geradas (ReservaLivro recebe metade). '
+                 'Use 1000000 para o cenário de referência.',
+        )
+        parser.add_argument(
+            '--consultas',
+            type=int,
+            default=2_000,
+            help='Execuções de cada consulta por medição',
+        )
+        parser.add_argument('--semente', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['semente'])
+
+        # Tudo roda dentro de uma transação desfeita ao final: os dados
+        # sintéticos e o DROP INDEX não sobrevivem ao comando.
+        with transaction.atomic():
+            inicio = time.perf_counter()
+            amostra = self._popular(options['linhas'], rng)
+            self.stdout.write(f"Banco populado em {time.perf_counter() - inicio:.1f}s\n")
+
+            consultas = self._consultas(amostra, options['consultas'], rng)
+
+            com_indices = self._medir(consultas, 'com')
+            with connection.cursor() as cursor:
+                for nome in _indices_novos():
+                    cursor.execute(f'DROP INDEX IF EXISTS "{nome}"')
+            sem_indices = self._medir(consultas, 'sem')
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'consulta':<32} | {'sem índices':>12} | {'com índices':>12} | {'ganho':>6}")
+        self.stdout.write("-" * 72)
+        for nome in consultas:
+            antes, plano_antes = sem_indices[nome]
+            depois, plano_depois = com_indices[nome]
+            self.stdout.write(
+                f"{nome:<32} | {antes * 1000:>10.1f}ms | {depois * 1000:>10.1f}ms | "
+                f"{antes / depois if depois else 0:>5.1f}x"
+            )
+            self.stdout.write(f"    antes:  {plano_antes}")
+            self.stdout.write(f"    depois: {plano_depois}")
+
+    def _popular(self, linhas: int, rng: random.Random) -> dict:
+        """Gera discentes, matrículas, disciplinas das matrículas e reservas."""
+        total_matriculas = max(2, linhas // DISCIPLINAS_POR_MATRICULA)
+        total_discentes = max(1, total_matriculas // len(PERIODOS))
+        discentes = range(ID_BASE, ID_BASE + total_discentes)
+        disciplinas = range(ID_BASE, ID_BASE + 1_000)
+        livros = range(ID_BASE, ID_BASE + 10_000)
+
+        Discente.objects.bulk_create(
+            (Discente(id=i, nome=f'Discente {i}', curso='CC', modalidade='EAD',
+                      status_academico='Ativo') for i in discentes),
+            batch_size=LOTE,
+        )
+        Disciplina.objects.bulk_create(
+            (Disciplina(id=i, curso='CC', nome=f'Disciplina {i}', vagas=50) for i in disciplinas),
+            batch_size=LOTE,
+        )
+        Livro.objects.bulk_create(
+            (Livro(id=i, titulo=f'Livro {i}', autor='Autor', ano=2000, status='Disponível')
+             for i in livros),
+            batch_size=LOTE,
+        )
+
+        # Uma matrícula por discente e período: respeita matricula_ativa_unica.
+        Matricula.objects.bulk_create(
+            (Matricula(discente_id=discente, periodo=periodo, ativa=rng.random() < 0.8)
+             for periodo in PERIODOS for discente in discentes),
+            batch_size=LOTE,
+        )
+        matriculas = list(
+            Matricula.objects.filter(discente_id__gte=ID_BASE).values_list('id', flat=True)
+        )
+
+        MatriculaDisciplina.objects.bulk_create(
+            (MatriculaDisciplina(matricula_id=matricula, disciplina_id=disciplina,
+                                 ativa=rng.random() < 0.7)
+             for matricula in matriculas
+             for disciplina in rng.sample(disciplinas, DISCIPLINAS_POR_MATRICULA)),
+            batch_size=LOTE,
+        )
+        ReservaLivro.objects.bulk_create(
+            (ReservaLivro(discente_id=rng.choice(discentes), livro_id=rng.choice(livros),
+                          ativa=rng.random() < 0.3)
+             for _ in range(linhas // 2)),
+            batch_size=LOTE,
+        )
+        return {
+            'discentes': discentes,
+            'disciplinas': disciplinas,
+            'livros': livros,
+            'matriculas': matriculas,
+        }
+
+    def _consultas(self, amostra: dict, quantidade: int, rng: random.Random) -> dict:
+        """Consultas dos services, cada uma com `quantidade` parâmetros sorteados."""
+        def sortear(chave):
+            return [rng.choice(amostra[chave]) for _ in range(quantidade)]
+
+        discentes, disciplinas, livros = sortear('discentes'), sortear('disciplinas'), sortear('livros')
+        matriculas = sortear('matriculas')
+        return {
+            'matricula ativa do período': [
+                Matricula.objects.filter(discente_id=d, periodo='2024.2', ativa=True)
+                for d in discentes
+            ],
+            'disciplina ativa na matrícula': [
+                MatriculaDisciplina.objects.filter(matricula_id=m, disciplina_id=d, ativa=True)
+                for m, d in zip(matriculas, disciplinas)
+            ],
+            'disciplinas ativas da matrícula': [
+                MatriculaDisciplina.objects.filter(matricula_id=m, ativa=True) for m in matriculas
+            ],
+            'vagas ocupadas da disciplina': [
+                MatriculaDisciplina.objects.filter(disciplina_id=d, ativa=True) for d in disciplinas
+            ],
+            'reserva ativa do discente': [
+                ReservaLivro.objects.filter(discente_id=d, livro_id=livro, ativa=True)
+                for d, livro in zip(discentes, livros)
+            ],
+            'reservas ativas do livro': [
+                ReservaLivro.objects.filter(livro_id=livro, ativa=True) for livro in livros
+            ],
+        }
+
+    @staticmethod
+    def _medir(consultas: dict, fase: str) -> dict:
+        """(tempo total, plano) de cada consulta, lendo o resultado inteiro com COUNT(*).
+
+        O SQL leva a fase em um comentário: o cache de statements do sqlite3
+        reaproveitaria o plano antigo de um texto idêntico após o DROP INDEX.
+        """
+        prefixo = connection.ops.explain_query_prefix()
+        medidas = {}
+        with connection.cursor() as cursor:
+            for nome, querysets in consultas.items():
+                # SQL compilado fora da medição: o tempo é só o do banco.
+                compiladas = [qs.order_by().query.sql_with_params() for qs in querysets]
+                sql = compiladas[0][0]
+                cursor.execute(f"{prefixo} /* {fase} */ {sql}", compiladas[0][1])
+                plano = ' | '.join(str(linha[-1]) for linha in cursor.fetchall())
+
+                contagem = f"/* {fase} */ SELECT COUNT(*) FROM ({sql}) consulta"
+                inicio = time.perf_counter()
+                for _, params in compiladas:
+                    cursor.execute(contagem, params)
+                    cursor.fetchone()
+                medidas[nome] = (time.perf_counter() - inicio, plano)
+        return medidas
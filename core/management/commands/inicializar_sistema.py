@@ -13,12 +13,18 @@ class Command(BaseCommand):
             action='store_true',
             help='Força reinicialização mesmo se já houver dados',
         )
+        parser.add_argument(
+            '--streaming',
+            action='store_true',
+            help='Lê os catálogos em streaming e grava lote a lote (memória constante)',
+        )
 
     def handle(self, *args, **options):
         self.stdout.write("Inicializando sistema PAS Gateway...")
 
         sucesso, msg = InitializationService.inicializar_sistema(
-            forcar_reinicializacao=options['forcar']
+            forcar_reinicializacao=options['forcar'],
+            streaming=options['streaming'],
         )
 
         if sucesso:
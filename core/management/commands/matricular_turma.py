@@ -0,0 +1,57 @@
+"""Comando Django para matricular uma turma inteira nas mesmas disciplinas."""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.models import Discente, Disciplina
+from core.services.enrollment_service_v2 import EnrollmentServiceV2
+
+
+class Command(BaseCommand):
+    help = 'Matricula em lote os discentes de um curso (ou uma lista de IDs) em disciplinas obrigatórias'
+
+    def add_arguments(self, parser):
+        parser.add_argument('disciplinas', nargs='+', type=int, help='IDs das disciplinas')
+        parser.add_argument('--curso', help='Curso da turma (comparação sem diferenciar maiúsculas)')
+        parser.add_argument(
+            '--discentes',
+            nargs='+',
+            type=int,
+            help='IDs dos discentes (em vez de --curso)',
+        )
+        parser.add_argument('--periodo', default='2024.2')
+        parser.add_argument(
+            '--simular',
+            action='store_true',
+            help='Calcula a alocação e desfaz tudo ao final',
+        )
+
+    def handle(self, *args, **options):
+        if bool(options['curso']) == bool(options['discentes']):
+            raise CommandError("Informe --curso ou --discentes")
+
+        if options['curso']:
+            discentes = Discente.objects.filter(curso__iexact=options['curso'].strip())
+        else:
+            discentes = Discente.objects.filter(id__in=options['discentes'])
+
+        with transaction.atomic():
+            resultado = EnrollmentServiceV2.matricular_turma(
+                discentes, options['disciplinas'], options['periodo']
+            )
+            if options['simular']:
+                transaction.set_rollback(True)
+
+        prefixo = "[simulação] " if options['simular'] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefixo}{len(resultado.aceitas)} inclusões aceitas, "
+            f"{len(resultado.recusadas)} recusadas, "
+            f"{resultado.matriculas_criadas} matrículas criadas em {resultado.elapsed:.2f}s"
+        ))
+
+        nomes = dict(Disciplina.objects.filter(id__in=options['disciplinas']).values_list('id', 'nome'))
+        for disciplina_id, contagem in resultado.resumo().items():
+            aceitas = contagem.pop('aceitas', 0)
+            self.stdout.write(f"  {disciplina_id} {nomes.get(disciplina_id, '?')}: {aceitas} aceitas")
+            for motivo, quantidade in sorted(contagem.items(), key=lambda item: -item[1]):
+                self.stdout.write(self.style.WARNING(f"      {quantidade:>6}  {motivo}"))
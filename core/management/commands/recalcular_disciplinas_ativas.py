@@ -0,0 +1,13 @@
+"""Comando Django para corrigir o contador de disciplinas ativas das matrículas."""
+
+from django.core.management.base import BaseCommand
+
+from core.services.enrollment_service_v2 import EnrollmentServiceV2
+
+
+class Command(BaseCommand):
+    help = 'Recalcula Matricula.disciplinas_ativas a partir das disciplinas ativas (uma consulta agregada)'
+
+    def handle(self, *args, **options):
+        corrigidas = EnrollmentServiceV2.recalcular_disciplinas_ativas()
+        self.stdout.write(self.style.SUCCESS(f"{corrigidas} matrículas corrigidas."))
@@ -0,0 +1,50 @@
+"""Comando Django que sobe o servidor local que imita os microsserviços."""
+
+from django.core.management.base import BaseCommand
+
+from core.fake_upstream import ConfiguracaoFake, ServidorFake
+
+
+class Command(BaseCommand):
+    help = 'Sobe um servidor local com os contratos de msAluno, msDisciplina e biblioteca'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--porta', type=int, default=8099)
+        parser.add_argument('--discentes', type=int, default=1000)
+        parser.add_argument('--disciplinas', type=int, default=100)
+        parser.add_argument('--livros', type=int, default=5000)
+        parser.add_argument('--latencia', type=float, default=0.0,
+                            help='Segundos antes de cada resposta')
+        parser.add_argument('--jitter', type=float, default=0.0,
+                            help='Atraso extra aleatório, entre 0 e este valor')
+        parser.add_argument('--taxa-erro', type=float, default=0.0,
+                            help='Fração das requisições respondidas com 503 (0 a 1)')
+        parser.add_argument('--corpo-lento', type=float, default=0.0,
+                            help='Segundos para transmitir cada corpo, em pedaços')
+        parser.add_argument('--semente', type=int, default=42,
+                            help='Mesma semente, mesmos dados e mesma sequência de falhas')
+
+    def handle(self, *args, **options):
+        config = ConfiguracaoFake(
+            discentes=options['discentes'],
+            disciplinas=options['disciplinas'],
+            livros=options['livros'],
+            latencia=options['latencia'],
+            jitter=options['jitter'],
+            taxa_erro=options['taxa_erro'],
+            corpo_lento=options['corpo_lento'],
+            semente=options['semente'],
+        )
+        servidor = ServidorFake((options['host'], options['porta']), config)
+
+        self.stdout.write(self.style.SUCCESS(f"Servidor fake em {servidor.url_base}"))
+        self.stdout.write("Para apontar o gateway para ele:")
+        self.stdout.write(f"  export GATEWAY_UPSTREAM_LOCAL={servidor.url_base}")
+
+        try:
+            servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            servidor.server_close()
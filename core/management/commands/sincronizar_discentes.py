@@ -0,0 +1,54 @@
+"""Comando Django para sincronizar um conjunto de discentes de uma vez."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.lookup_service import LookupService
+
+
+class Command(BaseCommand):
+    help = 'Busca vários discentes no msAluno em paralelo e grava todos em lote'
+
+    def add_arguments(self, parser):
+        parser.add_argument('ids', nargs='*', type=int, help='IDs dos discentes')
+        parser.add_argument(
+            '--intervalo',
+            help='Faixa de IDs, ex.: 1-5000 (inclusive)',
+        )
+        parser.add_argument(
+            '--arquivo',
+            help='Arquivo com um ID por linha',
+        )
+        parser.add_argument(
+            '--paralelismo',
+            type=int,
+            default=None,
+            help='Máximo de consultas simultâneas (padrão: tamanho do pool do serviço)',
+        )
+
+    def handle(self, *args, **options):
+        ids = list(options['ids'])
+
+        if options['intervalo']:
+            try:
+                inicio, fim = (int(parte) for parte in options['intervalo'].split('-'))
+            except ValueError:
+                raise CommandError("--intervalo deve ter o formato INICIO-FIM, ex.: 1-5000")
+            ids.extend(range(inicio, fim + 1))
+
+        if options['arquivo']:
+            with open(options['arquivo'], encoding='utf-8') as arquivo:
+                ids.extend(int(linha) for linha in arquivo if linha.strip())
+
+        if not ids:
+            raise CommandError("Informe IDs, --intervalo ou --arquivo")
+
+        resultado = LookupService.sincronizar_discentes(ids, paralelismo=options['paralelismo'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(resultado.sincronizados)} discentes sincronizados em {resultado.elapsed:.2f}s "
+            f"({len(resultado.falhas)} falhas)"
+        ))
+        for discente_id, motivo in list(resultado.falhas.items())[:20]:
+            self.stdout.write(self.style.WARNING(f"  {discente_id}: {motivo}"))
+        if len(resultado.falhas) > 20:
+            self.stdout.write(f"  ... e mais {len(resultado.falhas) - 20} falhas")
@@ -0,0 +1,47 @@
+"""Comando Django para criar, inspecionar e carregar o snapshot em disco."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.gateways.unified_gateway import UnifiedGateway
+from core.services.initialization_service import InitializationService
+from core.services.snapshot_service import SnapshotService
+
+
+class Command(BaseCommand):
+    help = 'Cria, inspeciona ou carrega o snapshot dos dados dos microsserviços'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'acao',
+            choices=['criar', 'inspecionar', 'carregar'],
+            help='criar: consome os microsserviços e grava o snapshot; '
+                 'inspecionar: mostra versão, frescor e contagens; '
+                 'carregar: hidrata o banco local a partir do snapshot',
+        )
+
+    def handle(self, *args, **options):
+        acao = options['acao']
+
+        if acao == 'criar':
+            dados = UnifiedGateway.consumir_todos_dados()
+            if not dados.sucesso or dados.erros:
+                raise CommandError(
+                    "Snapshot não criado, consumo incompleto: " + "; ".join(dados.erros)
+                )
+            caminho = SnapshotService.salvar(dados)
+            self.stdout.write(self.style.SUCCESS(f"Snapshot criado em {caminho}"))
+            acao = 'inspecionar'
+
+        if acao == 'inspecionar':
+            info = SnapshotService.inspecionar()
+            if info is None:
+                raise CommandError(f"Nenhum snapshot válido em {SnapshotService.caminho()}")
+            for chave, valor in info.items():
+                self.stdout.write(f"  {chave:<15} {valor}")
+            return
+
+        sucesso, msg = InitializationService.hidratar_do_snapshot()
+        if sucesso:
+            self.stdout.write(self.style.SUCCESS(msg))
+        else:
+            raise CommandError(msg)
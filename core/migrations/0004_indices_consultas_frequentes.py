@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:41
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def desativar_matriculas_duplicadas(apps, schema_editor):
+    """Mantém só a matrícula ativa mais recente por discente e período."""
+    Matricula = apps.get_model('core', 'Matricula')
+    duplicadas = (
+        Matricula.objects.filter(ativa=True)
+        .values('discente_id', 'periodo')
+        .annotate(total=Count('id'), mais_recente=Max('id'))
+        .filter(total__gt=1)
+    )
+    for grupo in duplicadas:
+        Matricula.objects.filter(
+            discente_id=grupo['discente_id'], periodo=grupo['periodo'], ativa=True
+        ).exclude(id=grupo['mais_recente']).update(ativa=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_alter_matricula_periodo'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='matricula',
+            index=models.Index(fields=['discente', 'periodo', 'ativa'], name='matricula_disc_periodo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='matriculadisciplina',
+            index=models.Index(fields=['matricula', 'disciplina', 'ativa'], name='matdisc_mat_disc_ativa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='matriculadisciplina',
+            index=models.Index(condition=models.Q(('ativa', True)), fields=['matricula'], name='matdisc_ativas_mat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='matriculadisciplina',
+            index=models.Index(condition=models.Q(('ativa', True)), fields=['disciplina'], name='matdisc_ativas_disc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservalivro',
+            index=models.Index(fields=['discente', 'livro', 'ativa'], name='reserva_disc_livro_ativa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservalivro',
+            index=models.Index(condition=models.Q(('ativa', True)), fields=['livro'], name='reserva_ativas_livro_idx'),
+        ),
+        migrations.RunPython(desativar_matriculas_duplicadas, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='matricula',
+            constraint=models.UniqueConstraint(condition=models.Q(('ativa', True)), fields=('discente', 'periodo'), name='matricula_ativa_unica'),
+        ),
+    ]
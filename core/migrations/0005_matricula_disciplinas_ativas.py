@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:50
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def preencher_contador(apps, schema_editor):
+    """Preenche o contador com um único UPDATE sobre a contagem agregada."""
+    Matricula = apps.get_model('core', 'Matricula')
+    MatriculaDisciplina = apps.get_model('core', 'MatriculaDisciplina')
+    ativas = (
+        MatriculaDisciplina.objects.filter(matricula=OuterRef('pk'), ativa=True)
+        .order_by()
+        .values('matricula')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    Matricula.objects.update(disciplinas_ativas=Coalesce(Subquery(ativas), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_indices_consultas_frequentes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matricula',
+            name='disciplinas_ativas',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.RunPython(preencher_contador, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_matricula_disciplinas_ativas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EsperaDisciplina',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('periodo', models.CharField(max_length=20)),
+                ('senha', models.PositiveIntegerField()),
+                ('ativa', models.BooleanField(default=True)),
+                ('criada_em', models.DateTimeField(auto_now_add=True)),
+                ('promovida_em', models.DateTimeField(blank=True, null=True)),
+                ('discente', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='esperas_disciplinas', to='core.discente')),
+                ('disciplina', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lista_espera', to='core.disciplina')),
+            ],
+            options={
+                'verbose_name': 'Lista de Espera',
+                'verbose_name_plural': 'Listas de Espera',
+                'ordering': ['senha'],
+                'indexes': [models.Index(condition=models.Q(('ativa', True)), fields=['disciplina', 'periodo', 'senha'], name='espera_ativas_fila_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('ativa', True)), fields=('discente', 'disciplina', 'periodo'), name='espera_ativa_unica')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_lista_espera_disciplina'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EsperaLivro',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('senha', models.PositiveIntegerField()),
+                ('ativa', models.BooleanField(default=True)),
+                ('criada_em', models.DateTimeField(auto_now_add=True)),
+                ('atendida_em', models.DateTimeField(blank=True, null=True)),
+                ('discente', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='esperas_livros', to='core.discente')),
+                ('livro', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fila_reservas', to='core.livro')),
+            ],
+            options={
+                'verbose_name': 'Fila de Reserva',
+                'verbose_name_plural': 'Filas de Reserva',
+                'ordering': ['senha'],
+                'indexes': [models.Index(condition=models.Q(('ativa', True)), fields=['livro', 'senha'], name='espera_livro_ativas_fila_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('ativa', True)), fields=('discente', 'livro'), name='espera_livro_ativa_unica')],
+            },
+        ),
+    ]
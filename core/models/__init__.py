@@ -2,7 +2,9 @@
 
 from .academic import Discente, Disciplina, Livro
 from .simulation import MatriculaSimulada, ReservaSimulada
-from .enrollment import Matricula, MatriculaDisciplina, ReservaLivro
+from .enrollment import (
+    Matricula, MatriculaDisciplina, EsperaDisciplina, ReservaLivro, EsperaLivro,
+)
 
 __all__ = [
     "Discente",
@@ -12,5 +14,7 @@ __all__ = [
     "ReservaSimulada",
     "Matricula",
     "MatriculaDisciplina",
+    "EsperaDisciplina",
     "ReservaLivro",
+    "EsperaLivro",
 ]
@@ -11,6 +11,9 @@ class Matricula(models.Model):
     )
     periodo = models.CharField(max_length=20)
     ativa = models.BooleanField(default=True)
+    # Contador mantido pelo EnrollmentServiceV2 (F() ao adicionar/remover);
+    # `manage.py recalcular_disciplinas_ativas` corrige divergências.
+    disciplinas_ativas = models.PositiveSmallIntegerField(default=0)
     criada_em = models.DateTimeField(auto_now_add=True)
     atualizada_em = models.DateTimeField(auto_now=True)
 
@@ -18,14 +21,25 @@ class Matricula(models.Model):
         ordering = ['-criada_em']
         verbose_name = 'Matrícula'
         verbose_name_plural = 'Matrículas'
+        indexes = [
+            models.Index(fields=['discente', 'periodo', 'ativa'], name='matricula_disc_periodo_idx'),
+        ]
+        constraints = [
+            # No máximo uma matrícula ativa por discente e período (também
+            # serve de índice parcial para a busca da matrícula ativa).
+            models.UniqueConstraint(
+                fields=['discente', 'periodo'],
+                condition=models.Q(ativa=True),
+                name='matricula_ativa_unica',
+            ),
+        ]
 
     def __str__(self):
         status = "ativa" if self.ativa else "inativa"
-        qtd = self.disciplinas_matricula.filter(ativa=True).count()
-        return f"Matrícula #{self.id} - {self.discente.nome} ({qtd} disciplinas, {status})"
+        return f"Matrícula #{self.id} - {self.discente.nome} ({self.disciplinas_ativas} disciplinas, {status})"
 
     def quantidade_disciplinas_ativas(self) -> int:
-        return self.disciplinas_matricula.filter(ativa=True).count()
+        return self.disciplinas_ativas
 
     def clean(self):
         if self.ativa:
@@ -60,6 +74,12 @@ class MatriculaDisciplina(models.Model):
         unique_together = [['matricula', 'disciplina']]
         verbose_name = 'Disciplina da Matrícula'
         verbose_name_plural = 'Disciplinas das Matrículas'
+        indexes = [
+            models.Index(fields=['matricula', 'disciplina', 'ativa'], name='matdisc_mat_disc_ativa_idx'),
+            # Contagens de disciplinas ativas por matrícula e de vagas ocupadas por disciplina.
+            models.Index(fields=['matricula'], condition=models.Q(ativa=True), name='matdisc_ativas_mat_idx'),
+            models.Index(fields=['disciplina'], condition=models.Q(ativa=True), name='matdisc_ativas_disc_idx'),
+        ]
 
     def __str__(self):
         status = "ativa" if self.ativa else "removida"
@@ -78,6 +98,53 @@ class MatriculaDisciplina(models.Model):
                 )
 
 
+class EsperaDisciplina(models.Model):
+    """Lugar de um discente na lista de espera (FIFO) de uma disciplina."""
+
+    discente = models.ForeignKey(
+        Discente,
+        on_delete=models.CASCADE,
+        related_name='esperas_disciplinas'
+    )
+    disciplina = models.ForeignKey(
+        Disciplina,
+        on_delete=models.CASCADE,
+        related_name='lista_espera'
+    )
+    periodo = models.CharField(max_length=20)
+    # As senhas das entradas ativas de uma disciplina/período são contíguas
+    # (a saída do meio da fila renumera quem vem atrás, e a exclusão em
+    # cascata compacta a fila em core.signals), então a posição é
+    # senha - senha da cabeça + 1: duas buscas no índice, sem contar a fila.
+    senha = models.PositiveIntegerField()
+    ativa = models.BooleanField(default=True)
+    criada_em = models.DateTimeField(auto_now_add=True)
+    promovida_em = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['senha']
+        verbose_name = 'Lista de Espera'
+        verbose_name_plural = 'Listas de Espera'
+        indexes = [
+            models.Index(
+                fields=['disciplina', 'periodo', 'senha'],
+                condition=models.Q(ativa=True),
+                name='espera_ativas_fila_idx',
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['discente', 'disciplina', 'periodo'],
+                condition=models.Q(ativa=True),
+                name='espera_ativa_unica',
+            ),
+        ]
+
+    def __str__(self):
+        status = "aguardando" if self.ativa else ("promovida" if self.promovida_em else "encerrada")
+        return f"{self.discente.nome} - {self.disciplina.nome} (senha {self.senha}, {status})"
+
+
 class ReservaLivro(models.Model):
     discente = models.ForeignKey(
         Discente,
@@ -96,7 +163,56 @@ class ReservaLivro(models.Model):
         ordering = ['-reservada_em']
         verbose_name = 'Reserva de Livro'
         verbose_name_plural = 'Reservas de Livros'
+        indexes = [
+            models.Index(fields=['discente', 'livro', 'ativa'], name='reserva_disc_livro_ativa_idx'),
+            models.Index(fields=['livro'], condition=models.Q(ativa=True), name='reserva_ativas_livro_idx'),
+        ]
 
     def __str__(self):
         status = "ativa" if self.ativa else "cancelada"
         return f"{self.discente.nome} - {self.livro.titulo} ({status})"
+
+
+class EsperaLivro(models.Model):
+    """Lugar de um discente na fila de reserva (FIFO) de um livro já reservado."""
+
+    discente = models.ForeignKey(
+        Discente,
+        on_delete=models.CASCADE,
+        related_name='esperas_livros'
+    )
+    livro = models.ForeignKey(
+        Livro,
+        on_delete=models.CASCADE,
+        related_name='fila_reservas'
+    )
+    # Senhas contíguas entre as entradas ativas, como em EsperaDisciplina
+    # (inclusive a compactação em core.signals): posição = senha - senha da
+    # cabeça + 1.
+    senha = models.PositiveIntegerField()
+    ativa = models.BooleanField(default=True)
+    criada_em = models.DateTimeField(auto_now_add=True)
+    atendida_em = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['senha']
+        verbose_name = 'Fila de Reserva'
+        verbose_name_plural = 'Filas de Reserva'
+        indexes = [
+            models.Index(
+                fields=['livro', 'senha'],
+                condition=models.Q(ativa=True),
+                name='espera_livro_ativas_fila_idx',
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['discente', 'livro'],
+                condition=models.Q(ativa=True),
+                name='espera_livro_ativa_unica',
+            ),
+        ]
+
+    def __str__(self):
+        status = "aguardando" if self.ativa else ("atendida" if self.atendida_em else "encerrada")
+        return f"{self.discente.nome} - {self.livro.titulo} (senha {self.senha}, {status})"
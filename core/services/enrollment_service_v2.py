@@ -1,11 +1,36 @@
 """Service de matrícula corrigido."""
 
-from typing import Tuple, List
-from django.db import transaction
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.core.exceptions import ValidationError
 
 from core.models.academic import Discente, Disciplina
-from core.models.enrollment import Matricula, MatriculaDisciplina
+from core.models.enrollment import EsperaDisciplina, Matricula, MatriculaDisciplina
+
+
+@dataclass
+class MatriculaEmMassa:
+    """Resultado de `EnrollmentServiceV2.matricular_turma`."""
+
+    aceitas: List[Tuple[int, int]] = field(default_factory=list)
+    recusadas: List[Tuple[int, int, str]] = field(default_factory=list)
+    matriculas_criadas: int = 0
+    elapsed: float = 0.0
+
+    def resumo(self) -> Dict[int, Dict[str, int]]:
+        """Por disciplina: {'aceitas': n, <motivo da recusa>: n, ...}."""
+        resumo: Dict[int, Counter] = defaultdict(Counter)
+        for _, disciplina_id in self.aceitas:
+            resumo[disciplina_id]['aceitas'] += 1
+        for _, disciplina_id, motivo in self.recusadas:
+            resumo[disciplina_id][motivo] += 1
+        return {disciplina_id: dict(contagem) for disciplina_id, contagem in resumo.items()}
 
 
 class EnrollmentServiceV2:
@@ -22,6 +47,7 @@ class EnrollmentServiceV2:
     """
 
     MAX_DISCIPLINAS = 5
+    LOTE = 500
 
     @classmethod
     @transaction.atomic
@@ -40,23 +66,20 @@ class EnrollmentServiceV2:
             (sucesso, mensagem, matricula)
         """
         # Busca matrícula ativa existente
-        matricula = Matricula.objects.filter(
-            discente=discente,
-            periodo=periodo,
-            ativa=True
-        ).first()
+        matricula = cls._matriculas_ativas(discente, periodo).first()
 
         if matricula:
             return True, "Matrícula existente encontrada.", matricula
 
-        # Cria nova matrícula
+        # Cria nova matrícula (a constraint matricula_ativa_unica barra uma
+        # segunda matrícula ativa criada por uma requisição concorrente)
         try:
-            matricula = Matricula.objects.create(
-                discente=discente,
-                periodo=periodo,
-                ativa=True
-            )
-            return True, "Nova matrícula criada.", matricula
+            return True, "Nova matrícula criada.", cls._criar_matricula(discente, periodo)
+        except IntegrityError:
+            matricula = cls._matriculas_ativas(discente, periodo).first()
+            if matricula:
+                return True, "Matrícula existente encontrada.", matricula
+            return False, "Não foi possível criar a matrícula.", None
         except ValidationError as e:
             return False, str(e), None
 
@@ -85,53 +108,49 @@ class EnrollmentServiceV2:
         Returns:
             (sucesso, mensagem)
         """
-        # Regra 1: Status acadêmico
-        if discente.status_academico.strip().lower() == "trancado":
-            return False, "Discente com situação acadêmica trancada."
-
-        # Regra 2: Mesmo curso
-        if disciplina.curso.strip().lower() != discente.curso.strip().lower():
-            return False, "Disciplina não pertence ao curso do discente."
-
-        # Regra 3: Vagas disponíveis
-        if disciplina.vagas <= 0:
+        # Regras 1 a 3: status, curso e vagas
+        recusa = cls._violacao_basica(discente, disciplina)
+        if recusa:
+            return False, recusa
+
+        # Matrícula, contador e vínculo com a disciplina em uma só consulta
+        matricula = cls._carregar_para_adicao(discente, periodo, disciplina)
+
+        if matricula is not None:
+            # Regra 4: Limite de disciplinas (leitura do contador, sem COUNT)
+            if matricula.disciplinas_ativas >= cls.MAX_DISCIPLINAS:
+                return False, f"Limite de {cls.MAX_DISCIPLINAS} disciplinas já atingido."
+
+            # Regra 5: Disciplina duplicada
+            if matricula.vinculo_ativo:
+                return False, "Disciplina já está na matrícula."
+
+        # Reserva da vaga no banco: a instância em memória pode estar
+        # desatualizada, então o UPDATE só decrementa se ainda houver vaga
+        if not cls._reservar_vaga(disciplina):
             return False, "Disciplina sem vagas disponíveis."
 
-        # Criar ou obter matrícula
-        ok, msg, matricula = cls.criar_ou_obter_matricula(discente, periodo)
-        if not ok or not matricula:
-            return False, f"Erro ao criar matrícula: {msg}"
-
-        # Regra 4: Limite de disciplinas
-        qtd_ativas = matricula.quantidade_disciplinas_ativas()
-        if qtd_ativas >= cls.MAX_DISCIPLINAS:
+        if matricula is None:
+            # Matrícula nova já nasce com o contador em 1 (sem UPDATE extra)
+            try:
+                matricula = cls._criar_matricula(discente, periodo, disciplinas_ativas=1)
+            except IntegrityError:
+                # Criada por uma requisição concorrente: refaz pela matrícula existente
+                cls._devolver_vaga(disciplina)
+                return cls.adicionar_disciplina(discente, disciplina, periodo)
+            except ValidationError as e:
+                cls._devolver_vaga(disciplina)
+                return False, f"Erro ao criar matrícula: {e}"
+
+        # Incremento condicional: uma adição concorrente que leu o mesmo
+        # contador não passa do limite
+        elif not cls._incrementar_contador(matricula):
+            cls._devolver_vaga(disciplina)
             return False, f"Limite de {cls.MAX_DISCIPLINAS} disciplinas já atingido."
 
-        # Regra 5: Disciplina duplicada
-        existe = MatriculaDisciplina.objects.filter(
-            matricula=matricula,
-            disciplina=disciplina,
-            ativa=True
-        ).exists()
-
-        if existe:
-            return False, "Disciplina já está na matrícula."
-
-        # Verificar se foi removida antes (reativar)
-        removida = MatriculaDisciplina.objects.filter(
-            matricula=matricula,
-            disciplina=disciplina,
-            ativa=False
-        ).first()
-
-        if removida:
-            removida.ativa = True
-            removida.save()
-
-            # Decrementar vagas localmente
-            disciplina.vagas -= 1
-            disciplina.save()
-
+        # Removida antes: reativar o vínculo existente
+        if getattr(matricula, 'vinculo_id', None) is not None:
+            MatriculaDisciplina.objects.filter(pk=matricula.vinculo_id).update(ativa=True)
             return True, f"Disciplina '{disciplina.nome}' reativada na matrícula #{matricula.id}."
 
         # Adicionar nova disciplina
@@ -141,16 +160,243 @@ class EnrollmentServiceV2:
                 disciplina=disciplina,
                 ativa=True
             )
-
-            # Decrementar vagas localmente
-            disciplina.vagas -= 1
-            disciplina.save()
-
             return True, f"Disciplina '{disciplina.nome}' adicionada à matrícula #{matricula.id}."
 
         except ValidationError as e:
             return False, f"Erro ao adicionar disciplina: {e}"
 
+    @classmethod
+    @transaction.atomic
+    def adicionar_disciplinas(
+        cls,
+        discente: Discente,
+        disciplina_ids: Iterable[int],
+        periodo: str = "2024.2"
+    ) -> Dict[int, Tuple[bool, str]]:
+        """Adiciona várias disciplinas à matrícula em uma única transação.
+
+        As cinco regras de `adicionar_disciplina` são avaliadas sobre o
+        conjunto inteiro: as disciplinas e os vínculos existentes são lidos
+        de uma vez, o limite de 5 é preenchido na ordem da lista, e as vagas,
+        o contador e os vínculos são gravados com um comando por tabela. Uma
+        disciplina recusada não impede as demais.
+
+        Args:
+            discente: Discente
+            disciplina_ids: IDs das disciplinas, na ordem de prioridade
+            periodo: Período acadêmico
+
+        Returns:
+            {disciplina_id: (sucesso, mensagem)}, na ordem recebida
+        """
+        ids = list(dict.fromkeys(int(i) for i in disciplina_ids))
+        resultados: Dict[int, Tuple[bool, str]] = {}
+
+        # Disciplinas travadas até o fim da transação: as vagas lidas são as
+        # que serão decrementadas
+        disciplinas = Disciplina.objects.select_for_update().order_by('pk').in_bulk(ids)
+
+        candidatas = []
+        for disciplina_id in ids:
+            disciplina = disciplinas.get(disciplina_id)
+            if disciplina is None:
+                resultados[disciplina_id] = (False, "Disciplina não encontrada.")
+                continue
+            recusa = cls._violacao_basica(discente, disciplina)
+            if recusa:
+                resultados[disciplina_id] = (False, recusa)
+            else:
+                candidatas.append(disciplina)
+
+        if not candidatas:
+            return {i: resultados[i] for i in ids}
+
+        matricula = cls._matriculas_ativas(discente, periodo).select_for_update().first()
+        vinculos = {}
+        if matricula is not None:
+            vinculos = {
+                disciplina_id: (pk, ativa)
+                for disciplina_id, pk, ativa in MatriculaDisciplina.objects.filter(
+                    matricula=matricula,
+                    disciplina__in=candidatas
+                ).values_list('disciplina_id', 'pk', 'ativa')
+            }
+
+        # Regras 5 e 4: duplicadas fora, depois o limite na ordem da lista
+        livres = cls.MAX_DISCIPLINAS - (matricula.disciplinas_ativas if matricula else 0)
+        aceitas = []
+        for disciplina in candidatas:
+            if vinculos.get(disciplina.pk, (None, False))[1]:
+                resultados[disciplina.pk] = (False, "Disciplina já está na matrícula.")
+            elif len(aceitas) >= livres:
+                resultados[disciplina.pk] = (
+                    False, f"Limite de {cls.MAX_DISCIPLINAS} disciplinas já atingido."
+                )
+            else:
+                aceitas.append(disciplina)
+
+        if not aceitas:
+            return {i: resultados[i] for i in ids}
+
+        if matricula is None:
+            try:
+                matricula = cls._criar_matricula(discente, periodo, disciplinas_ativas=len(aceitas))
+            except IntegrityError:
+                # Criada por uma requisição concorrente: refaz com a matrícula existente
+                return cls.adicionar_disciplinas(discente, ids, periodo)
+        else:
+            Matricula.objects.filter(pk=matricula.pk).update(
+                disciplinas_ativas=F('disciplinas_ativas') + len(aceitas)
+            )
+
+        Disciplina.objects.filter(pk__in=[d.pk for d in aceitas], vagas__gt=0).update(
+            vagas=F('vagas') - 1
+        )
+
+        reativar = [vinculos[d.pk][0] for d in aceitas if d.pk in vinculos]
+        if reativar:
+            MatriculaDisciplina.objects.filter(pk__in=reativar).update(ativa=True)
+        MatriculaDisciplina.objects.bulk_create(
+            MatriculaDisciplina(matricula=matricula, disciplina=d, ativa=True)
+            for d in aceitas if d.pk not in vinculos
+        )
+
+        for disciplina in aceitas:
+            disciplina.vagas -= 1
+            acao = "reativada na" if disciplina.pk in vinculos else "adicionada à"
+            resultados[disciplina.pk] = (
+                True, f"Disciplina '{disciplina.nome}' {acao} matrícula #{matricula.id}."
+            )
+        return {i: resultados[i] for i in ids}
+
+    @classmethod
+    @transaction.atomic
+    def matricular_turma(
+        cls,
+        discentes: QuerySet,
+        disciplina_ids: Iterable[int],
+        periodo: str = "2024.2"
+    ) -> MatriculaEmMassa:
+        """Matricula uma turma inteira nas mesmas disciplinas, em lote.
+
+        Lê discentes, disciplinas, matrículas ativas e vínculos existentes
+        com uma consulta cada e aplica as cinco regras em memória. As vagas
+        são distribuídas por ordem de ID do discente (e, para cada discente,
+        na ordem de `disciplina_ids`), então a mesma entrada sempre gera a
+        mesma alocação. As gravações são set-based: matrículas e vínculos
+        novos com bulk_create, contadores com um UPDATE por incremento,
+        vagas com um UPDATE por disciplina.
+
+        Args:
+            discentes: QuerySet com os discentes da turma
+            disciplina_ids: IDs das disciplinas obrigatórias
+            periodo: Período acadêmico
+
+        Returns:
+            MatriculaEmMassa com as aceitas e as recusadas (com o motivo)
+        """
+        inicio = time.perf_counter()
+        resultado = MatriculaEmMassa()
+        ids = list(dict.fromkeys(int(i) for i in disciplina_ids))
+
+        turma = list(discentes.order_by('id').only('id', 'curso', 'status_academico'))
+        disciplinas = Disciplina.objects.select_for_update().order_by('pk').in_bulk(ids)
+        for disciplina_id in ids:
+            if disciplina_id not in disciplinas:
+                resultado.recusadas.extend(
+                    (discente.id, disciplina_id, "Disciplina não encontrada.") for discente in turma
+                )
+        disciplinas = [disciplinas[i] for i in ids if i in disciplinas]
+
+        ativas = Matricula.objects.filter(
+            discente__in=discentes.values('id'),
+            periodo=periodo,
+            ativa=True
+        )
+        matriculas = {
+            matricula.discente_id: matricula
+            for matricula in ativas.select_for_update().only(
+                'id', 'discente_id', 'disciplinas_ativas'
+            )
+        }
+        vinculos = {
+            (discente_id, disciplina_id): (pk, ativa)
+            for discente_id, disciplina_id, pk, ativa in MatriculaDisciplina.objects.filter(
+                matricula__in=ativas,
+                disciplina__in=disciplinas
+            ).values_list('matricula__discente_id', 'disciplina_id', 'pk', 'ativa')
+        }
+
+        # Passe em memória: `disciplina.vagas` vira o saldo de vagas e é
+        # consumido na ordem dos IDs, então a regra 3 vê as vagas já alocadas
+        incrementos: Dict[int, int] = {}
+        for discente in turma:
+            matricula = matriculas.get(discente.id)
+            livres = cls.MAX_DISCIPLINAS - (matricula.disciplinas_ativas if matricula else 0)
+            for disciplina in disciplinas:
+                motivo = cls._violacao_basica(discente, disciplina)
+                if motivo is None and vinculos.get((discente.id, disciplina.pk), (None, False))[1]:
+                    motivo = "Disciplina já está na matrícula."
+                if motivo is None and livres <= 0:
+                    motivo = f"Limite de {cls.MAX_DISCIPLINAS} disciplinas já atingido."
+                if motivo:
+                    resultado.recusadas.append((discente.id, disciplina.pk, motivo))
+                    continue
+                livres -= 1
+                disciplina.vagas -= 1
+                incrementos[discente.id] = incrementos.get(discente.id, 0) + 1
+                resultado.aceitas.append((discente.id, disciplina.pk))
+
+        # Matrículas novas já nascem com o contador final
+        novas = Matricula.objects.bulk_create(
+            (
+                Matricula(discente_id=discente_id, periodo=periodo, ativa=True,
+                          disciplinas_ativas=quantidade)
+                for discente_id, quantidade in incrementos.items()
+                if discente_id not in matriculas
+            ),
+            batch_size=cls.LOTE
+        )
+        resultado.matriculas_criadas = len(novas)
+        ids_matricula = {m.discente_id: m.pk for m in novas}
+        ids_matricula.update((discente_id, m.pk) for discente_id, m in matriculas.items())
+
+        # Um UPDATE por valor de incremento (no máximo MAX_DISCIPLINAS)
+        por_incremento: Dict[int, List[int]] = defaultdict(list)
+        for discente_id, quantidade in incrementos.items():
+            if discente_id in matriculas:
+                por_incremento[quantidade].append(matriculas[discente_id].pk)
+        for quantidade, pks in por_incremento.items():
+            for lote in cls._em_lotes(pks):
+                Matricula.objects.filter(pk__in=lote).update(
+                    disciplinas_ativas=F('disciplinas_ativas') + quantidade
+                )
+
+        alocadas = Counter(disciplina_id for _, disciplina_id in resultado.aceitas)
+        for disciplina_id, quantidade in alocadas.items():
+            Disciplina.objects.filter(pk=disciplina_id).update(vagas=F('vagas') - quantidade)
+
+        reativar = [
+            vinculos[chave][0] for chave in resultado.aceitas if chave in vinculos
+        ]
+        for lote in cls._em_lotes(reativar):
+            MatriculaDisciplina.objects.filter(pk__in=lote).update(ativa=True)
+        MatriculaDisciplina.objects.bulk_create(
+            (
+                MatriculaDisciplina(
+                    matricula_id=ids_matricula[discente_id],
+                    disciplina_id=disciplina_id,
+                    ativa=True
+                )
+                for discente_id, disciplina_id in resultado.aceitas
+                if (discente_id, disciplina_id) not in vinculos
+            ),
+            batch_size=cls.LOTE
+        )
+
+        resultado.elapsed = time.perf_counter() - inicio
+        return resultado
+
     @classmethod
     @transaction.atomic
     def remover_disciplina(
@@ -192,13 +438,164 @@ class EnrollmentServiceV2:
         # Remover (marcar como inativa)
         mat_disc.ativa = False
         mat_disc.save()
+        Matricula.objects.filter(pk=matricula.pk, disciplinas_ativas__gt=0).update(
+            disciplinas_ativas=F('disciplinas_ativas') - 1
+        )
 
-        # Devolver vaga
-        disciplina.vagas += 1
-        disciplina.save()
+        # Devolver vaga e repassá-la à cabeça da lista de espera, se houver
+        cls._devolver_vaga(disciplina)
+        cls._promover_lista_espera(disciplina, periodo)
 
         return True, f"Disciplina '{disciplina.nome}' removida da matrícula #{matricula.id}."
 
+    @classmethod
+    def _em_lotes(cls, itens: List[int]) -> Iterable[List[int]]:
+        """Fatias de até LOTE itens (limite de parâmetros por consulta)."""
+        for inicio in range(0, len(itens), cls.LOTE):
+            yield itens[inicio:inicio + cls.LOTE]
+
+    @staticmethod
+    def _violacao_basica(discente: Discente, disciplina: Disciplina) -> str | None:
+        """Mensagem da primeira regra violada entre status, curso e vagas."""
+        # Regra 1: Status acadêmico
+        if discente.status_academico.strip().lower() == "trancado":
+            return "Discente com situação acadêmica trancada."
+
+        # Regra 2: Mesmo curso
+        if disciplina.curso.strip().lower() != discente.curso.strip().lower():
+            return "Disciplina não pertence ao curso do discente."
+
+        # Regra 3: Vagas disponíveis
+        if disciplina.vagas <= 0:
+            return "Disciplina sem vagas disponíveis."
+
+        return None
+
+    @staticmethod
+    def _matriculas_ativas(discente: Discente, periodo: str):
+        return Matricula.objects.filter(discente=discente, periodo=periodo, ativa=True)
+
+    @staticmethod
+    def _criar_matricula(discente: Discente, periodo: str, disciplinas_ativas: int = 0) -> Matricula:
+        """INSERT da matrícula ativa em um savepoint (IntegrityError se já houver uma)."""
+        with transaction.atomic():
+            return Matricula.objects.create(
+                discente=discente,
+                periodo=periodo,
+                ativa=True,
+                disciplinas_ativas=disciplinas_ativas
+            )
+
+    @classmethod
+    def _carregar_para_adicao(
+        cls,
+        discente: Discente,
+        periodo: str,
+        disciplina: Disciplina
+    ) -> Matricula | None:
+        """Matrícula ativa anotada com o vínculo à disciplina, em uma consulta.
+
+        `vinculo_id` é o MatriculaDisciplina existente (unique_together garante
+        no máximo um) e `vinculo_ativo` diz se ele está ativo; ambos None se a
+        disciplina nunca esteve na matrícula.
+        """
+        vinculo = MatriculaDisciplina.objects.filter(
+            matricula=OuterRef('pk'),
+            disciplina=disciplina
+        )
+        return cls._matriculas_ativas(discente, periodo).annotate(
+            vinculo_id=Subquery(vinculo.values('pk')[:1]),
+            vinculo_ativo=Subquery(vinculo.values('ativa')[:1]),
+        ).first()
+
+    @staticmethod
+    def _reservar_vaga(disciplina: Disciplina) -> bool:
+        """Decrementa `vagas` com UPDATE condicional; False se já não houver vaga.
+
+        O UPDATE ... WHERE vagas > 0 é atômico em qualquer backend (a linha
+        fica bloqueada até o fim da transação), então duas matrículas
+        simultâneas nunca vendem a mesma vaga.
+        """
+        reservada = Disciplina.objects.filter(pk=disciplina.pk, vagas__gt=0).update(
+            vagas=F('vagas') - 1
+        ) == 1
+        if reservada:
+            disciplina.vagas -= 1
+        return reservada
+
+    @staticmethod
+    def _devolver_vaga(disciplina: Disciplina) -> None:
+        """Soma 1 a `vagas` no banco, sem sobrescrever alterações concorrentes."""
+        Disciplina.objects.filter(pk=disciplina.pk).update(vagas=F('vagas') + 1)
+        disciplina.vagas += 1
+
+    @classmethod
+    def _promover_lista_espera(
+        cls,
+        disciplina: Disciplina,
+        periodo: str
+    ) -> EsperaDisciplina | None:
+        """Matricula o primeiro elegível da lista de espera na vaga liberada.
+
+        Entradas da cabeça que não passam mais nas regras (trancado, limite,
+        já matriculado) saem da fila; como saem pela frente, as senhas das
+        demais continuam contíguas. Roda na transação de quem liberou a vaga.
+
+        Returns:
+            A entrada promovida, ou None se a fila acabar sem promoção
+        """
+        fila = EsperaDisciplina.objects.filter(disciplina=disciplina, periodo=periodo, ativa=True)
+        if not fila.exists():
+            return None
+
+        # Vagas relidas com a linha travada: uma recusa no laço é sempre
+        # de elegibilidade, nunca de falta de vaga
+        disciplina = Disciplina.objects.select_for_update().get(pk=disciplina.pk)
+        while disciplina.vagas > 0:
+            cabeca = fila.select_related('discente').order_by('senha').first()
+            if cabeca is None:
+                return None
+            sucesso, _ = cls.adicionar_disciplina(cabeca.discente, disciplina, periodo)
+            cabeca.ativa = False
+            cabeca.promovida_em = timezone.now() if sucesso else None
+            cabeca.save(update_fields=['ativa', 'promovida_em'])
+            if sucesso:
+                return cabeca
+        return None
+
+    @classmethod
+    def _incrementar_contador(cls, matricula: Matricula) -> bool:
+        """Soma 1 ao contador se ainda estiver abaixo do limite; False se não couber."""
+        atualizadas = Matricula.objects.filter(
+            pk=matricula.pk,
+            disciplinas_ativas__lt=cls.MAX_DISCIPLINAS
+        ).update(disciplinas_ativas=F('disciplinas_ativas') + 1)
+        return atualizadas == 1
+
+    @staticmethod
+    def recalcular_disciplinas_ativas() -> int:
+        """Corrige o contador `disciplinas_ativas` de todas as matrículas.
+
+        A contagem real vem de uma subconsulta agregada e só as matrículas
+        divergentes são reescritas, tudo em um único UPDATE.
+
+        Returns:
+            Quantidade de matrículas corrigidas
+        """
+        ativas = (
+            MatriculaDisciplina.objects.filter(matricula=OuterRef('pk'), ativa=True)
+            .order_by()
+            .values('matricula')
+            .annotate(total=Count('id'))
+            .values('total')
+        )
+        real = Coalesce(Subquery(ativas), 0)
+        return (
+            Matricula.objects.alias(real=real)
+            .exclude(disciplinas_ativas=F('real'))
+            .update(disciplinas_ativas=real)
+        )
+
     @classmethod
     def listar_disciplinas_matricula(
         cls,
@@ -1,68 +1,157 @@
+import hashlib
+import json
 import logging
-from django.db import transaction
+import requests
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Count
+from core.gateways.single_flight import SingleFlight
 from core.gateways.unified_gateway import UnifiedGateway
-from core.models import Discente, Disciplina, Livro
+from core.services.enrollment_service_v2 import EnrollmentServiceV2
+from core.services.snapshot_service import SnapshotService
+from core.models import (
+    Discente, Disciplina, Livro,
+    Matricula, MatriculaDisciplina, ReservaLivro,
+    EsperaDisciplina, EsperaLivro,
+    MatriculaSimulada, ReservaSimulada,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def _dados_discente(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'nome': item.get('nome', ''),
+        'curso': item.get('curso', ''),
+        'modalidade': item.get('modalidade', ''),
+        'status_academico': item.get('status', ''),
+    }
+
+
+def _dados_disciplina(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'curso': item.get('curso', ''),
+        'nome': item.get('nome', ''),
+        'vagas': int(item.get('vagas', 0)),
+    }
+
+
+def _dados_livro(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'titulo': item.get('titulo', ''),
+        'autor': item.get('autor', ''),
+        'ano': int(item.get('ano', 0)),
+        'status': item.get('status', ''),
+    }
+
+
+def _hash_registro(valores: Dict[str, Any]) -> str:
+    '''Hash de conteúdo de um registro, independente da ordem dos campos.'''
+    conteudo = json.dumps(valores, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(conteudo.encode('utf-8')).hexdigest()
+
+
+Mapeador = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+def _campos(model: type[models.Model]) -> List[str]:
+    '''Campos gravados a partir do payload (todos exceto a chave primária).'''
+    return [f.attname for f in model._meta.concrete_fields if not f.primary_key]
+
+
 class InitializationService:
+    # (chave em ExternalData, model, mapeador do payload para os campos do model)
+    ENTIDADES: Tuple[Tuple[str, type[models.Model], Mapeador], ...] = (
+        ('discentes', Discente, _dados_discente),
+        ('disciplinas', Disciplina, _dados_disciplina),
+        ('livros', Livro, _dados_livro),
+    )
+
+    # Sincronizações concorrentes (carga completa ou incremental) compartilham
+    # a que já está rodando em vez de disputar as mesmas tabelas.
+    _sincronizacao = SingleFlight()
+    CHAVE_SINCRONIZACAO = 'sincronizacao'
+
     @classmethod
-    @transaction.atomic
-    def inicializar_sistema(cls, forcar_reinicializacao: bool = False) -> tuple[bool, str]:
+    def batch_size(cls) -> int:
+        return getattr(settings, 'INICIALIZACAO_BATCH_SIZE', 500)
+
+    @classmethod
+    def sincronizacao_em_andamento(cls) -> bool:
+        return cls._sincronizacao.em_andamento(cls.CHAVE_SINCRONIZACAO)
+
+    @classmethod
+    def inicializar_sistema(
+        cls,
+        forcar_reinicializacao: bool = False,
+        em_lote: bool = True,
+        streaming: bool = False,
+        limpar: bool = False,
+    ) -> tuple[bool, str]:
+        '''Carrega os dados dos microsserviços no banco local.
+
+        Se outra sincronização já estiver em andamento, espera por ela e
+        devolve o mesmo resultado em vez de iniciar uma carga concorrente.
+
+        Args:
+            forcar_reinicializacao: Recarrega mesmo se já houver dados
+            em_lote: Grava com bulk_create/bulk_update (False: registro a registro)
+            streaming: Lê cada catálogo em streaming e grava lote a lote,
+                com pico de memória constante (não grava snapshot)
+            limpar: Apaga todas as tabelas locais (inclusive matrículas e
+                reservas) na mesma transação, antes de gravar os dados novos
+        '''
+        return cls._sincronizacao.executar(
+            cls.CHAVE_SINCRONIZACAO,
+            lambda: cls._inicializar_sistema(forcar_reinicializacao, em_lote, streaming, limpar),
+        )
+
+    @classmethod
+    def _inicializar_sistema(
+        cls,
+        forcar_reinicializacao: bool,
+        em_lote: bool,
+        streaming: bool,
+        limpar: bool,
+    ) -> tuple[bool, str]:
         if not forcar_reinicializacao:
             if Discente.objects.exists() or Livro.objects.exists():
                 return True, "Sistema já foi inicializado. Use forcar_reinicializacao=True para recarregar."
 
         logger.info("Iniciando consumo dos microsserviços...")
 
-        dados = UnifiedGateway.consumir_todos_dados()
-
-        if not dados.sucesso:
-            msg = "Falha ao consumir dados: " + "; ".join(dados.erros)
-            logger.error(msg)
-            return False, msg
+        if streaming:
+            # O stream é gravado lote a lote à medida que chega, então a
+            # transação (e a trava de escrita do SQLite) cobre a leitura
+            with transaction.atomic():
+                if limpar:
+                    cls.limpar_tabelas()
+                stats, erros = cls._carregar_em_streaming()
+                if len(erros) == len(cls.ENTIDADES):
+                    # Nada chegou: desfaz a limpeza para o cache antigo continuar servindo
+                    transaction.set_rollback(True)
+                    msg = "Falha ao consumir dados: " + "; ".join(erros)
+                    logger.error(msg)
+                    return False, msg
+        else:
+            # Busca fora da transação: matrículas e reservas não esperam a
+            # rede pela trava de escrita, só pela gravação
+            dados = UnifiedGateway.consumir_todos_dados()
 
-        stats = {
-            'discentes': 0,
-            'disciplinas': 0,
-            'livros': 0,
-        }
+            if not dados.sucesso:
+                msg = "Falha ao consumir dados: " + "; ".join(dados.erros)
+                logger.error(msg)
+                return False, msg
 
-        for item in dados.discentes:
-            Discente.objects.update_or_create(
-                id=item['id'],
-                defaults={
-                    'nome': item.get('nome', ''),
-                    'curso': item.get('curso', ''),
-                    'modalidade': item.get('modalidade', ''),
-                    'status_academico': item.get('status', ''),
-                }
-            )
-            stats['discentes'] += 1
-
-        for item in dados.disciplinas:
-            Disciplina.objects.update_or_create(
-                id=item['id'],
-                defaults={
-                    'curso': item.get('curso', ''),
-                    'nome': item.get('nome', ''),
-                    'vagas': item.get('vagas', 0),
-                }
-            )
-            stats['disciplinas'] += 1
-
-        for item in dados.livros:
-            Livro.objects.update_or_create(
-                id=item['id'],
-                defaults={
-                    'titulo': item.get('titulo', ''),
-                    'autor': item.get('autor', ''),
-                    'ano': item.get('ano', 0),
-                    'status': item.get('status', ''),
-                }
-            )
-            stats['livros'] += 1
+            # Só apaga depois de o upstream responder: se ele cair, o cache
+            # local antigo continua servindo.
+            with transaction.atomic():
+                if limpar:
+                    cls.limpar_tabelas()
+                stats = cls.carregar_dados(dados, em_lote=em_lote)
+            cls._salvar_snapshot(dados)
+            erros = dados.erros
 
         msg = (
             f"Sistema inicializado com sucesso. "
@@ -73,7 +162,342 @@ class InitializationService:
 
         logger.info(msg)
 
+        if erros:
+            msg += f" | Avisos: {'; '.join(erros)}"
+
+        return True, msg
+
+    @classmethod
+    def _carregar_em_streaming(cls) -> Tuple[Dict[str, int], List[str]]:
+        '''Lê cada fonte em streaming e grava lote a lote.'''
+        stats: Dict[str, int] = {}
+        erros: List[str] = []
+        for chave, model, mapear in cls.ENTIDADES:
+            try:
+                lotes = UnifiedGateway.iterar_lotes(chave, tamanho_lote=cls.batch_size())
+                stats[chave] = cls._sincronizar_stream(model, lotes, mapear)
+            except (requests.RequestException, ValueError) as exc:
+                stats[chave] = 0
+                erros.append(f"Erro ao buscar {chave}: {exc}")
+                logger.error(erros[-1])
+        return stats, erros
+
+    @staticmethod
+    def limpar_tabelas() -> None:
+        '''Apaga o cache local e todas as matrículas, reservas e filas.'''
+        EsperaDisciplina.objects.all().delete()
+        EsperaLivro.objects.all().delete()
+        MatriculaDisciplina.objects.all().delete()
+        Matricula.objects.all().delete()
+        ReservaLivro.objects.all().delete()
+        Discente.objects.all().delete()
+        Disciplina.objects.all().delete()
+        Livro.objects.all().delete()
+        MatriculaSimulada.objects.all().delete()
+        ReservaSimulada.objects.all().delete()
+
+    @classmethod
+    def sincronizar_incremental(cls) -> tuple[bool, str]:
+        '''Ressincroniza o cache local sem apagar as tabelas.
+
+        Compara o payload dos microsserviços com as linhas locais e grava
+        apenas o que mudou. Registros que sumiram do upstream são removidos
+        (junto com as matrículas/reservas que dependem deles); as demais
+        matrículas e reservas locais são mantidas. Fontes que falharam não
+        removem nada. Chamadas concorrentes compartilham a sincronização
+        em andamento.
+        '''
+        return cls._sincronizacao.executar(cls.CHAVE_SINCRONIZACAO, cls._sincronizar_incremental)
+
+    @classmethod
+    def _sincronizar_incremental(cls) -> tuple[bool, str]:
+        logger.info("Iniciando sincronização incremental...")
+
+        # Busca fora da transação; só a gravação das diferenças é atômica
+        dados = UnifiedGateway.consumir_todos_dados()
+
+        if not dados.sucesso:
+            msg = "Falha ao consumir dados: " + "; ".join(dados.erros)
+            logger.error(msg)
+            return False, msg
+
+        with transaction.atomic():
+            stats = cls.aplicar_diferencas(dados)
+        cls._salvar_snapshot(dados)
+
+        msg = f"Sincronização incremental concluída. {cls._resumir(stats)}"
+
+        logger.info(msg)
+
         if dados.erros:
             msg += f" | Avisos: {'; '.join(dados.erros)}"
 
         return True, msg
+
+    @classmethod
+    @transaction.atomic
+    def hidratar_do_snapshot(cls) -> tuple[bool, str]:
+        '''Carrega o cache local a partir do snapshot em disco, sem rede.'''
+        snapshot = SnapshotService.carregar()
+        if snapshot is None:
+            return False, f"Nenhum snapshot válido em {SnapshotService.caminho()}."
+
+        stats = cls.aplicar_diferencas(snapshot.dados)
+        msg = (
+            f"Cache hidratado do snapshot de {snapshot.criado_em:%d/%m/%Y %H:%M:%S} "
+            f"({snapshot.idade_segundos:.0f}s atrás). {cls._resumir(stats)}"
+        )
+        logger.info(msg)
+        return True, msg
+
+    @staticmethod
+    def _salvar_snapshot(dados) -> None:
+        '''Grava o payload como snapshot se habilitado e se todas as fontes responderam.'''
+        if not getattr(settings, 'SNAPSHOT_HABILITADO', False) or dados.erros:
+            return
+        try:
+            SnapshotService.salvar(dados)
+        except OSError as exc:
+            logger.warning(f"Não foi possível gravar o snapshot: {exc}")
+
+    @staticmethod
+    def _resumir(stats: Dict[str, Dict[str, int]]) -> str:
+        return "; ".join(
+            f"{chave.capitalize()}: {c['adicionados']} adicionados, {c['alterados']} alterados, "
+            f"{c['removidos']} removidos, {c['inalterados']} inalterados"
+            for chave, c in stats.items()
+        )
+
+    @classmethod
+    def aplicar_diferencas(cls, dados) -> Dict[str, Dict[str, int]]:
+        '''Aplica no banco a diferença entre um ExternalData e as linhas locais.
+
+        Returns:
+            Por entidade, a contagem de adicionados, alterados, removidos e
+            inalterados.
+        '''
+        fontes_com_erro = getattr(dados, 'fontes_com_erro', [])
+        stats: Dict[str, Dict[str, int]] = {}
+        for chave, model, mapear in cls.ENTIDADES:
+            stats[chave] = cls._sincronizar_entidade(
+                model,
+                getattr(dados, chave),
+                mapear,
+                remover_ausentes=chave not in fontes_com_erro,
+            )
+        return stats
+
+    @classmethod
+    def carregar_dados(cls, dados, em_lote: bool = True) -> Dict[str, int]:
+        '''Grava no banco local os registros de um ExternalData.
+
+        Args:
+            dados: ExternalData (ou objeto com discentes/disciplinas/livros)
+            em_lote: Se True usa bulk_create/bulk_update; se False grava
+                registro a registro com update_or_create.
+
+        Returns:
+            Quantidade de registros processados por entidade.
+        '''
+        stats: Dict[str, int] = {}
+        for chave, model, mapear in cls.ENTIDADES:
+            itens = getattr(dados, chave)
+            if em_lote:
+                stats[chave] = cls._upsert_em_lote(model, itens, mapear)
+            else:
+                stats[chave] = cls._upsert_por_registro(model, itens, mapear)
+        return stats
+
+    @staticmethod
+    def _upsert_por_registro(
+        model: type[models.Model],
+        itens: Iterable[Dict[str, Any]],
+        mapear: Mapeador,
+    ) -> int:
+        total = 0
+        for item in itens:
+            model.objects.update_or_create(id=item['id'], defaults=mapear(item))
+            total += 1
+        return total
+
+    @classmethod
+    def _upsert_em_lote(
+        cls,
+        model: type[models.Model],
+        itens: Iterable[Dict[str, Any]],
+        mapear: Mapeador,
+    ) -> int:
+        '''Insere registros novos e atualiza apenas os que mudaram.'''
+        contagem = cls._sincronizar_entidade(model, itens, mapear, remover_ausentes=False)
+        return contagem['adicionados'] + contagem['alterados'] + contagem['inalterados']
+
+    @classmethod
+    def _sincronizar_entidade(
+        cls,
+        model: type[models.Model],
+        itens: Iterable[Dict[str, Any]],
+        mapear: Mapeador,
+        remover_ausentes: bool,
+    ) -> Dict[str, int]:
+        '''Aplica no banco apenas a diferença entre o payload e as linhas locais.
+
+        As linhas locais são lidas em uma única consulta e comparadas com o
+        payload pelo hash de conteúdo de cada registro. Os novos vão para
+        `bulk_create`, os alterados para `bulk_update` (em lotes de
+        `INICIALIZACAO_BATCH_SIZE`) e, se `remover_ausentes`, os que não
+        vieram no payload são apagados.
+
+        Returns:
+            Contagem de adicionados, alterados, removidos e inalterados.
+        '''
+        registros: Dict[int, Dict[str, Any]] = {}
+        for item in itens:
+            registros[int(item['id'])] = mapear(item)
+
+        contagem = dict.fromkeys(('adicionados', 'alterados', 'removidos', 'inalterados'), 0)
+        if not registros and not remover_ausentes:
+            return contagem
+
+        campos = _campos(model)
+        if registros:
+            cls._aplicar_estado_local(model, registros, cls._carregar_estado_local(model))
+
+        existentes = {
+            linha[0]: _hash_registro(dict(zip(campos, linha[1:])))
+            for linha in model.objects.values_list('id', *campos).iterator()
+        }
+
+        adicionados, alterados, inalterados = cls._gravar_diferencas(
+            model, registros, campos, existentes
+        )
+
+        removidos = [pk for pk in existentes if pk not in registros] if remover_ausentes else []
+        batch_size = cls.batch_size()
+        for inicio in range(0, len(removidos), batch_size):
+            model.objects.filter(id__in=removidos[inicio:inicio + batch_size]).delete()
+        if removidos and model is Disciplina:
+            # O CASCADE apagou disciplinas de matrículas: corrige os contadores.
+            EnrollmentServiceV2.recalcular_disciplinas_ativas()
+
+        contagem.update(
+            adicionados=adicionados,
+            alterados=alterados,
+            removidos=len(removidos),
+            inalterados=inalterados,
+        )
+        logger.info(
+            f"{model.__name__}: {contagem['adicionados']} adicionados, "
+            f"{contagem['alterados']} alterados, {contagem['removidos']} removidos, "
+            f"{contagem['inalterados']} inalterados"
+        )
+        return contagem
+
+    @classmethod
+    def gravar_registros(cls, model: type[models.Model], itens: Iterable[Dict[str, Any]]) -> int:
+        '''Insere/atualiza em lote registros no formato do upstream (sem remover nada).
+
+        Usado para sincronizações parciais, como um conjunto de discentes.
+        '''
+        mapear = next(m for _, modelo, m in cls.ENTIDADES if modelo is model)
+        itens = list(itens)
+        lotes = (itens[i:i + cls.batch_size()] for i in range(0, len(itens), cls.batch_size()))
+        return cls._sincronizar_stream(model, lotes, mapear)
+
+    @classmethod
+    def _sincronizar_stream(
+        cls,
+        model: type[models.Model],
+        lotes: Iterable[List[Dict[str, Any]]],
+        mapear: Mapeador,
+    ) -> int:
+        '''Grava lote a lote um stream de registros (sem remover ausentes).
+
+        Cada lote consulta só as suas próprias linhas locais, então a memória
+        usada não cresce com o tamanho do catálogo.
+        '''
+        campos = _campos(model)
+        estado_local = cls._carregar_estado_local(model)
+        total = 0
+
+        for lote in lotes:
+            registros = {int(item['id']): mapear(item) for item in lote}
+            cls._aplicar_estado_local(model, registros, estado_local)
+            existentes = {
+                linha[0]: _hash_registro(dict(zip(campos, linha[1:])))
+                for linha in model.objects.filter(id__in=list(registros)).values_list('id', *campos)
+            }
+            cls._gravar_diferencas(model, registros, campos, existentes)
+            total += len(lote)
+
+        logger.info(f"{model.__name__}: {total} registros processados em streaming")
+        return total
+
+    @classmethod
+    def _gravar_diferencas(
+        cls,
+        model: type[models.Model],
+        registros: Dict[int, Dict[str, Any]],
+        campos: List[str],
+        existentes: Dict[int, str],
+    ) -> Tuple[int, int, int]:
+        '''Insere os novos e atualiza os alterados; retorna (novos, alterados, inalterados).'''
+        novos = []
+        alterados = []
+        inalterados = 0
+        for pk, valores in registros.items():
+            hash_local = existentes.get(pk)
+            if hash_local is None:
+                novos.append(model(id=pk, **valores))
+            elif hash_local != _hash_registro(valores):
+                alterados.append(model(id=pk, **valores))
+            else:
+                inalterados += 1
+
+        batch_size = cls.batch_size()
+        if novos:
+            model.objects.bulk_create(novos, batch_size=batch_size)
+        if alterados:
+            model.objects.bulk_update(alterados, campos, batch_size=batch_size)
+        return len(novos), len(alterados), inalterados
+
+    @staticmethod
+    def _carregar_estado_local(model: type[models.Model]) -> Dict[int, int]:
+        '''Lê o efeito das simulações locais ativas sobre a entidade.
+
+        Disciplina: matrículas ativas por disciplina. Livro: livros com
+        reserva ativa. Demais entidades: vazio.
+        '''
+        if model is Disciplina:
+            ocupadas = (
+                MatriculaDisciplina.objects.filter(ativa=True)
+                .values('disciplina_id')
+                .annotate(total=Count('id'))
+            )
+            return {linha['disciplina_id']: linha['total'] for linha in ocupadas}
+        if model is Livro:
+            reservados = ReservaLivro.objects.filter(ativa=True).order_by().values_list(
+                'livro_id', flat=True
+            ).distinct()
+            return dict.fromkeys(reservados, 1)
+        return {}
+
+    @staticmethod
+    def _aplicar_estado_local(
+        model: type[models.Model],
+        registros: Dict[int, Dict[str, Any]],
+        estado_local: Dict[int, int],
+    ) -> None:
+        '''Preserva no payload o efeito das simulações locais ativas.
+
+        As vagas de uma disciplina descontam as matrículas ativas e um livro
+        com reserva ativa continua "Reservado"; assim a ressincronização não
+        desfaz as simulações nem marca essas linhas como alteradas à toa.
+        '''
+        for pk, quantidade in estado_local.items():
+            valores = registros.get(pk)
+            if valores is None:
+                continue
+            if model is Disciplina:
+                valores['vagas'] -= quantidade
+            elif model is Livro:
+                valores['status'] = "Reservado"
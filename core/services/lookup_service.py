@@ -1,24 +1,60 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Dict, Iterable, List, Tuple
 
-from core.gateways.aluno_gateway import buscar_discente_por_id
+from django.db import transaction
+
+from core.gateways.aluno_gateway import buscar_discente_por_id, listar_discentes
 from core.gateways.disciplina_gateway import listar_disciplinas
 from core.gateways.biblioteca_gateway import listar_livros
+from core.gateways.upstreams import obter_upstream
 from core.models.academic import Discente, Disciplina, Livro
+from core.services.initialization_service import InitializationService
+
+
+@dataclass
+class SincronizacaoDiscentes:
+    '''Resultado de `LookupService.sincronizar_discentes`.'''
+
+    sincronizados: List[int] = field(default_factory=list)
+    falhas: Dict[int, str] = field(default_factory=dict)
+    gravados: int = 0
+    elapsed: float = 0.0
 
 
 class LookupService:
     '''Serviço de consulta que orquestra gateways e modelos locais.'''
 
+    # Quantidade de IDs a partir da qual `sincronizar_discentes` busca a
+    # lista completa do msAluno em vez de consultar um a um.
+    LISTA_A_PARTIR_DE = 100
+
     @staticmethod
     def sincronizar_discente(discente_id: int) -> Tuple[bool, str, Discente | None]:
-        '''Busca um discente no serviço externo e atualiza/insere localmente.'''
+        '''Busca um discente no serviço externo e atualiza/insere localmente.
+
+        Quando a resposta vem do cache em memória do gateway, o registro local
+        já foi gravado antes e não é reescrito. Com o circuito do msAluno
+        aberto, devolve o registro local, se houver.
+        '''
         result = buscar_discente_por_id(discente_id)
+        if result.circuito_aberto:
+            local = Discente.objects.filter(id=discente_id).first()
+            if local is not None:
+                return True, "Serviço de discentes indisponível; usando dados locais.", local
         if not result.ok or not result.data:
             return False, result.error or "Falha ao consultar serviço de discentes.", None
 
         data = result.data
+        if result.do_cache:
+            discente = Discente.objects.filter(id=int(data.get("id"))).first()
+            if discente is not None:
+                return True, "Discente obtido do cache.", discente
+
         discente, _ = Discente.objects.update_or_create(
             id=int(data.get("id")),
             defaults={
@@ -30,6 +66,87 @@ class LookupService:
         )
         return True, "Discente sincronizado com sucesso.", discente
 
+    @classmethod
+    def sincronizar_discentes(
+        cls,
+        discente_ids: Iterable[int],
+        paralelismo: int | None = None,
+    ) -> SincronizacaoDiscentes:
+        '''Busca vários discentes e grava todos em lote.
+
+        A partir de `LISTA_A_PARTIR_DE` IDs, uma única chamada à lista
+        completa do msAluno substitui as consultas individuais; IDs fora da
+        lista ficam em `falhas`. Para menos IDs, ou se a lista falhar, as
+        consultas por ID rodam com no máximo `paralelismo` chamadas
+        simultâneas (padrão: o tamanho do pool de conexões do serviço), sem
+        passar pelo cache do gateway. Os registros obtidos são gravados
+        juntos, com bulk_create/bulk_update, em uma transação; IDs que
+        falharem não impedem os demais.
+        '''
+        inicio = time.time()
+        ids = list(dict.fromkeys(int(i) for i in discente_ids))
+        resultado = SincronizacaoDiscentes()
+        if not ids:
+            return resultado
+
+        itens = None
+        if len(ids) >= cls.LISTA_A_PARTIR_DE:
+            itens = cls._discentes_da_lista(ids, resultado)
+        if itens is None:
+            itens = cls._discentes_por_id(ids, paralelismo, resultado)
+
+        with transaction.atomic():
+            resultado.gravados = InitializationService.gravar_registros(Discente, itens)
+
+        resultado.elapsed = time.time() - inicio
+        return resultado
+
+    @staticmethod
+    def _discentes_da_lista(
+        ids: List[int],
+        resultado: SincronizacaoDiscentes,
+    ) -> List[Dict[str, Any]] | None:
+        '''Filtra os IDs pedidos da lista completa; None se a lista falhar.'''
+        result = listar_discentes()
+        if not result.ok or not isinstance(result.data, list):
+            return None
+
+        por_id = {
+            int(item["id"]): item
+            for item in result.data
+            if isinstance(item, dict) and item.get("id") is not None
+        }
+        itens: List[Dict[str, Any]] = []
+        for discente_id in ids:
+            item = por_id.get(discente_id)
+            if item is None:
+                resultado.falhas[discente_id] = "Discente não encontrado no serviço de discentes."
+            else:
+                itens.append(item)
+                resultado.sincronizados.append(discente_id)
+        return itens
+
+    @staticmethod
+    def _discentes_por_id(
+        ids: List[int],
+        paralelismo: int | None,
+        resultado: SincronizacaoDiscentes,
+    ) -> List[Dict[str, Any]]:
+        paralelismo = paralelismo or obter_upstream("discentes").tamanho_pool
+        with ThreadPoolExecutor(max_workers=min(paralelismo, len(ids))) as executor:
+            respostas = list(executor.map(partial(buscar_discente_por_id, usar_cache=False), ids))
+
+        itens: List[Dict[str, Any]] = []
+        for discente_id, result in zip(ids, respostas):
+            if result.ok and isinstance(result.data, dict) and result.data.get("id") is not None:
+                itens.append(result.data)
+                resultado.sincronizados.append(discente_id)
+            elif result.ok:
+                resultado.falhas[discente_id] = "Resposta sem dados do discente."
+            else:
+                resultado.falhas[discente_id] = result.error or "Falha ao consultar serviço de discentes."
+        return itens
+
     @staticmethod
     def sincronizar_disciplinas() -> List[Disciplina]:
         '''Sincroniza disciplinas a partir do serviço externo.'''
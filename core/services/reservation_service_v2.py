@@ -1,10 +1,13 @@
 """Service de reserva de livros."""
 
 from typing import Tuple, List
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
 from core.models.academic import Discente, Livro
-from core.models.enrollment import ReservaLivro
+from core.models.enrollment import EsperaLivro, ReservaLivro
 
 
 class ReservationServiceV2:
@@ -17,7 +20,7 @@ class ReservationServiceV2:
     Princípios GRASP:
     - Controller: Coordena operações de reserva
     - Information Expert: Conhece regras de reserva
-    - Creator: Cria objetos ReservaLivro
+    - Creator: Cria objetos ReservaLivro e EsperaLivro
     """
 
     @classmethod
@@ -30,7 +33,8 @@ class ReservationServiceV2:
         """Reserva um livro para o discente.
 
         REGRAS DE NEGÓCIO:
-        1. Livro deve estar disponível
+        1. Livro deve estar disponível; se já estiver reservado por outro
+           discente, o pedido entra na fila do livro
         2. Não pode ter reserva duplicada ativa
 
         Args:
@@ -40,9 +44,9 @@ class ReservationServiceV2:
         Returns:
             (sucesso, mensagem)
         """
-        # Regra 1: Livro disponível
-        if livro.status.strip().lower() != "disponível":
-            return False, "Livro não está disponível para reserva."
+        # Status relido com a linha travada: reservas, cancelamentos e a
+        # fila do mesmo livro ficam em série
+        livro.status = cls._travar(livro)
 
         # Regra 2: Reserva duplicada
         existe = ReservaLivro.objects.filter(
@@ -54,34 +58,15 @@ class ReservationServiceV2:
         if existe:
             return False, "Você já possui uma reserva ativa para este livro."
 
-        # Verificar se foi cancelada antes (reativar)
-        cancelada = ReservaLivro.objects.filter(
-            discente=discente,
-            livro=livro,
-            ativa=False
-        ).first()
-
-        if cancelada:
-            cancelada.ativa = True
-            cancelada.save()
-
-            # Atualizar status do livro
-            livro.status = "Reservado"
-            livro.save()
+        # Regra 1: Livro disponível (reservado por outro: fila)
+        if livro.status.strip().lower() != "disponível":
+            if ReservaLivro.objects.filter(livro=livro, ativa=True).exists():
+                return cls._entrar_fila(discente, livro)
+            return False, "Livro não está disponível para reserva."
 
+        reativada = cls._conceder(discente, livro)
+        if reativada:
             return True, f"Reserva do livro '{livro.titulo}' reativada com sucesso."
-
-        # Criar nova reserva
-        ReservaLivro.objects.create(
-            discente=discente,
-            livro=livro,
-            ativa=True
-        )
-
-        # Atualizar status do livro
-        livro.status = "Reservado"
-        livro.save()
-
         return True, f"Livro '{livro.titulo}' reservado com sucesso."
 
     @classmethod
@@ -91,7 +76,10 @@ class ReservationServiceV2:
         discente: Discente,
         livro: Livro
     ) -> Tuple[bool, str]:
-        """Cancela reserva de livro.
+        """Cancela reserva de livro (ou a espera na fila dele).
+
+        Com fila, o livro passa direto para o primeiro da fila, na mesma
+        transação; sem fila, volta a ficar disponível.
 
         Args:
             discente: Discente
@@ -100,6 +88,8 @@ class ReservationServiceV2:
         Returns:
             (sucesso, mensagem)
         """
+        cls._travar(livro)
+
         # Buscar reserva ativa
         reserva = ReservaLivro.objects.filter(
             discente=discente,
@@ -108,18 +98,140 @@ class ReservationServiceV2:
         ).first()
 
         if not reserva:
-            return False, "Reserva não encontrada."
+            return cls._sair_fila(discente, livro)
 
         # Cancelar (marcar como inativa)
         reserva.ativa = False
         reserva.save()
 
-        # Restaurar status do livro
+        # Repassar ao próximo da fila ou restaurar status do livro
+        if cls._atender_proximo(livro):
+            return True, (
+                f"Reserva do livro '{livro.titulo}' cancelada; "
+                "o livro foi repassado ao próximo da fila."
+            )
+
         livro.status = "Disponível"
-        livro.save()
+        livro.save(update_fields=['status'])
 
         return True, f"Reserva do livro '{livro.titulo}' cancelada com sucesso."
 
+    @classmethod
+    def posicao_fila(cls, discente: Discente, livro: Livro) -> int | None:
+        """Posição do discente na fila do livro (1 = próximo) ou None.
+
+        Uma consulta: a senha do discente menos a senha da cabeça, ambas
+        lidas do índice parcial da fila.
+        """
+        cabeca = cls._fila(livro).order_by('senha').values('senha')[:1]
+        return cls._fila(livro).filter(discente=discente).annotate(
+            posicao=F('senha') - Subquery(cabeca) + 1
+        ).values_list('posicao', flat=True).first()
+
+    @classmethod
+    def listar_filas(cls, discente: Discente) -> List[EsperaLivro]:
+        """Filas em que o discente aguarda, cada entrada com `posicao` anotada."""
+        cabeca = EsperaLivro.objects.filter(
+            livro=OuterRef('livro'),
+            ativa=True
+        ).order_by('senha').values('senha')[:1]
+        return list(
+            EsperaLivro.objects.filter(discente=discente, ativa=True)
+            .select_related('livro')
+            .annotate(posicao=F('senha') - Subquery(cabeca) + 1)
+        )
+
+    @staticmethod
+    def compactar_fila(livro_id: int) -> int:
+        """Renumera a fila do livro a partir da cabeça, fechando buracos.
+
+        Mesmo UPDATE de `WaitlistService.compactar`, para entradas ativas
+        apagadas em cascata sem passar por `_sair_fila`.
+        """
+        fila = EsperaLivro.objects.filter(livro_id=livro_id, ativa=True)
+        cabeca = fila.order_by('senha').values('senha')[:1]
+        a_frente = fila.filter(senha__lt=OuterRef('senha')).order_by().values('livro').annotate(
+            total=Count('pk')
+        ).values('total')
+        return fila.update(senha=Subquery(cabeca) + Coalesce(Subquery(a_frente), Value(0)))
+
+    @staticmethod
+    def _travar(livro: Livro) -> str:
+        """Trava a linha do livro e devolve o status atual."""
+        return Livro.objects.select_for_update().values_list('status', flat=True).get(
+            pk=livro.pk
+        )
+
+    @staticmethod
+    def _fila(livro: Livro):
+        return EsperaLivro.objects.filter(livro=livro, ativa=True)
+
+    @staticmethod
+    def _conceder(discente: Discente, livro: Livro) -> bool:
+        """Ativa a reserva do discente e marca o livro; True se reativou uma antiga."""
+        # Verificar se foi cancelada antes (reativar)
+        cancelada = ReservaLivro.objects.filter(
+            discente=discente,
+            livro=livro,
+            ativa=False
+        ).first()
+
+        if cancelada:
+            cancelada.ativa = True
+            cancelada.save()
+        else:
+            ReservaLivro.objects.create(
+                discente=discente,
+                livro=livro,
+                ativa=True
+            )
+
+        # Atualizar status do livro
+        livro.status = "Reservado"
+        livro.save(update_fields=['status'])
+        return cancelada is not None
+
+    @classmethod
+    def _entrar_fila(cls, discente: Discente, livro: Livro) -> Tuple[bool, str]:
+        ultima = cls._fila(livro).order_by('-senha').values_list('senha', flat=True).first()
+        try:
+            with transaction.atomic():
+                EsperaLivro.objects.create(
+                    discente=discente,
+                    livro=livro,
+                    senha=(ultima or 0) + 1
+                )
+        except IntegrityError:
+            posicao = cls.posicao_fila(discente, livro)
+            return False, f"Você já está na fila deste livro (posição {posicao})."
+
+        posicao = cls.posicao_fila(discente, livro)
+        return True, f"Livro '{livro.titulo}' já reservado; você entrou na fila na posição {posicao}."
+
+    @classmethod
+    def _sair_fila(cls, discente: Discente, livro: Livro) -> Tuple[bool, str]:
+        """Tira o discente da fila; quem estava atrás sobe uma senha (um UPDATE)."""
+        entrada = cls._fila(livro).filter(discente=discente).first()
+        if entrada is None:
+            return False, "Reserva não encontrada."
+
+        EsperaLivro.objects.filter(pk=entrada.pk).update(ativa=False)
+        cls._fila(livro).filter(senha__gt=entrada.senha).update(senha=F('senha') - 1)
+        return True, f"Você saiu da fila do livro '{livro.titulo}'."
+
+    @classmethod
+    def _atender_proximo(cls, livro: Livro) -> EsperaLivro | None:
+        """Entrega o livro à cabeça da fila; sai pela frente, sem renumerar."""
+        cabeca = cls._fila(livro).select_related('discente').order_by('senha').first()
+        if cabeca is None:
+            return None
+
+        cabeca.ativa = False
+        cabeca.atendida_em = timezone.now()
+        cabeca.save(update_fields=['ativa', 'atendida_em'])
+        cls._conceder(cabeca.discente, livro)
+        return cabeca
+
     @classmethod
     def listar_reservas(
         cls,
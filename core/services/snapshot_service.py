@@ -0,0 +1,121 @@
+"""Snapshot em disco do último payload bem-sucedido dos microsserviços."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.gateways.unified_gateway import ExternalData
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Snapshot:
+    '''Payload salvo em disco com versão de formato e carimbo de frescor.'''
+
+    versao: int
+    criado_em: datetime
+    dados: ExternalData
+
+    @property
+    def idade_segundos(self) -> float:
+        return (timezone.now() - self.criado_em).total_seconds()
+
+
+class SnapshotService:
+    '''Grava e lê o snapshot (JSON comprimido com gzip) ao lado do banco.
+
+    Permite hidratar o cache local em milissegundos no startup e só depois
+    atualizar a partir dos microsserviços.
+    '''
+
+    VERSAO = 1
+    FONTES = ('discentes', 'disciplinas', 'livros')
+
+    @classmethod
+    def caminho(cls) -> Path:
+        configurado = getattr(settings, 'SNAPSHOT_PATH', None)
+        if configurado:
+            return Path(configurado)
+        db_path = Path(settings.DATABASES['default']['NAME'])
+        return db_path.parent / 'snapshot.json.gz'
+
+    @classmethod
+    def salvar(cls, dados: ExternalData, caminho: Path | None = None) -> Path:
+        '''Grava o payload de forma atômica (arquivo temporário + rename).'''
+        caminho = caminho or cls.caminho()
+        conteudo: Dict[str, Any] = {
+            'versao': cls.VERSAO,
+            'criado_em': timezone.now().isoformat(),
+        }
+        for fonte in cls.FONTES:
+            conteudo[fonte] = getattr(dados, fonte)
+
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        temporario = caminho.with_name(caminho.name + '.tmp')
+        with gzip.open(temporario, 'wt', encoding='utf-8', compresslevel=6) as arquivo:
+            json.dump(conteudo, arquivo, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temporario, caminho)
+
+        logger.info(f"Snapshot gravado em {caminho}")
+        return caminho
+
+    @classmethod
+    def carregar(cls, caminho: Path | None = None) -> Snapshot | None:
+        '''Lê o snapshot; retorna None se não existir, for inválido ou de outra versão.'''
+        caminho = caminho or cls.caminho()
+        if not caminho.exists():
+            return None
+
+        try:
+            with gzip.open(caminho, 'rt', encoding='utf-8') as arquivo:
+                conteudo = json.load(arquivo)
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Snapshot ilegível em {caminho}: {exc}")
+            return None
+
+        if conteudo.get('versao') != cls.VERSAO:
+            logger.warning(
+                f"Snapshot com versão {conteudo.get('versao')} ignorado (esperada {cls.VERSAO})"
+            )
+            return None
+
+        dados = ExternalData(
+            discentes=conteudo.get('discentes', []),
+            disciplinas=conteudo.get('disciplinas', []),
+            livros=conteudo.get('livros', []),
+            sucesso=True,
+            erros=[],
+        )
+        return Snapshot(
+            versao=conteudo['versao'],
+            criado_em=datetime.fromisoformat(conteudo['criado_em']),
+            dados=dados,
+        )
+
+    @classmethod
+    def inspecionar(cls, caminho: Path | None = None) -> Dict[str, Any] | None:
+        '''Metadados do snapshot (versão, frescor, tamanho e contagens).'''
+        caminho = caminho or cls.caminho()
+        snapshot = cls.carregar(caminho)
+        if snapshot is None:
+            return None
+
+        return {
+            'caminho': str(caminho),
+            'versao': snapshot.versao,
+            'criado_em': snapshot.criado_em.isoformat(),
+            'idade_segundos': round(snapshot.idade_segundos, 1),
+            'tamanho_bytes': caminho.stat().st_size,
+            **{fonte: len(getattr(snapshot.dados, fonte)) for fonte in cls.FONTES},
+        }
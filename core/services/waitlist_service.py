@@ -0,0 +1,180 @@
+"""Service da lista de espera das disciplinas."""
+
+from typing import List, Tuple
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from core.models.academic import Discente, Disciplina
+from core.models.enrollment import EsperaDisciplina, MatriculaDisciplina
+
+
+class WaitlistService:
+    """Lista de espera FIFO por disciplina e período.
+
+    A promoção (vaga liberada -> cabeça da fila) acontece em
+    `EnrollmentServiceV2.remover_disciplina`, na mesma transação da remoção.
+    Aqui ficam a entrada, a saída e a consulta de posição.
+
+    Princípios GRASP:
+    - Controller: Coordena operações da lista de espera
+    - Information Expert: Conhece a numeração das senhas
+    """
+
+    @classmethod
+    @transaction.atomic
+    def entrar(
+        cls,
+        discente: Discente,
+        disciplina: Disciplina,
+        periodo: str = "2024.2"
+    ) -> Tuple[bool, str]:
+        """Coloca o discente no fim da lista de espera da disciplina.
+
+        Só faz sentido para disciplina sem vagas: com vaga, a matrícula
+        é direta.
+
+        Returns:
+            (sucesso, mensagem)
+        """
+        if discente.status_academico.strip().lower() == "trancado":
+            return False, "Discente com situação acadêmica trancada."
+
+        if disciplina.curso.strip().lower() != discente.curso.strip().lower():
+            return False, "Disciplina não pertence ao curso do discente."
+
+        if cls._travar(disciplina) > 0:
+            return False, "Disciplina possui vagas; faça a matrícula diretamente."
+
+        matriculado = MatriculaDisciplina.objects.filter(
+            matricula__discente=discente,
+            matricula__periodo=periodo,
+            matricula__ativa=True,
+            disciplina=disciplina,
+            ativa=True
+        ).exists()
+        if matriculado:
+            return False, "Disciplina já está na matrícula."
+
+        ultima = cls._fila(disciplina, periodo).order_by('-senha').values_list(
+            'senha', flat=True
+        ).first()
+        try:
+            with transaction.atomic():
+                entrada = EsperaDisciplina.objects.create(
+                    discente=discente,
+                    disciplina=disciplina,
+                    periodo=periodo,
+                    senha=(ultima or 0) + 1
+                )
+        except IntegrityError:
+            return False, "Discente já está na lista de espera desta disciplina."
+
+        posicao = cls.posicao(discente, disciplina, periodo)
+        return True, f"Lista de espera de '{disciplina.nome}': senha {entrada.senha}, posição {posicao}."
+
+    @classmethod
+    @transaction.atomic
+    def sair(
+        cls,
+        discente: Discente,
+        disciplina: Disciplina,
+        periodo: str = "2024.2"
+    ) -> Tuple[bool, str]:
+        """Tira o discente da lista de espera.
+
+        Quem estava atrás sobe uma senha (um UPDATE sobre o resto da fila),
+        o que mantém as senhas contíguas para `posicao`.
+
+        Returns:
+            (sucesso, mensagem)
+        """
+        cls._travar(disciplina)
+
+        entrada = cls._fila(disciplina, periodo).filter(discente=discente).first()
+        if entrada is None:
+            return False, "Discente não está na lista de espera desta disciplina."
+
+        EsperaDisciplina.objects.filter(pk=entrada.pk).update(ativa=False)
+        cls._fila(disciplina, periodo).filter(senha__gt=entrada.senha).update(
+            senha=F('senha') - 1
+        )
+        return True, f"Saída da lista de espera de '{disciplina.nome}' registrada."
+
+    @classmethod
+    def posicao(
+        cls,
+        discente: Discente,
+        disciplina: Disciplina,
+        periodo: str = "2024.2"
+    ) -> int | None:
+        """Posição do discente na fila (1 = próximo a ser promovido) ou None.
+
+        Uma consulta: a senha do discente (índice único parcial) menos a
+        senha da cabeça (primeira entrada do índice da fila).
+        """
+        cabeca = cls._fila(disciplina, periodo).order_by('senha').values('senha')[:1]
+        return cls._fila(disciplina, periodo).filter(discente=discente).annotate(
+            posicao=F('senha') - Subquery(cabeca) + 1
+        ).values_list('posicao', flat=True).first()
+
+    @classmethod
+    def tamanho(cls, disciplina: Disciplina, periodo: str = "2024.2") -> int:
+        """Quantos aguardam: diferença entre a última e a primeira senha."""
+        senhas = cls._fila(disciplina, periodo).order_by('senha').values_list('senha', flat=True)
+        primeira = senhas.first()
+        return 0 if primeira is None else senhas.last() - primeira + 1
+
+    @classmethod
+    def listar_esperas(cls, discente: Discente, periodo: str = "2024.2") -> List[EsperaDisciplina]:
+        """Listas em que o discente aguarda, cada entrada com `posicao` anotada.
+
+        Mesma conta de `posicao`, com a cabeça de cada fila numa subconsulta
+        correlacionada: uma consulta para todas as listas.
+        """
+        cabeca = EsperaDisciplina.objects.filter(
+            disciplina=OuterRef('disciplina'),
+            periodo=periodo,
+            ativa=True
+        ).order_by('senha').values('senha')[:1]
+        return list(
+            EsperaDisciplina.objects.filter(discente=discente, periodo=periodo, ativa=True)
+            .select_related('disciplina')
+            .annotate(posicao=F('senha') - Subquery(cabeca) + 1)
+            .order_by('disciplina__nome')
+        )
+
+    @staticmethod
+    def compactar(disciplina_id: int, periodo: str) -> int:
+        """Renumera a fila a partir da cabeça, fechando buracos nas senhas.
+
+        Para exclusões em cascata (ex.: do discente), que apagam entradas
+        ativas sem passar por `sair`. Um único UPDATE; cada entrada recebe a
+        senha da cabeça mais o número de entradas à sua frente. Atualizada
+        em ordem crescente de senha, nenhuma colide com a seguinte.
+        """
+        fila = EsperaDisciplina.objects.filter(disciplina_id=disciplina_id, periodo=periodo, ativa=True)
+        cabeca = fila.order_by('senha').values('senha')[:1]
+        a_frente = fila.filter(senha__lt=OuterRef('senha')).order_by().values('disciplina').annotate(
+            total=Count('pk')
+        ).values('total')
+        return fila.update(senha=Subquery(cabeca) + Coalesce(Subquery(a_frente), Value(0)))
+
+    @staticmethod
+    def _travar(disciplina: Disciplina) -> int:
+        """Trava a linha da disciplina e devolve as vagas atuais.
+
+        Entradas, saídas e promoções da mesma fila ficam em série, o que
+        mantém as senhas contíguas.
+        """
+        return Disciplina.objects.select_for_update().values_list('vagas', flat=True).get(
+            pk=disciplina.pk
+        )
+
+    @staticmethod
+    def _fila(disciplina: Disciplina, periodo: str):
+        return EsperaDisciplina.objects.filter(
+            disciplina=disciplina,
+            periodo=periodo,
+            ativa=True
+        )
@@ -0,0 +1,105 @@
+"""Estado de prontidão e aquecimento do cache local em background."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Tuple
+
+from django.db import connection
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupService:
+    """Executa a sincronização de startup e expõe o estado de prontidão.
+
+    Estados:
+    - warming: sincronização em andamento (views servem os dados locais)
+    - ready: última sincronização concluída com sucesso
+    - degraded: última sincronização falhou; views seguem com o cache local
+    """
+
+    WARMING = "warming"
+    READY = "ready"
+    DEGRADED = "degraded"
+
+    _lock = threading.Lock()
+    _estado = READY
+    _mensagem = ""
+    _iniciado_em: datetime | None = None
+    _concluido_em: datetime | None = None
+    _thread: threading.Thread | None = None
+
+    @classmethod
+    def executar(cls, sincronizar: Callable[[], Tuple[bool, str]]) -> Tuple[bool, str]:
+        """Executa `sincronizar` no thread atual, atualizando o estado."""
+        with cls._lock:
+            cls._estado = cls.WARMING
+            cls._mensagem = "Sincronização em andamento."
+            cls._iniciado_em = timezone.now()
+            cls._concluido_em = None
+
+        try:
+            sucesso, msg = sincronizar()
+        except Exception as exc:
+            logger.exception("Erro na sincronização de startup")
+            sucesso, msg = False, f"Erro inesperado: {exc}"
+
+        with cls._lock:
+            cls._estado = cls.READY if sucesso else cls.DEGRADED
+            cls._mensagem = msg
+            cls._concluido_em = timezone.now()
+
+        return sucesso, msg
+
+    @classmethod
+    def iniciar_em_background(
+        cls,
+        sincronizar: Callable[[], Tuple[bool, str]],
+        ao_concluir: Callable[[bool, str], None] | None = None,
+    ) -> threading.Thread:
+        """Dispara `sincronizar` em um thread daemon e retorna imediatamente."""
+
+        def alvo() -> None:
+            try:
+                sucesso, msg = cls.executar(sincronizar)
+                if ao_concluir:
+                    ao_concluir(sucesso, msg)
+            finally:
+                # Conexões de banco são por thread; fecha a deste worker.
+                connection.close()
+
+        with cls._lock:
+            cls._estado = cls.WARMING
+            cls._mensagem = "Sincronização em andamento."
+            cls._thread = threading.Thread(target=alvo, name="pas-warmup", daemon=True)
+            thread = cls._thread
+
+        thread.start()
+        return thread
+
+    @classmethod
+    def estado(cls) -> str:
+        return cls._estado
+
+    @classmethod
+    def concluido_em(cls) -> datetime | None:
+        return cls._concluido_em
+
+    @classmethod
+    def aquecendo(cls) -> bool:
+        return cls._estado == cls.WARMING
+
+    @classmethod
+    def resumo(cls) -> Dict[str, object]:
+        """Estado atual em formato serializável (usado no endpoint de saúde)."""
+        with cls._lock:
+            return {
+                "estado": cls._estado,
+                "mensagem": cls._mensagem,
+                "iniciado_em": cls._iniciado_em.isoformat() if cls._iniciado_em else None,
+                "concluido_em": cls._concluido_em.isoformat() if cls._concluido_em else None,
+            }
@@ -0,0 +1,23 @@
+'''Receivers de sinais do app `core`.'''
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import EsperaDisciplina, EsperaLivro
+from .services.reservation_service_v2 import ReservationServiceV2
+from .services.waitlist_service import WaitlistService
+
+
+@receiver(post_delete, sender=EsperaDisciplina)
+def compactar_lista_espera(sender, instance: EsperaDisciplina, **kwargs) -> None:
+    '''Fecha o buraco que uma entrada ativa apagada (ex.: em cascata na
+    exclusão do discente) deixaria nas senhas da fila.'''
+    if instance.ativa:
+        WaitlistService.compactar(instance.disciplina_id, instance.periodo)
+
+
+@receiver(post_delete, sender=EsperaLivro)
+def compactar_fila_reserva(sender, instance: EsperaLivro, **kwargs) -> None:
+    '''Idem para a fila de reserva de um livro.'''
+    if instance.ativa:
+        ReservationServiceV2.compactar_fila(instance.livro_id)
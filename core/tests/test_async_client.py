@@ -0,0 +1,171 @@
+"""Testes do cliente HTTP assíncrono e das versões async dos gateways."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from core.gateways import aluno_gateway
+from core.gateways.async_client import AsyncHttpClient
+from core.gateways.base_client import limpar_validadores
+from core.gateways.circuit_breaker import resetar_breakers
+from core.gateways.unified_gateway import UnifiedGateway
+
+
+class AsyncHttpClientTestCase(SimpleTestCase):
+    """Testes do AsyncHttpClient.
+
+    IMPORTANTE: Usa httpx.MockTransport para não fazer requisições reais às APIs.
+    """
+
+    def setUp(self):
+        limpar_validadores()
+        resetar_breakers()
+        aluno_gateway.cache_discentes.limpar()
+
+    def tearDown(self):
+        limpar_validadores()
+        resetar_breakers()
+        aluno_gateway.cache_discentes.limpar()
+
+    def _executar(self, handler, coro_factory):
+        """Roda a corrotina com um pool httpx servido por `handler`."""
+        async def alvo():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as cliente:
+                with patch("core.gateways.async_client.obter_cliente_async", return_value=cliente):
+                    return await coro_factory()
+
+        return asyncio.run(alvo())
+
+    def test_aget_retorna_json(self):
+        # Arrange
+        client = AsyncHttpClient("https://exemplo.test/msAluno")
+
+        def handler(request):
+            return httpx.Response(200, json={"id": 1, "url": str(request.url)})
+
+        # Act
+        result = self._executar(handler, lambda: client.aget("1"))
+
+        # Assert
+        self.assertTrue(result.ok)
+        self.assertEqual(result.data["url"], "https://exemplo.test/msAluno/1")
+
+    def test_aget_retenta_e_revalida_com_304(self):
+        """Retentativas e validadores condicionais seguem a política do cliente síncrono."""
+        # Arrange
+        client = AsyncHttpClient("https://exemplo.test/biblioteca", max_retentativas=2)
+        client._adormir = AsyncMock()
+        respostas = [
+            httpx.Response(503),
+            httpx.Response(200, json=[{"id": 1}], headers={"ETag": '"v1"'}),
+            httpx.Response(304),
+        ]
+        recebidos = []
+
+        def handler(request):
+            recebidos.append(request)
+            return respostas.pop(0)
+
+        async def duas_chamadas():
+            return await client.aget(), await client.aget()
+
+        # Act
+        r1, r2 = self._executar(handler, duas_chamadas)
+
+        # Assert
+        self.assertEqual(r1.retentativas, 1)
+        client._adormir.assert_awaited_once()
+        self.assertTrue(r2.revalidado)
+        self.assertEqual(r2.data, [{"id": 1}])
+        self.assertEqual(recebidos[2].headers["If-None-Match"], '"v1"')
+
+    def test_falha_de_conexao(self):
+        # Arrange
+        client = AsyncHttpClient("https://exemplo.test/msAluno", max_retentativas=0)
+
+        def handler(request):
+            raise httpx.ConnectError("recusada")
+
+        # Act
+        result = self._executar(handler, lambda: client.aget("1"))
+
+        # Assert
+        self.assertFalse(result.ok)
+        self.assertIsNone(result.status_code)
+        self.assertIn("Falha de rede", result.error)
+
+    def test_timeout_de_leitura_registra_falha_no_breaker(self):
+        # Arrange
+        client = AsyncHttpClient("https://exemplo.test/msAluno", max_retentativas=2)
+
+        def handler(request):
+            raise httpx.ReadTimeout("lento")
+
+        # Act
+        result = self._executar(handler, lambda: client.aget("1"))
+
+        # Assert
+        self.assertEqual(result.retentativas, 0)
+        self.assertEqual(client.breaker.resumo()["taxa_falha"], 1.0)
+
+    def test_cancelamento_registra_falha_no_breaker(self):
+        """Um aget cancelado por wait_for não deixa a tentativa sem registro."""
+        # Arrange
+        client = AsyncHttpClient("https://exemplo.test/msAluno", max_retentativas=0)
+
+        async def nunca_responde(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        # Act
+        with patch.object(client, "_atentar", side_effect=nunca_responde), \
+                self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(asyncio.wait_for(client.aget("1"), timeout=0.01))
+
+        # Assert
+        self.assertEqual(client.breaker.resumo()["taxa_falha"], 1.0)
+
+    def test_buscar_discente_async_usa_cache(self):
+        """A segunda busca do mesmo discente não vai à rede."""
+        # Arrange
+        chamadas = []
+
+        def handler(request):
+            chamadas.append(request)
+            return httpx.Response(200, json={"id": 7, "nome": "Ana"})
+
+        async def duas_buscas():
+            await aluno_gateway.buscar_discente_por_id_async(7)
+            return await aluno_gateway.buscar_discente_por_id_async(7)
+
+        # Act
+        result = self._executar(handler, duas_buscas)
+
+        # Assert
+        self.assertTrue(result.do_cache)
+        self.assertEqual(len(chamadas), 1)
+
+    def test_consumir_todos_dados_async(self):
+        """Fontes com erro entram em fontes_com_erro, como na versão síncrona."""
+        # Arrange
+        def handler(request):
+            if "biblioteca" in str(request.url):
+                return httpx.Response(500)
+            return httpx.Response(200, json=[{"id": 1}])
+
+        # Act
+        upstreams = {
+            fonte: {**conf, "RETENTATIVAS": 0}
+            for fonte, conf in settings.GATEWAY_UPSTREAMS.items()
+        }
+        with override_settings(GATEWAY_UPSTREAMS=upstreams):
+            dados = self._executar(handler, UnifiedGateway.consumir_todos_dados_async)
+
+        # Assert
+        self.assertTrue(dados.sucesso)
+        self.assertEqual(len(dados.discentes), 1)
+        self.assertEqual(len(dados.disciplinas), 1)
+        self.assertEqual(dados.fontes_com_erro, ["livros"])
+        self.assertEqual(set(dados.tempos), {"discentes", "disciplinas", "livros"})
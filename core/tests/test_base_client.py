@@ -0,0 +1,422 @@
+"""Testes do cliente HTTP base dos gateways."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import requests
+from django.test import SimpleTestCase
+
+from core.gateways.base_client import (
+    BaseHttpClient,
+    fechar_sessoes,
+    limpar_validadores,
+    obter_sessao,
+)
+from core.gateways.circuit_breaker import CircuitBreaker, resetar_breakers
+from core.gateways.hedging import Hedger, obter_hedger, resetar_hedgers
+
+
+class BaseHttpClientTestCase(SimpleTestCase):
+    """Testes do BaseHttpClient.
+
+    IMPORTANTE: Usa mock da sessão para não fazer requisições reais às APIs.
+    """
+
+    def setUp(self):
+        fechar_sessoes()
+        limpar_validadores()
+        resetar_breakers()
+
+    def tearDown(self):
+        fechar_sessoes()
+        limpar_validadores()
+        resetar_breakers()
+
+    def _resposta(self, status=200, data=None, headers=None):
+        resp = MagicMock()
+        resp.status_code = status
+        resp.ok = 200 <= status < 400
+        resp.json.return_value = data
+        resp.headers = headers or {}
+        return resp
+
+    def test_clientes_mesma_url_compartilham_sessao(self):
+        """Clientes da mesma URL base devem reaproveitar o mesmo pool."""
+        # Arrange
+        c1 = BaseHttpClient("https://exemplo.test/msAluno/")
+        c2 = BaseHttpClient("https://exemplo.test/msAluno")
+        c3 = BaseHttpClient("https://exemplo.test/outro")
+
+        # Assert
+        self.assertIs(c1.session, c2.session)
+        self.assertIsNot(c1.session, c3.session)
+
+    def test_get_usa_sessao_compartilhada(self):
+        """O GET deve passar pela sessão keep-alive e não por requests.get."""
+        # Arrange
+        client = BaseHttpClient("https://exemplo.test/msAluno")
+        sessao = obter_sessao(client.base_url)
+
+        with patch.object(sessao, "get", return_value=self._resposta(data={"id": 1})) as mock_get, \
+                patch("requests.get") as mock_requests_get:
+            # Act
+            result = client.get("1")
+
+        # Assert
+        self.assertTrue(result.ok)
+        self.assertEqual(result.data, {"id": 1})
+        mock_get.assert_called_once()
+        self.assertEqual(mock_get.call_args.args[0], "https://exemplo.test/msAluno/1")
+        mock_requests_get.assert_not_called()
+
+    def test_falha_de_rede(self):
+        """Erros de rede devem virar HttpResult com ok=False."""
+        # Arrange
+        client = BaseHttpClient("https://exemplo.test/msAluno", max_retentativas=0)
+
+        with patch.object(client.session, "get", side_effect=requests.ConnectionError("recusada")):
+            # Act
+            result = client.get("1")
+
+        # Assert
+        self.assertFalse(result.ok)
+        self.assertIsNone(result.status_code)
+        self.assertIn("Falha de rede", result.error)
+
+    def test_get_condicional_revalida_com_304(self):
+        """Após um 200 com ETag, um 304 devolve o payload guardado."""
+        # Arrange
+        client = BaseHttpClient("https://exemplo.test/biblioteca")
+        primeira = self._resposta(
+            data=[{"id": 1}],
+            headers={"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"},
+        )
+        segunda = self._resposta(status=304)
+
+        with patch.object(client.session, "get", side_effect=[primeira, segunda]) as mock_get:
+            # Act
+            r1 = client.get()
+            r2 = client.get()
+
+        # Assert
+        self.assertFalse(r1.revalidado)
+        self.assertTrue(r2.ok)
+        self.assertTrue(r2.revalidado)
+        self.assertEqual(r2.data, [{"id": 1}])
+        segunda.json.assert_not_called()
+        headers = mock_get.call_args_list[1].kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertEqual(headers["If-Modified-Since"], "Wed, 01 Jan 2025 00:00:00 GMT")
+
+    def test_get_sem_validadores_nao_envia_cabecalhos_condicionais(self):
+        """Sem ETag/Last-Modified na resposta, nada é guardado."""
+        # Arrange
+        client = BaseHttpClient("https://exemplo.test/biblioteca")
+
+        with patch.object(client.session, "get", return_value=self._resposta(data=[])) as mock_get:
+            # Act
+            client.get()
+            client.get()
+
+        # Assert
+        self.assertEqual(mock_get.call_args_list[1].kwargs["headers"], {})
+
+    def test_retenta_5xx_e_falha_de_conexao(self):
+        """Falhas de conexão e 5xx são repetidas até dar certo."""
+        # Arrange
+        client = BaseHttpClient("https://exemplo.test/msAluno", max_retentativas=3)
+        client._dormir = MagicMock()
+        respostas = [
+            requests.ConnectionError("reset"),
+            self._resposta(status=503),
+            self._resposta(data={"id": 1}),
+        ]
+
+        with patch.object(client.session, "get", side_effect=respostas):
+            # Act
+            result = client.get("1")
+
+        # Assert
+        self.assertTrue(result.ok)
+        self.assertEqual(result.retentativas, 2)
+        self.assertEqual(client._dormir.call_count, 2)
+
+    def test_nao_retenta_4xx(self):
+        """Erros do cliente (exceto 429) não são repetidos."""
+        # Arrange
+        client = BaseHttpClient("https://exemplo.test/msAluno", max_retentativas=3)
+        client._dormir = MagicMock()
+
+        with patch.object(client.session, "get", return_value=self._resposta(status=404)) as mock_get:
+            # Act
+            result = client.get("1")
+
+        # Assert
+        self.assertFalse(result.ok)
+        self.assertEqual(result.retentativas, 0)
+        mock_get.assert_called_once()
+
+    def test_respeita_retry_after_e_prazo(self):
+        """429 com Retry-After maior que o prazo restante encerra as tentativas."""
+        # Arrange
+        client = BaseHttpClient("https://exemplo.test/msAluno", max_retentativas=3)
+        client._dormir = MagicMock()
+        curto = self._resposta(status=429, headers={"Retry-After": "0.5"})
+        longo = self._resposta(status=429, headers={"Retry-After": "30"})
+
+        with patch.object(client.session, "get", side_effect=[curto, longo]) as mock_get:
+            # Act
+            result = client.get("1", prazo=5)
+
+        # Assert
+        self.assertEqual(result.status_code, 429)
+        self.assertEqual(result.retentativas, 1)
+        client._dormir.assert_called_once_with(0.5)
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertLessEqual(mock_get.call_args.kwargs["timeout"], 5)
+
+    def test_circuito_aberto_falha_rapido(self):
+        """Com o circuito aberto, o GET falha sem ir à rede."""
+        # Arrange
+        client = BaseHttpClient("https://exemplo.test/msAluno", max_retentativas=0)
+
+        with patch.object(client.session, "get", side_effect=requests.ConnectionError("fora")) as mock_get:
+            for _ in range(5):
+                client.get("1")
+            # Act
+            result = client.get("1")
+
+        # Assert
+        self.assertEqual(mock_get.call_count, 5)
+        self.assertTrue(result.circuito_aberto)
+        self.assertIn("Circuito aberto", result.error)
+        self.assertEqual(client.breaker.estado, CircuitBreaker.ABERTO)
+
+    def test_timeout_de_leitura_conta_como_falha(self):
+        """Upstream travado: ReadTimeout não é repetido, mas abre o circuito."""
+        # Arrange
+        client = BaseHttpClient("https://exemplo.test/msAluno", max_retentativas=2)
+
+        with patch.object(client.session, "get", side_effect=requests.ReadTimeout("lento")) as mock_get:
+            # Act
+            resultados = [client.get("1") for _ in range(6)]
+
+        # Assert
+        self.assertEqual(mock_get.call_count, 5)
+        self.assertEqual(resultados[0].retentativas, 0)
+        self.assertTrue(resultados[-1].circuito_aberto)
+        self.assertEqual(client.breaker.estado, CircuitBreaker.ABERTO)
+
+    def test_excecao_inesperada_registra_falha(self):
+        """Uma exceção fora das tratadas não deixa o teste meio-aberto preso."""
+        # Arrange
+        client = BaseHttpClient("https://exemplo.test/msAluno", max_retentativas=0)
+
+        # Act
+        with patch.object(client, "_requisitar", side_effect=RuntimeError("inesperado")), \
+                self.assertRaises(RuntimeError):
+            client.get("1")
+
+        # Assert
+        self.assertEqual(client.breaker.resumo()["taxa_falha"], 1.0)
+
+    def test_iterar_array_registra_timeout_de_leitura(self):
+        # Arrange
+        client = BaseHttpClient("https://exemplo.test/biblioteca")
+
+        # Act
+        with patch.object(client.session, "get", side_effect=requests.ReadTimeout("lento")), \
+                self.assertRaises(requests.ReadTimeout):
+            list(client.iterar_array())
+
+        # Assert
+        self.assertEqual(client.breaker.resumo()["taxa_falha"], 1.0)
+
+    def test_iterar_array_registra_erro_no_meio_do_stream(self):
+        # Arrange
+        client = BaseHttpClient("https://exemplo.test/biblioteca")
+        resp = self._resposta(200)
+
+        def pedacos(chunk_size):
+            yield b'[{"id": 1}, '
+            raise requests.exceptions.ChunkedEncodingError("conexão caiu")
+
+        resp.iter_content.side_effect = pedacos
+        resp.__enter__.return_value = resp
+
+        # Act
+        with patch.object(client.session, "get", return_value=resp), \
+                self.assertRaises(requests.exceptions.ChunkedEncodingError):
+            list(client.iterar_array())
+
+        # Assert: um único desfecho, a falha do stream
+        resumo = client.breaker.resumo()
+        self.assertEqual((resumo["chamadas_na_janela"], resumo["taxa_falha"]), (1, 1.0))
+
+    def test_iterar_array_registra_um_sucesso_por_stream(self):
+        # Arrange
+        client = BaseHttpClient("https://exemplo.test/biblioteca")
+        resp = self._resposta(200)
+        resp.iter_content.return_value = [b'[{"id": 1}, {"id": 2}]']
+        resp.__enter__.return_value = resp
+
+        # Act
+        with patch.object(client.session, "get", return_value=resp):
+            lotes = list(client.iterar_array(tamanho_lote=1))
+
+        # Assert
+        self.assertEqual(lotes, [[{"id": 1}], [{"id": 2}]])
+        resumo = client.breaker.resumo()
+        self.assertEqual((resumo["chamadas_na_janela"], resumo["taxa_falha"]), (1, 0.0))
+
+
+class CircuitBreakerTestCase(SimpleTestCase):
+    """Transições de estado do circuit breaker."""
+
+    def setUp(self):
+        self.agora = 0.0
+        self.breaker = CircuitBreaker(
+            "svc", janela=4, min_chamadas=4, taxa_falha=0.5, cooldown=10,
+            relogio=lambda: self.agora,
+        )
+
+    def test_abre_pela_taxa_de_falha_e_fecha_apos_teste(self):
+        for sucesso in (True, False, True, False):
+            self.breaker.permitir()
+            self.breaker.registrar_sucesso() if sucesso else self.breaker.registrar_falha()
+
+        self.assertEqual(self.breaker.estado, CircuitBreaker.ABERTO)
+        self.assertFalse(self.breaker.permitir())
+
+        self.agora = 10
+        self.assertEqual(self.breaker.estado, CircuitBreaker.MEIO_ABERTO)
+        self.assertTrue(self.breaker.permitir())
+        self.assertFalse(self.breaker.permitir())  # só uma chamada de teste
+        self.breaker.registrar_sucesso()
+
+        self.assertEqual(self.breaker.estado, CircuitBreaker.FECHADO)
+
+    def test_sucesso_atrasado_nao_fecha_circuito_aberto(self):
+        """Respostas de chamadas anteriores à abertura não reabrem o tráfego."""
+        for _ in range(4):
+            self.breaker.registrar_falha()
+
+        self.breaker.registrar_sucesso()
+
+        self.assertEqual(self.breaker.estado, CircuitBreaker.ABERTO)
+        self.assertFalse(self.breaker.permitir())
+
+    def test_falha_no_teste_reabre(self):
+        for _ in range(4):
+            self.breaker.registrar_falha()
+        self.agora = 10
+        self.breaker.permitir()
+        self.breaker.registrar_falha()
+
+        self.assertEqual(self.breaker.estado, CircuitBreaker.ABERTO)
+        self.assertEqual(self.breaker.resumo()["aberturas"], 2)
+
+    def test_teste_abandonado_expira_e_reabre(self):
+        """Sem registro do resultado, a vaga de teste vence após um cooldown."""
+        for _ in range(4):
+            self.breaker.registrar_falha()
+        self.agora = 10
+        self.assertTrue(self.breaker.permitir())
+
+        self.agora = 19
+        self.assertFalse(self.breaker.permitir())
+        self.agora = 20
+        self.assertEqual(self.breaker.estado, CircuitBreaker.ABERTO)
+        self.assertEqual(self.breaker.resumo()["aberturas"], 2)
+
+        self.agora = 30
+        self.assertTrue(self.breaker.permitir())
+
+    def test_falha_em_excecao_libera_a_vaga_de_teste(self):
+        for _ in range(4):
+            self.breaker.registrar_falha()
+        self.agora = 10
+        self.breaker.permitir()
+
+        with self.assertRaises(KeyboardInterrupt), self.breaker.falha_em_excecao():
+            raise KeyboardInterrupt
+
+        self.assertEqual(self.breaker.estado, CircuitBreaker.ABERTO)
+        self.agora = 20
+        self.assertTrue(self.breaker.permitir())
+
+
+class HedgingTestCase(SimpleTestCase):
+    """GETs com hedge: cópia da requisição quando a original demora."""
+
+    def setUp(self):
+        fechar_sessoes()
+        limpar_validadores()
+        resetar_breakers()
+        resetar_hedgers()
+
+    def tearDown(self):
+        fechar_sessoes()
+        resetar_hedgers()
+
+    def _resposta(self, data):
+        resp = MagicMock(status_code=200, headers={})
+        resp.json.return_value = data
+        return resp
+
+    def test_hedge_vence_quando_a_original_demora_e_falha(self):
+        # Arrange
+        client = BaseHttpClient("https://exemplo.test/msAluno", hedge=True, max_retentativas=0)
+        hedger = obter_hedger(client.base_url)
+        hedger.carga_max = 1.0
+        hedge_disparado = threading.Event()
+        threads = []
+
+        def get(url, **kwargs):
+            threads.append(threading.current_thread())
+            if len(threads) == 1:
+                hedge_disparado.wait(2)  # a original fica presa até a cópia sair
+                raise requests.ReadTimeout("lento")
+            hedge_disparado.set()
+            return self._resposta({"origem": "hedge"})
+
+        with patch.object(client.session, "get", side_effect=get):
+            # Act
+            result = client.get("1")
+
+        # Assert
+        self.assertEqual(result.data, {"origem": "hedge"})
+        self.assertIs(threads[0], threading.current_thread())  # original sem pool
+        self.assertIsNot(threads[1], threading.current_thread())
+        self.assertEqual(hedger.resumo()["hedges_venceram"], 1)
+
+    def test_resposta_rapida_nao_dispara_hedge(self):
+        # Arrange
+        client = BaseHttpClient("https://exemplo.test/msAluno", hedge=True)
+
+        with patch.object(client.session, "get", return_value=self._resposta({"id": 1})) as mock_get:
+            # Act
+            client.get("1")
+
+        # Assert
+        mock_get.assert_called_once()
+        self.assertEqual(obter_hedger(client.base_url).resumo()["hedges"], 0)
+
+    def test_orcamento_limita_carga_extra(self):
+        """Com carga_max 0.5, no máximo metade das requisições gera hedge."""
+        hedger = Hedger("svc", carga_max=0.5)
+
+        autorizados = 0
+        for _ in range(10):
+            hedger.registrar_requisicao()
+            autorizados += hedger.autorizar_hedge()
+
+        self.assertEqual(autorizados, 5)
+        self.assertEqual(hedger.resumo()["sem_orcamento"], 5)
+
+    def test_atraso_segue_o_percentil(self):
+        hedger = Hedger("svc", percentil=90, atraso_min=0.01, min_amostras=10)
+        for ms in range(1, 11):
+            hedger.registrar_latencia(ms / 100)
+
+        self.assertAlmostEqual(hedger.atraso(), 0.09)
@@ -0,0 +1,104 @@
+"""Testes do cache de consultas de discente."""
+
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase
+
+from core.gateways import aluno_gateway
+from core.gateways.base_client import HttpResult
+from core.gateways.cache import TTLCache
+from core.models import Discente
+from core.services.lookup_service import LookupService
+
+
+class RelogioFalso:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+class TTLCacheTestCase(SimpleTestCase):
+    """Testes do TTLCache (TTL, LRU, stale e negativo)."""
+
+    def setUp(self):
+        self.relogio = RelogioFalso()
+        self.cache = TTLCache(max_itens=2, ttl=10, ttl_negativo=2, stale=5, relogio=self.relogio)
+
+    def test_expira_e_serve_obsoleto_na_janela_stale(self):
+        self.cache.guardar(1, "a")
+
+        self.assertEqual(self.cache.obter(1), (TTLCache.FRESCO, "a"))
+        self.relogio.agora = 12
+        self.assertEqual(self.cache.obter(1), (TTLCache.OBSOLETO, "a"))
+        self.relogio.agora = 16
+        self.assertEqual(self.cache.obter(1), (None, None))
+
+    def test_descarta_menos_usado(self):
+        self.cache.guardar(1, "a")
+        self.cache.guardar(2, "b")
+        self.cache.obter(1)
+        self.cache.guardar(3, "c")
+
+        self.assertEqual(self.cache.obter(2), (None, None))
+        self.assertEqual(self.cache.obter(1), (TTLCache.FRESCO, "a"))
+        self.assertEqual(self.cache.estatisticas()["evictions"], 1)
+
+    def test_cache_negativo_expira_rapido(self):
+        self.cache.guardar_negativo(9)
+
+        self.assertEqual(self.cache.obter(9)[0], TTLCache.NEGATIVO)
+        self.relogio.agora = 3
+        self.assertEqual(self.cache.obter(9), (None, None))
+
+
+class SincronizarDiscenteCacheTestCase(TestCase):
+    """Consultas repetidas não devem ir ao upstream nem regravar o banco."""
+
+    def setUp(self):
+        aluno_gateway.cache_discentes.limpar()
+
+    def tearDown(self):
+        aluno_gateway.cache_discentes.limpar()
+
+    @patch('core.gateways.aluno_gateway.client.get')
+    def test_segunda_consulta_vem_do_cache(self, mock_get):
+        # Arrange
+        mock_get.return_value = HttpResult(
+            ok=True,
+            data={'id': 1, 'nome': 'João', 'curso': 'CC', 'modalidade': 'EAD', 'status': 'Ativo'},
+            status_code=200,
+            error=None,
+            elapsed=0.1,
+        )
+
+        # Act
+        ok1, _, _ = LookupService.sincronizar_discente(1)
+        with self.assertNumQueries(1):
+            ok2, msg, discente = LookupService.sincronizar_discente(1)
+
+        # Assert
+        self.assertTrue(ok1 and ok2)
+        self.assertIn("cache", msg)
+        self.assertEqual(discente.nome, 'João')
+        mock_get.assert_called_once()
+        self.assertEqual(aluno_gateway.cache_discentes.estatisticas()["hits"], 1)
+
+    @patch('core.gateways.aluno_gateway.client.get')
+    def test_404_fica_em_cache_negativo(self, mock_get):
+        # Arrange
+        mock_get.return_value = HttpResult(
+            ok=False, data=None, status_code=404, error="Erro HTTP 404", elapsed=0.1
+        )
+
+        # Act
+        aluno_gateway.buscar_discente_por_id(99)
+        result = aluno_gateway.buscar_discente_por_id(99)
+
+        # Assert
+        self.assertFalse(result.ok)
+        self.assertTrue(result.do_cache)
+        self.assertEqual(result.status_code, 404)
+        mock_get.assert_called_once()
+        self.assertFalse(Discente.objects.exists())
@@ -1,6 +1,12 @@
 """Testes para EnrollmentServiceV2."""
 
-from django.test import TestCase
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
 from core.models import Discente, Disciplina
 from core.models.enrollment import Matricula, MatriculaDisciplina
 from core.services.enrollment_service_v2 import EnrollmentServiceV2
@@ -236,3 +242,255 @@ class EnrollmentServiceTestCase(TestCase):
         # E disciplina está ativa novamente
         matricula = Matricula.objects.first()
         self.assertEqual(matricula.quantidade_disciplinas_ativas(), 1)
+
+    def test_apenas_uma_matricula_ativa_por_periodo(self):
+        """A constraint parcial barra uma segunda matrícula ativa no mesmo período."""
+        # Arrange
+        Matricula.objects.create(discente=self.discente, periodo="2024.2", ativa=True)
+
+        # Act / Assert
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Matricula.objects.create(discente=self.discente, periodo="2024.2", ativa=True)
+
+        # Inativas e outros períodos continuam permitidos
+        Matricula.objects.create(discente=self.discente, periodo="2024.2", ativa=False)
+        Matricula.objects.create(discente=self.discente, periodo="2025.1", ativa=True)
+        self.assertEqual(Matricula.objects.filter(ativa=True).count(), 2)
+
+    def test_contador_de_disciplinas_ativas(self):
+        """O contador acompanha adições e remoções sem COUNT."""
+        # Act
+        EnrollmentServiceV2.adicionar_disciplina(self.discente, self.disciplina1)
+        EnrollmentServiceV2.adicionar_disciplina(self.discente, self.disciplina2)
+        EnrollmentServiceV2.remover_disciplina(self.discente, self.disciplina1)
+
+        # Assert
+        matricula = Matricula.objects.get()
+        self.assertEqual(matricula.disciplinas_ativas, 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(matricula.quantidade_disciplinas_ativas(), 1)
+
+    def test_recalcular_disciplinas_ativas(self):
+        """O reparo corrige só as matrículas divergentes, em um único UPDATE."""
+        # Arrange
+        EnrollmentServiceV2.adicionar_disciplina(self.discente, self.disciplina1)
+        Matricula.objects.update(disciplinas_ativas=4)
+
+        # Act
+        with self.assertNumQueries(1):
+            corrigidas = EnrollmentServiceV2.recalcular_disciplinas_ativas()
+
+        # Assert
+        self.assertEqual(corrigidas, 1)
+        self.assertEqual(Matricula.objects.get().disciplinas_ativas, 1)
+        self.assertEqual(EnrollmentServiceV2.recalcular_disciplinas_ativas(), 0)
+
+    def test_quantidade_de_consultas_por_matricula(self):
+        """Regressão: uma consulta de leitura e só as escritas necessárias.
+
+        Os números incluem o SAVEPOINT/RELEASE do @transaction.atomic, que
+        dentro do TestCase vira savepoint.
+        """
+        # Matrícula nova: SELECT, UPDATE vagas, INSERT matrícula (em savepoint), INSERT vínculo
+        with self.assertNumQueries(8):
+            EnrollmentServiceV2.adicionar_disciplina(self.discente, self.disciplina1)
+
+        # Matrícula existente: SELECT, UPDATE vagas, UPDATE contador, INSERT vínculo
+        with self.assertNumQueries(6):
+            EnrollmentServiceV2.adicionar_disciplina(self.discente, self.disciplina2)
+
+        # Reativação: o vínculo removido vem na mesma leitura
+        EnrollmentServiceV2.remover_disciplina(self.discente, self.disciplina2)
+        with self.assertNumQueries(6):
+            sucesso, msg = EnrollmentServiceV2.adicionar_disciplina(self.discente, self.disciplina2)
+        self.assertIn("reativada", msg.lower())
+
+        # Duplicada: recusada só com a leitura
+        with self.assertNumQueries(3):
+            sucesso, _ = EnrollmentServiceV2.adicionar_disciplina(self.discente, self.disciplina2)
+        self.assertFalse(sucesso)
+        self.assertEqual(Matricula.objects.get().disciplinas_ativas, 2)
+
+    def test_adicionar_disciplinas_em_lote(self):
+        """Cada disciplina do lote recebe seu resultado; as válidas entram juntas."""
+        # Act
+        resultados = EnrollmentServiceV2.adicionar_disciplinas(
+            self.discente,
+            [self.disciplina1.id, self.disciplina2.id, self.disciplina_outro_curso.id,
+             self.disciplina_sem_vagas.id, 99]
+        )
+
+        # Assert
+        self.assertEqual(list(resultados), [1, 2, 3, 4, 99])
+        self.assertTrue(resultados[1][0])
+        self.assertTrue(resultados[2][0])
+        self.assertIn("curso", resultados[3][1].lower())
+        self.assertIn("vagas", resultados[4][1].lower())
+        self.assertIn("não encontrada", resultados[99][1].lower())
+
+        matricula = Matricula.objects.get()
+        self.assertEqual(matricula.disciplinas_ativas, 2)
+        self.disciplina1.refresh_from_db()
+        self.disciplina2.refresh_from_db()
+        self.assertEqual((self.disciplina1.vagas, self.disciplina2.vagas), (9, 4))
+
+    def test_adicionar_disciplinas_respeita_limite_duplicadas_e_reativa(self):
+        """Duplicadas são recusadas e o limite de 5 é preenchido na ordem da lista."""
+        # Arrange
+        extras = [
+            Disciplina.objects.create(
+                id=10 + i, curso="Ciência da Computação", nome=f"Optativa {i}", vagas=3
+            )
+            for i in range(5)
+        ]
+        EnrollmentServiceV2.adicionar_disciplina(self.discente, self.disciplina1)
+        EnrollmentServiceV2.adicionar_disciplina(self.discente, self.disciplina2)
+        EnrollmentServiceV2.remover_disciplina(self.discente, self.disciplina2)
+        ids = [self.disciplina1.id, self.disciplina2.id] + [d.id for d in extras]
+
+        # Act: SELECT disciplinas, SELECT matrícula, SELECT vínculos, UPDATE
+        # contador, UPDATE vagas, UPDATE reativação, INSERT em lote (+ savepoint)
+        with self.assertNumQueries(9):
+            resultados = EnrollmentServiceV2.adicionar_disciplinas(self.discente, ids)
+
+        # Assert
+        self.assertIn("já está", resultados[1][1])
+        self.assertIn("reativada", resultados[2][1])
+        self.assertEqual([resultados[d.id][0] for d in extras], [True, True, True, False, False])
+        self.assertIn("Limite", resultados[extras[-1].id][1])
+        self.assertEqual(Matricula.objects.get().disciplinas_ativas, 5)
+        self.assertEqual(
+            MatriculaDisciplina.objects.filter(ativa=True).count(), 5
+        )
+        self.assertEqual(Disciplina.objects.get(id=extras[-1].id).vagas, 3)
+
+    def test_endpoint_matricular_lote(self):
+        """O POST aceita a lista de disciplinas separada por vírgulas."""
+        # Act
+        resposta = self.client.post(reverse('core:matricular_lote'), {
+            'discente_id': self.discente.id,
+            'disciplina_ids': f"{self.disciplina1.id}, {self.disciplina2.id}",
+        })
+
+        # Assert
+        self.assertRedirects(
+            resposta,
+            reverse('core:discente_detail', args=[self.discente.id]),
+            fetch_redirect_response=False
+        )
+        self.assertEqual(Matricula.objects.get().disciplinas_ativas, 2)
+
+    def test_matricular_turma_aloca_vagas_por_id(self):
+        """Em massa: regras aplicadas por discente e vagas distribuídas por ordem de ID."""
+        # Arrange: discente 1 já cursa a disciplina 2; 3 está trancado; 4 está no limite
+        for i in range(2, 9):
+            Discente.objects.create(
+                id=i, nome=f"Discente {i}", curso="Ciência da Computação",
+                modalidade="EAD", status_academico="Trancado" if i == 3 else "Ativo"
+            )
+        EnrollmentServiceV2.adicionar_disciplina(self.discente, self.disciplina2)
+        Matricula.objects.create(
+            discente_id=4, periodo="2024.2", ativa=True,
+            disciplinas_ativas=EnrollmentServiceV2.MAX_DISCIPLINAS
+        )
+        Disciplina.objects.filter(id=2).update(vagas=3)
+        turma = Discente.objects.filter(curso="Ciência da Computação")
+
+        # Act
+        resultado = EnrollmentServiceV2.matricular_turma(turma, [2, 3])
+
+        # Assert: 3 vagas vão para os menores IDs elegíveis (2, 5 e 6)
+        self.assertEqual(sorted(resultado.aceitas), [(2, 2), (5, 2), (6, 2)])
+        motivos = {(d, disc): motivo for d, disc, motivo in resultado.recusadas}
+        self.assertIn("já está", motivos[(1, 2)])
+        self.assertIn("trancada", motivos[(3, 2)])
+        self.assertIn("Limite", motivos[(4, 2)])
+        self.assertIn("vagas", motivos[(7, 2)])
+        self.assertIn("curso", motivos[(2, 3)])
+        self.assertEqual(resultado.resumo()[2]["aceitas"], 3)
+        self.assertEqual(resultado.matriculas_criadas, 3)
+
+        self.assertEqual(Disciplina.objects.get(id=2).vagas, 0)
+        self.assertEqual(
+            set(MatriculaDisciplina.objects.filter(disciplina_id=2, ativa=True)
+                .values_list('matricula__discente_id', flat=True)),
+            {1, 2, 5, 6}
+        )
+        self.assertEqual(
+            Matricula.objects.get(discente_id=5, ativa=True).disciplinas_ativas, 1
+        )
+        # Contadores consistentes; só o do discente 4, montado no Arrange, diverge
+        self.assertEqual(EnrollmentServiceV2.recalcular_disciplinas_ativas(), 1)
+
+    def test_comando_matricular_turma_simulado_nao_grava(self):
+        """--simular mostra o resumo e desfaz a transação."""
+        # Arrange
+        saida = StringIO()
+
+        # Act
+        call_command(
+            'matricular_turma', '1', '--curso', 'ciência da computação', '--simular', stdout=saida
+        )
+
+        # Assert
+        self.assertIn("1 inclusões aceitas", saida.getvalue())
+        self.assertEqual(Matricula.objects.count(), 0)
+        self.disciplina1.refresh_from_db()
+        self.assertEqual(self.disciplina1.vagas, 10)
+
+
+class ConcorrenciaVagasTestCase(TransactionTestCase):
+    """Matrículas simultâneas disputando as mesmas vagas.
+
+    TransactionTestCase: cada thread usa sua própria conexão e precisa
+    enxergar os dados já gravados.
+    """
+
+    TOTAL_DISCENTES = 200
+    VAGAS = 10
+
+    def setUp(self):
+        Discente.objects.bulk_create(
+            Discente(
+                id=i,
+                nome=f"Discente {i}",
+                curso="Ciência da Computação",
+                modalidade="Presencial",
+                status_academico="Ativo"
+            )
+            for i in range(1, self.TOTAL_DISCENTES + 1)
+        )
+        self.disciplina = Disciplina.objects.create(
+            id=1,
+            curso="Ciência da Computação",
+            nome="Algoritmos",
+            vagas=self.VAGAS
+        )
+
+    def test_vagas_nao_sao_vendidas_duas_vezes(self):
+        """Centenas de matrículas paralelas: só as 10 primeiras vagas são vendidas."""
+        # Arrange
+        discentes = list(Discente.objects.all())
+
+        def matricular(discente):
+            # Cada thread recebe sua cópia desatualizada (vagas=10)
+            disciplina = Disciplina(
+                id=1, curso="Ciência da Computação", nome="Algoritmos", vagas=self.VAGAS
+            )
+            try:
+                return EnrollmentServiceV2.adicionar_disciplina(discente, disciplina)[0]
+            finally:
+                connection.close()
+
+        # Act
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            resultados = list(executor.map(matricular, discentes))
+
+        # Assert
+        self.disciplina.refresh_from_db()
+        self.assertEqual(resultados.count(True), self.VAGAS)
+        self.assertEqual(self.disciplina.vagas, 0)
+        self.assertEqual(
+            MatriculaDisciplina.objects.filter(disciplina=self.disciplina, ativa=True).count(),
+            self.VAGAS
+        )
@@ -0,0 +1,92 @@
+"""Testes do servidor local que imita os microsserviços."""
+
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from core.fake_upstream import ConfiguracaoFake, gerar_dados, iniciar_em_background
+from core.gateways.base_client import (
+    BaseHttpClient,
+    fechar_sessoes,
+    limpar_validadores,
+)
+from core.gateways.circuit_breaker import resetar_breakers
+from core.gateways.unified_gateway import UnifiedGateway
+
+
+class ServidorFakeTestCase(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.servidor = iniciar_em_background(
+            ConfiguracaoFake(discentes=20, disciplinas=5, livros=50)
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.servidor.shutdown()
+        cls.servidor.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        fechar_sessoes()
+        limpar_validadores()
+        resetar_breakers()
+
+    def tearDown(self):
+        fechar_sessoes()
+        limpar_validadores()
+        resetar_breakers()
+
+    def test_dados_deterministicos_pela_semente(self):
+        config = ConfiguracaoFake(discentes=10, disciplinas=10, livros=10)
+
+        self.assertEqual(gerar_dados(config), gerar_dados(config))
+
+    def test_consumir_todos_dados_offline(self):
+        """O UnifiedGateway consome as três fontes do fake com o contrato real."""
+        # Arrange
+        with patch.dict(UnifiedGateway.ENDPOINTS, self.servidor.urls()):
+            # Act
+            dados = UnifiedGateway.consumir_todos_dados()
+
+        # Assert
+        self.assertEqual(dados.erros, [])
+        self.assertEqual(len(dados.discentes), 20)
+        self.assertEqual(len(dados.disciplinas), 5)
+        self.assertEqual(len(dados.livros), 50)
+        self.assertEqual(set(dados.livros[0]), {'id', 'titulo', 'autor', 'ano', 'status'})
+
+    def test_discente_por_id_e_304(self):
+        # Arrange
+        alunos = BaseHttpClient(self.servidor.urls()['discentes'])
+        livros = BaseHttpClient(self.servidor.urls()['livros'])
+
+        # Act
+        encontrado = alunos.get('3')
+        ausente = alunos.get('999')
+        livros.get()
+        revalidado = livros.get()
+
+        # Assert
+        self.assertEqual(encontrado.data['id'], 3)
+        self.assertEqual(ausente.status_code, 404)
+        self.assertTrue(revalidado.revalidado)
+        self.assertEqual(len(revalidado.data), 50)
+
+    def test_erros_injetados(self):
+        """Com taxa de erro 1, todas as respostas são 503."""
+        # Arrange
+        servidor = iniciar_em_background(ConfiguracaoFake(discentes=1, taxa_erro=1.0))
+        try:
+            client = BaseHttpClient(servidor.urls()['discentes'], max_retentativas=0)
+
+            # Act
+            result = client.get('1')
+        finally:
+            servidor.shutdown()
+            servidor.server_close()
+
+        # Assert
+        self.assertEqual(result.status_code, 503)
@@ -1,9 +1,13 @@
 """Testes do serviço de inicialização."""
 
+from django.db import connection
 from django.test import TestCase
 from unittest.mock import patch, MagicMock
+
+import requests
 from core.services.initialization_service import InitializationService
 from core.models import Discente, Disciplina, Livro
+from core.models.enrollment import Matricula, MatriculaDisciplina, ReservaLivro
 
 
 class InitializationServiceTestCase(TestCase):
@@ -110,3 +114,171 @@ class InitializationServiceTestCase(TestCase):
         self.assertFalse(sucesso)
         self.assertIn("Falha ao consumir dados", msg)
         self.assertIn("Erro de conexão", msg)
+
+    def test_carga_em_lote_atualiza_apenas_alterados(self):
+        """Carga em lote insere novos, atualiza alterados e mantém os demais."""
+        # Arrange
+        Discente.objects.create(
+            id=1, nome="João", curso="CC", modalidade="Presencial", status_academico="Ativo"
+        )
+        Discente.objects.create(
+            id=2, nome="Maria", curso="ADM", modalidade="EAD", status_academico="Ativo"
+        )
+        dados = MagicMock()
+        dados.discentes = [
+            {'id': 1, 'nome': 'João', 'curso': 'CC', 'modalidade': 'Presencial', 'status': 'Ativo'},
+            {'id': 2, 'nome': 'Maria', 'curso': 'ADM', 'modalidade': 'EAD', 'status': 'Trancado'},
+            {'id': 3, 'nome': 'Ana', 'curso': 'CC', 'modalidade': 'EAD', 'status': 'Ativo'},
+        ]
+        dados.disciplinas = [{'id': 1, 'curso': 'CC', 'nome': 'Algoritmos', 'vagas': '10'}]
+        dados.livros = []
+
+        # Act
+        with self.assertNumQueries(6):
+            stats = InitializationService.carregar_dados(dados)
+
+        # Assert
+        self.assertEqual(stats, {'discentes': 3, 'disciplinas': 1, 'livros': 0})
+        self.assertEqual(Discente.objects.count(), 3)
+        self.assertEqual(Discente.objects.get(id=2).status_academico, 'Trancado')
+        self.assertEqual(Disciplina.objects.get(id=1).vagas, 10)
+
+    def test_carga_registro_a_registro_equivale_ao_lote(self):
+        """O modo registro a registro produz o mesmo resultado."""
+        # Arrange
+        dados = MagicMock()
+        dados.discentes = [
+            {'id': 1, 'nome': 'João', 'curso': 'CC', 'modalidade': 'Presencial', 'status': 'Ativo'},
+        ]
+        dados.disciplinas = []
+        dados.livros = [
+            {'id': 1, 'titulo': '1984', 'autor': 'Orwell', 'ano': 1949, 'status': 'Disponível'},
+        ]
+
+        # Act
+        stats = InitializationService.carregar_dados(dados, em_lote=False)
+
+        # Assert
+        self.assertEqual(stats, {'discentes': 1, 'disciplinas': 0, 'livros': 1})
+        self.assertEqual(Livro.objects.get(id=1).autor, 'Orwell')
+
+    @patch('core.services.initialization_service.UnifiedGateway.consumir_todos_dados')
+    def test_sincronizacao_incremental(self, mock_consumir):
+        """Deve aplicar só as diferenças e manter as simulações locais."""
+        # Arrange - Estado local com matrícula e reserva
+        joao = Discente.objects.create(
+            id=1, nome="João", curso="CC", modalidade="Presencial", status_academico="Ativo"
+        )
+        maria = Discente.objects.create(
+            id=2, nome="Maria", curso="CC", modalidade="EAD", status_academico="Ativo"
+        )
+        algoritmos = Disciplina.objects.create(id=1, curso="CC", nome="Algoritmos", vagas=9)
+        livro = Livro.objects.create(
+            id=1, titulo="1984", autor="Orwell", ano=1949, status="Reservado"
+        )
+        matricula = Matricula.objects.create(discente=joao, periodo="2024.2")
+        MatriculaDisciplina.objects.create(matricula=matricula, disciplina=algoritmos)
+        ReservaLivro.objects.create(discente=joao, livro=livro)
+        Matricula.objects.create(discente=maria, periodo="2024.2")
+
+        mock_response = MagicMock()
+        mock_response.sucesso = True
+        mock_response.erros = []
+        mock_response.fontes_com_erro = []
+        mock_response.discentes = [
+            {'id': 1, 'nome': 'João', 'curso': 'CC', 'modalidade': 'Presencial', 'status': 'Ativo'},
+            {'id': 3, 'nome': 'Ana', 'curso': 'CC', 'modalidade': 'EAD', 'status': 'Ativo'},
+        ]
+        mock_response.disciplinas = [
+            {'id': 1, 'curso': 'CC', 'nome': 'Algoritmos I', 'vagas': 10},
+        ]
+        mock_response.livros = [
+            {'id': 1, 'titulo': '1984', 'autor': 'Orwell', 'ano': 1949, 'status': 'Disponível'},
+        ]
+        mock_consumir.return_value = mock_response
+
+        # Act
+        sucesso, msg = InitializationService.sincronizar_incremental()
+
+        # Assert
+        self.assertTrue(sucesso)
+        self.assertIn("Discentes: 1 adicionados, 0 alterados, 1 removidos, 1 inalterados", msg)
+        self.assertIn("Disciplinas: 0 adicionados, 1 alterados", msg)
+        self.assertIn("Livros: 0 adicionados, 0 alterados, 0 removidos, 1 inalterados", msg)
+        self.assertFalse(Discente.objects.filter(id=2).exists())
+        self.assertEqual(Matricula.objects.count(), 1)
+        self.assertEqual(MatriculaDisciplina.objects.filter(ativa=True).count(), 1)
+        self.assertEqual(ReservaLivro.objects.filter(ativa=True).count(), 1)
+        # Vagas descontam a matrícula ativa; o livro continua reservado
+        algoritmos.refresh_from_db()
+        self.assertEqual(algoritmos.vagas, 9)
+        self.assertEqual(algoritmos.nome, "Algoritmos I")
+        livro.refresh_from_db()
+        self.assertEqual(livro.status, "Reservado")
+
+    @patch('core.services.initialization_service.UnifiedGateway.consumir_todos_dados')
+    def test_busca_no_upstream_fora_da_transacao(self, mock_consumir):
+        """Com BEGIN IMMEDIATE, a trava de escrita não pode cobrir a rede."""
+        # Arrange
+        fora_de_transacao = len(connection.atomic_blocks)
+        profundidades = []
+
+        def consumir():
+            profundidades.append(len(connection.atomic_blocks))
+            resposta = MagicMock(sucesso=True, erros=[], fontes_com_erro=[])
+            resposta.discentes, resposta.disciplinas, resposta.livros = [], [], []
+            return resposta
+
+        mock_consumir.side_effect = consumir
+
+        # Act
+        InitializationService.sincronizar_incremental()
+        InitializationService.inicializar_sistema(forcar_reinicializacao=True)
+
+        # Assert
+        self.assertEqual(profundidades, [fora_de_transacao, fora_de_transacao])
+
+    @patch('core.services.initialization_service.UnifiedGateway.consumir_todos_dados')
+    def test_sincronizacao_incremental_nao_remove_fonte_com_erro(self, mock_consumir):
+        """Uma fonte que falhou não deve apagar os registros locais."""
+        # Arrange
+        Livro.objects.create(id=1, titulo="1984", autor="Orwell", ano=1949, status="Disponível")
+        mock_response = MagicMock()
+        mock_response.sucesso = True
+        mock_response.erros = ['Erro ao buscar livros: HTTP 503']
+        mock_response.fontes_com_erro = ['livros']
+        mock_response.discentes = [
+            {'id': 1, 'nome': 'João', 'curso': 'CC', 'modalidade': 'Presencial', 'status': 'Ativo'},
+        ]
+        mock_response.disciplinas = []
+        mock_response.livros = []
+        mock_consumir.return_value = mock_response
+
+        # Act
+        sucesso, msg = InitializationService.sincronizar_incremental()
+
+        # Assert
+        self.assertTrue(sucesso)
+        self.assertEqual(Livro.objects.count(), 1)
+        self.assertIn("Avisos", msg)
+
+    @patch('core.services.initialization_service.UnifiedGateway.iterar_lotes')
+    def test_streaming_com_todas_as_fontes_fora_preserva_cache(self, mock_iterar):
+        """Com limpar=True e nenhuma fonte respondendo, a limpeza é desfeita."""
+        # Arrange
+        Livro.objects.create(id=1, titulo="1984", autor="Orwell", ano=1949, status="Disponível")
+        Discente.objects.create(
+            id=1, nome="João", curso="CC", modalidade="Presencial", status_academico="Ativo"
+        )
+        mock_iterar.side_effect = requests.ConnectionError("fora do ar")
+
+        # Act
+        sucesso, msg = InitializationService.inicializar_sistema(
+            forcar_reinicializacao=True, streaming=True, limpar=True
+        )
+
+        # Assert
+        self.assertFalse(sucesso)
+        self.assertIn("Falha ao consumir dados", msg)
+        self.assertEqual(Livro.objects.count(), 1)
+        self.assertEqual(Discente.objects.count(), 1)
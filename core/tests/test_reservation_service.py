@@ -0,0 +1,142 @@
+"""Testes para ReservationServiceV2 e a fila de reserva dos livros."""
+
+from django.test import TestCase
+from django.urls import reverse
+
+from core.models import Discente, EsperaLivro, Livro, ReservaLivro
+from core.services.reservation_service_v2 import ReservationServiceV2
+
+
+class ReservationServiceTestCase(TestCase):
+
+    def setUp(self):
+        self.discentes = [
+            Discente.objects.create(
+                id=i,
+                nome=f"Discente {i}",
+                curso="Ciência da Computação",
+                modalidade="Presencial",
+                status_academico="Ativo"
+            )
+            for i in range(1, 5)
+        ]
+        self.livro = Livro.objects.create(
+            id=1, titulo="Estruturas de Dados", autor="Autor", ano=2010, status="Disponível"
+        )
+
+    def _reservar(self, *indices):
+        for i in indices:
+            sucesso, msg = ReservationServiceV2.reservar(self.discentes[i], self.livro)
+            self.assertTrue(sucesso, msg)
+
+    def test_reservar_livro_disponivel(self):
+        # Act
+        self._reservar(0)
+
+        # Assert
+        self.livro.refresh_from_db()
+        self.assertEqual(self.livro.status, "Reservado")
+        self.assertTrue(ReservaLivro.objects.filter(discente_id=1, ativa=True).exists())
+
+    def test_livro_reservado_entra_na_fila(self):
+        """Quem pede um livro já reservado recebe a posição na fila."""
+        # Arrange
+        self._reservar(0)
+
+        # Act
+        sucesso, msg = ReservationServiceV2.reservar(self.discentes[1], self.livro)
+        self._reservar(2)
+        repetido = ReservationServiceV2.reservar(self.discentes[2], self.livro)
+
+        # Assert
+        self.assertTrue(sucesso)
+        self.assertIn("posição 1", msg)
+        self.assertFalse(repetido[0])
+        self.assertIn("posição 2", repetido[1])
+        with self.assertNumQueries(1):
+            self.assertEqual(ReservationServiceV2.posicao_fila(self.discentes[2], self.livro), 2)
+
+    def test_livro_emprestado_nao_tem_fila(self):
+        """Sem reserva local para cancelar, a fila nunca andaria."""
+        # Arrange
+        Livro.objects.filter(pk=1).update(status="Emprestado")
+
+        # Act
+        sucesso, msg = ReservationServiceV2.reservar(self.discentes[0], self.livro)
+
+        # Assert
+        self.assertFalse(sucesso)
+        self.assertIn("não está disponível", msg)
+        self.assertFalse(EsperaLivro.objects.exists())
+
+    def test_cancelar_repassa_o_livro_ao_primeiro_da_fila(self):
+        # Arrange
+        self._reservar(0, 1, 2)
+
+        # Act
+        sucesso, msg = ReservationServiceV2.cancelar(self.discentes[0], self.livro)
+
+        # Assert
+        self.assertTrue(sucesso)
+        self.assertIn("próximo da fila", msg)
+        self.livro.refresh_from_db()
+        self.assertEqual(self.livro.status, "Reservado")
+        self.assertEqual(
+            list(ReservaLivro.objects.filter(ativa=True).values_list('discente_id', flat=True)), [2]
+        )
+        self.assertIsNotNone(EsperaLivro.objects.get(discente_id=2).atendida_em)
+        self.assertEqual(ReservationServiceV2.posicao_fila(self.discentes[2], self.livro), 1)
+
+    def test_sair_da_fila_faz_os_seguintes_subirem(self):
+        # Arrange
+        self._reservar(0, 1, 2, 3)
+
+        # Act
+        sucesso, _ = ReservationServiceV2.cancelar(self.discentes[1], self.livro)
+
+        # Assert
+        self.assertTrue(sucesso)
+        self.assertIsNone(ReservationServiceV2.posicao_fila(self.discentes[1], self.livro))
+        filas = ReservationServiceV2.listar_filas(self.discentes[3])
+        self.assertEqual([(e.livro_id, e.posicao) for e in filas], [(1, 2)])
+        self.assertTrue(ReservaLivro.objects.filter(discente_id=1, ativa=True).exists())
+
+    def test_exclusao_no_meio_da_fila_nao_desalinha_a_posicao(self):
+        """A entrada apagada em cascata não deixa buraco nas senhas."""
+        # Arrange
+        self._reservar(0, 1, 2, 3)
+
+        # Act
+        self.discentes[2].delete()
+
+        # Assert
+        self.assertEqual(
+            list(EsperaLivro.objects.filter(ativa=True).values_list('senha', flat=True)), [1, 2]
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(ReservationServiceV2.posicao_fila(self.discentes[3], self.livro), 2)
+        filas = ReservationServiceV2.listar_filas(self.discentes[3])
+        self.assertEqual([(e.livro_id, e.posicao) for e in filas], [(1, 2)])
+
+    def test_cancelar_sem_fila_libera_o_livro(self):
+        # Arrange
+        self._reservar(0, 1)
+        ReservationServiceV2.cancelar(self.discentes[0], self.livro)
+
+        # Act
+        ReservationServiceV2.cancelar(self.discentes[1], self.livro)
+
+        # Assert
+        self.livro.refresh_from_db()
+        self.assertEqual(self.livro.status, "Disponível")
+        self.assertFalse(ReservaLivro.objects.filter(ativa=True).exists())
+
+    def test_dashboard_mostra_posicao_na_fila(self):
+        # Arrange
+        self._reservar(0, 1)
+
+        # Act
+        resposta = self.client.get(reverse('core:student_dashboard', args=[2]))
+
+        # Assert
+        self.assertContains(resposta, "Posição 1 na fila")
@@ -0,0 +1,117 @@
+"""Testes da sincronização de discentes em lote."""
+
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.gateways import aluno_gateway
+from core.gateways.base_client import HttpResult
+from core.models import Discente
+from core.services.lookup_service import LookupService
+
+
+def _get_falso(path):
+    discente_id = int(path)
+    if discente_id % 10 == 0:
+        return HttpResult(ok=False, data=None, status_code=404, error="Erro HTTP 404", elapsed=0.0)
+    return HttpResult(
+        ok=True,
+        data={'id': discente_id, 'nome': f'Discente {discente_id}', 'curso': 'CC',
+              'modalidade': 'EAD', 'status': 'Ativo'},
+        status_code=200,
+        error=None,
+        elapsed=0.0,
+    )
+
+
+def _lista_falsa():
+    """Lista completa do msAluno: os mesmos discentes do GET por ID."""
+    return HttpResult(
+        ok=True,
+        data=[_get_falso(str(i)).data for i in range(1, 1000) if i % 10],
+        status_code=200,
+        error=None,
+        elapsed=0.0,
+    )
+
+
+@patch('core.gateways.aluno_gateway.client.get', side_effect=_get_falso)
+class SincronizarDiscentesTestCase(TestCase):
+
+    def setUp(self):
+        aluno_gateway.cache_discentes.limpar()
+
+    def tearDown(self):
+        aluno_gateway.cache_discentes.limpar()
+
+    def test_grava_em_lote_e_reporta_falhas_por_id(self, mock_get):
+        # Arrange
+        Discente.objects.create(id=1, nome='Antigo', curso='CC', modalidade='EAD', status_academico='Ativo')
+
+        # Act
+        resultado = LookupService.sincronizar_discentes(range(1, 31), paralelismo=4)
+
+        # Assert
+        self.assertEqual(len(resultado.sincronizados), 27)
+        self.assertEqual(set(resultado.falhas), {10, 20, 30})
+        self.assertIn("404", resultado.falhas[10])
+        self.assertEqual(Discente.objects.count(), 27)
+        self.assertEqual(Discente.objects.get(id=1).nome, 'Discente 1')
+        self.assertEqual(mock_get.call_count, 30)
+
+    @patch('core.gateways.aluno_gateway.client_lista.get', side_effect=_lista_falsa)
+    def test_escritas_nao_crescem_com_o_numero_de_ids(self, mock_lista, mock_get):
+        """Inserções vão em bulk: as consultas ao banco independem da quantidade de IDs."""
+        with self.assertNumQueries(4):
+            LookupService.sincronizar_discentes(range(1, 200))
+
+    @patch('core.gateways.aluno_gateway.client_lista.get', side_effect=_lista_falsa)
+    def test_muitos_ids_usam_a_lista_completa(self, mock_lista, mock_get):
+        """Acima do limiar, uma chamada à lista substitui as consultas por ID."""
+        # Act
+        resultado = LookupService.sincronizar_discentes(range(1, 201))
+
+        # Assert
+        mock_lista.assert_called_once()
+        mock_get.assert_not_called()
+        self.assertEqual(len(resultado.sincronizados), 180)
+        self.assertIn("não encontrado", resultado.falhas[200])
+        self.assertEqual(Discente.objects.count(), 180)
+
+    @patch('core.gateways.aluno_gateway.client_lista.get', return_value=HttpResult(
+        ok=False, data=None, status_code=503, error="Erro HTTP 503", elapsed=0.0
+    ))
+    def test_lista_indisponivel_cai_para_consulta_por_id(self, mock_lista, mock_get):
+        # Act
+        resultado = LookupService.sincronizar_discentes(range(1, 101), paralelismo=8)
+
+        # Assert
+        self.assertEqual(mock_get.call_count, 100)
+        self.assertEqual(len(resultado.sincronizados), 90)
+
+    def test_consultas_por_id_ignoram_o_cache(self, mock_get):
+        """Sincronizar em lote sempre busca o dado atual no upstream."""
+        # Arrange
+        LookupService.sincronizar_discentes([1, 2])
+
+        # Act
+        LookupService.sincronizar_discentes([1, 2])
+
+        # Assert
+        self.assertEqual(mock_get.call_count, 4)
+
+    def test_ids_repetidos_buscados_uma_vez(self, mock_get):
+        resultado = LookupService.sincronizar_discentes([5, 5, 6])
+
+        self.assertEqual(resultado.sincronizados, [5, 6])
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_comando(self, mock_get):
+        saida = StringIO()
+
+        call_command('sincronizar_discentes', '--intervalo', '1-12', stdout=saida)
+
+        self.assertIn("11 discentes sincronizados", saida.getvalue())
+        self.assertIn("10: Erro HTTP 404", saida.getvalue())
@@ -0,0 +1,132 @@
+"""Testes da coalescência de chamadas concorrentes (single-flight)."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from core.gateways import aluno_gateway
+from core.gateways.base_client import HttpResult
+from core.gateways.single_flight import SingleFlight
+from core.services.initialization_service import InitializationService
+
+
+class SingleFlightTestCase(SimpleTestCase):
+
+    def test_chamadas_concorrentes_compartilham_execucao(self):
+        # Arrange
+        voos = SingleFlight()
+        liberar = threading.Event()
+        execucoes = []
+
+        def lenta():
+            execucoes.append(1)
+            liberar.wait(2)
+            return "ok"
+
+        # Act
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futuros = [executor.submit(voos.executar, "k", lenta) for _ in range(5)]
+            while voos.estatisticas()["compartilhadas"] < 4:
+                time.sleep(0.001)
+            liberar.set()
+            resultados = [f.result() for f in futuros]
+
+        # Assert
+        self.assertEqual(resultados, ["ok"] * 5)
+        self.assertEqual(len(execucoes), 1)
+        self.assertFalse(voos.em_andamento("k"))
+
+    def test_excecao_do_lider_chega_aos_seguidores(self):
+        # Arrange
+        voos = SingleFlight()
+        liberar = threading.Event()
+
+        def falha():
+            liberar.wait(2)
+            raise RuntimeError("upstream fora")
+
+        # Act
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futuros = [executor.submit(voos.executar, "k", falha) for _ in range(2)]
+            while voos.estatisticas()["compartilhadas"] < 1:
+                time.sleep(0.001)
+            liberar.set()
+
+            # Assert
+            for futuro in futuros:
+                with self.assertRaises(RuntimeError):
+                    futuro.result()
+
+    def test_nova_chamada_apos_termino_executa_de_novo(self):
+        voos = SingleFlight()
+
+        voos.executar("k", lambda: 1)
+        voos.executar("k", lambda: 2)
+
+        self.assertEqual(voos.estatisticas()["execucoes"], 2)
+
+    def test_buscas_simultaneas_do_mesmo_discente(self):
+        """Vários pedidos pelo mesmo discente geram uma única chamada ao upstream."""
+        # Arrange
+        aluno_gateway.cache_discentes.limpar()
+        liberar = threading.Event()
+        chamadas = []
+        voos = aluno_gateway.buscas_em_andamento
+        antes = voos.estatisticas()["compartilhadas"]
+
+        def get(path):
+            chamadas.append(path)
+            liberar.wait(2)
+            return HttpResult(ok=True, data={"id": 9}, status_code=200, error=None, elapsed=0.0)
+
+        # Act
+        with patch.object(aluno_gateway.client, "get", side_effect=get), \
+                ThreadPoolExecutor(max_workers=4) as executor:
+            futuros = [
+                executor.submit(aluno_gateway.buscar_discente_por_id, 9, False) for _ in range(4)
+            ]
+            while voos.estatisticas()["compartilhadas"] < antes + 3:
+                time.sleep(0.001)
+            liberar.set()
+            resultados = [f.result() for f in futuros]
+
+        aluno_gateway.cache_discentes.limpar()
+
+        # Assert
+        self.assertEqual(chamadas, ["9"])
+        self.assertTrue(all(r.data == {"id": 9} for r in resultados))
+
+    def test_reinicializacao_concorrente_aguarda_a_em_andamento(self):
+        """Um segundo inicializar_sistema(forcar=True) entra na carga que já está rodando."""
+        # Arrange
+        liberar = threading.Event()
+        cargas = []
+        voos = InitializationService._sincronizacao
+        antes = voos.estatisticas()["compartilhadas"]
+
+        def carga(*args):
+            cargas.append(args)
+            liberar.wait(2)
+            return True, "Sistema inicializado com sucesso."
+
+        # Act
+        with patch.object(InitializationService, "_inicializar_sistema", side_effect=carga), \
+                ThreadPoolExecutor(max_workers=2) as executor:
+            primeira = executor.submit(
+                InitializationService.inicializar_sistema, forcar_reinicializacao=True, limpar=True
+            )
+            while not InitializationService.sincronizacao_em_andamento():
+                time.sleep(0.001)
+            segunda = executor.submit(
+                InitializationService.inicializar_sistema, forcar_reinicializacao=True, limpar=True
+            )
+            while voos.estatisticas()["compartilhadas"] < antes + 1:
+                time.sleep(0.001)
+            liberar.set()
+
+            # Assert
+            self.assertEqual(primeira.result(), segunda.result())
+        self.assertEqual(len(cargas), 1)
@@ -0,0 +1,73 @@
+"""Testes do snapshot em disco."""
+
+import gzip
+import json
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase, override_settings
+
+from core.gateways.unified_gateway import ExternalData
+from core.models import Discente, Livro
+from core.services.initialization_service import InitializationService
+from core.services.snapshot_service import SnapshotService
+
+
+class SnapshotServiceTestCase(TestCase):
+    """Testes de gravação, leitura e hidratação a partir do snapshot."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.caminho = Path(self.tmp.name) / 'snapshot.json.gz'
+        self.override = override_settings(SNAPSHOT_PATH=str(self.caminho))
+        self.override.enable()
+
+    def tearDown(self):
+        self.override.disable()
+        self.tmp.cleanup()
+
+    def _dados(self):
+        return ExternalData(
+            discentes=[{'id': 1, 'nome': 'João', 'curso': 'CC', 'modalidade': 'EAD', 'status': 'Ativo'}],
+            disciplinas=[],
+            livros=[{'id': 7, 'titulo': '1984', 'autor': 'Orwell', 'ano': 1949, 'status': 'Disponível'}],
+            sucesso=True,
+            erros=[],
+        )
+
+    def test_salvar_e_carregar(self):
+        """O snapshot gravado deve voltar igual, com versão e frescor."""
+        SnapshotService.salvar(self._dados())
+
+        snapshot = SnapshotService.carregar()
+
+        self.assertEqual(snapshot.versao, SnapshotService.VERSAO)
+        self.assertEqual(snapshot.dados.livros[0]['titulo'], '1984')
+        self.assertLess(snapshot.idade_segundos, 60)
+        info = SnapshotService.inspecionar()
+        self.assertEqual(info['discentes'], 1)
+        self.assertEqual(info['livros'], 1)
+
+    def test_versao_incompativel_e_ignorada(self):
+        """Snapshot de outra versão de formato não deve ser usado."""
+        with gzip.open(self.caminho, 'wt', encoding='utf-8') as arquivo:
+            json.dump({'versao': 999, 'criado_em': '2024-01-01T00:00:00+00:00'}, arquivo)
+
+        self.assertIsNone(SnapshotService.carregar())
+
+    def test_hidratar_do_snapshot(self):
+        """Deve popular o banco local sem consumir os microsserviços."""
+        SnapshotService.salvar(self._dados())
+
+        sucesso, msg = InitializationService.hidratar_do_snapshot()
+
+        self.assertTrue(sucesso)
+        self.assertEqual(Discente.objects.count(), 1)
+        self.assertEqual(Livro.objects.get(id=7).autor, 'Orwell')
+
+    def test_hidratar_sem_snapshot(self):
+        """Sem snapshot, a hidratação falha sem tocar no banco."""
+        sucesso, msg = InitializationService.hidratar_do_snapshot()
+
+        self.assertFalse(sucesso)
+        self.assertIn("Nenhum snapshot", msg)
@@ -0,0 +1,75 @@
+"""Testes da leitura de arrays JSON em streaming."""
+
+import json
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase
+
+from core.gateways.streaming import em_lotes, iterar_array_json
+from core.models import Livro
+from core.services.initialization_service import InitializationService
+
+
+def _em_pedacos(texto: str, tamanho: int):
+    dados = texto.encode("utf-8")
+    return [dados[i:i + tamanho] for i in range(0, len(dados), tamanho)]
+
+
+class IterarArrayJsonTestCase(SimpleTestCase):
+    """O parser incremental deve reproduzir json.loads em qualquer fatiamento."""
+
+    def test_pedacos_de_um_byte(self):
+        itens = [
+            {"id": 1, "titulo": "Memórias Póstumas", "ano": 1881},
+            {"id": 22, "titulo": "O \"Cortiço\"", "ano": 1890},
+            12345,
+            [1, 2, {"x": None}],
+        ]
+        texto = " [ " + " , ".join(json.dumps(i, ensure_ascii=False) for i in itens) + " ] \n"
+
+        for tamanho in (1, 3, 7, 1024):
+            self.assertEqual(list(iterar_array_json(_em_pedacos(texto, tamanho))), itens)
+
+    def test_array_vazio(self):
+        self.assertEqual(list(iterar_array_json([b"[", b"]"])), [])
+
+    def test_nao_array(self):
+        with self.assertRaises(ValueError):
+            list(iterar_array_json([b'{"id": 1}']))
+
+    def test_array_truncado(self):
+        with self.assertRaises(ValueError):
+            list(iterar_array_json([b'[{"id": 1}, {"id"']))
+
+    def test_em_lotes(self):
+        self.assertEqual(list(em_lotes(range(5), 2)), [[0, 1], [2, 3], [4]])
+
+
+class InicializacaoStreamingTestCase(TestCase):
+    """Inicialização em streaming grava lote a lote."""
+
+    @patch('core.services.initialization_service.UnifiedGateway.iterar_lotes')
+    def test_inicializar_em_streaming(self, mock_lotes):
+        # Arrange
+        livros = [
+            {'id': i, 'titulo': f'Livro {i}', 'autor': 'A', 'ano': 2000, 'status': 'Disponível'}
+            for i in range(1, 6)
+        ]
+
+        def lotes(fonte, tamanho_lote):
+            if fonte == 'livros':
+                return iter(em_lotes(livros, 2))
+            raise ValueError("Resposta não é um array JSON")
+
+        mock_lotes.side_effect = lotes
+
+        # Act
+        sucesso, msg = InitializationService.inicializar_sistema(
+            forcar_reinicializacao=True, streaming=True
+        )
+
+        # Assert
+        self.assertTrue(sucesso)
+        self.assertIn("Livros: 5", msg)
+        self.assertIn("Avisos", msg)
+        self.assertEqual(Livro.objects.count(), 5)
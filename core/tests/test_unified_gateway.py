@@ -0,0 +1,64 @@
+"""Testes do gateway unificado."""
+
+import time
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from core.gateways.base_client import HttpResult
+from core.gateways.unified_gateway import UnifiedGateway
+
+
+def _fake_get(atraso: float, falhas: dict | None = None):
+    """Cria um substituto de BaseHttpClient.get que dorme `atraso` segundos."""
+    falhas = falhas or {}
+
+    def get(client, path="", params=None):
+        time.sleep(atraso)
+        for fonte, url in UnifiedGateway.ENDPOINTS.items():
+            if client.base_url == url.rstrip("/"):
+                break
+        if fonte in falhas:
+            return HttpResult(ok=False, data=None, status_code=falhas[fonte],
+                              error="erro", elapsed=atraso)
+        return HttpResult(ok=True, data=[{"id": 1, "fonte": fonte}],
+                          status_code=200, error=None, elapsed=atraso)
+
+    return get
+
+
+class UnifiedGatewayTestCase(SimpleTestCase):
+    """Testes do consumo unificado dos microsserviços (sem rede)."""
+
+    def test_modo_concorrente_busca_fontes_em_paralelo(self):
+        """O tempo total deve ser o da fonte mais lenta, não a soma."""
+        with patch("core.gateways.base_client.BaseHttpClient.get", _fake_get(0.2)):
+            inicio = time.perf_counter()
+            dados = UnifiedGateway.consumir_todos_dados(concorrente=True)
+            total = time.perf_counter() - inicio
+
+        self.assertTrue(dados.sucesso)
+        self.assertLess(total, 0.5)
+        self.assertEqual(dados.discentes[0]["fonte"], "discentes")
+        self.assertEqual(dados.livros[0]["fonte"], "livros")
+        self.assertEqual(set(dados.tempos), {"discentes", "disciplinas", "livros"})
+
+    def test_erro_por_fonte(self):
+        """Uma fonte com erro não impede as demais."""
+        with patch("core.gateways.base_client.BaseHttpClient.get",
+                   _fake_get(0, falhas={"disciplinas": 503})):
+            dados = UnifiedGateway.consumir_todos_dados()
+
+        self.assertTrue(dados.sucesso)
+        self.assertEqual(dados.disciplinas, [])
+        self.assertEqual(len(dados.discentes), 1)
+        self.assertEqual(dados.erros, ["Erro ao buscar disciplinas: HTTP 503"])
+
+    def test_modo_sequencial_mantem_formato(self):
+        """O modo sequencial devolve o mesmo formato de ExternalData."""
+        with patch("core.gateways.base_client.BaseHttpClient.get", _fake_get(0)):
+            dados = UnifiedGateway.consumir_todos_dados(concorrente=False)
+
+        self.assertTrue(dados.sucesso)
+        self.assertEqual(dados.erros, [])
+        self.assertEqual(len(dados.tempos), 3)
@@ -0,0 +1,75 @@
+"""Testes do registro de microsserviços (GATEWAY_UPSTREAMS)."""
+
+from unittest.mock import MagicMock, patch
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from core.gateways.base_client import fechar_sessoes, limpar_validadores
+from core.gateways.circuit_breaker import resetar_breakers
+from core.gateways.upstreams import criar_cliente, obter_upstream
+
+UPSTREAMS = {
+    "livros": {
+        "URL": "https://exemplo.test/acervo/biblioteca",
+        "TIMEOUT_CONEXAO": 0.5,
+        "TIMEOUT_LEITURA": 8.0,
+        "POOL": 3,
+        "RETENTATIVAS": 0,
+        "PRAZO": 20.0,
+        "CACHE_TTL": 30.0,
+    },
+    "discentes": {
+        "URL": "https://exemplo.test/msAluno",
+        "TIMEOUT_LEITURA": 3.0,
+        "TIMEOUT_LISTA": 5.0,
+    },
+}
+
+
+@override_settings(GATEWAY_UPSTREAMS=UPSTREAMS)
+class UpstreamsTestCase(SimpleTestCase):
+
+    def setUp(self):
+        fechar_sessoes()
+        limpar_validadores()
+        resetar_breakers()
+
+    def tearDown(self):
+        fechar_sessoes()
+
+    def test_cliente_usa_ajustes_do_registro(self):
+        # Arrange
+        client = criar_cliente("livros")
+        resp = MagicMock(status_code=200, headers={})
+        resp.json.return_value = []
+
+        with patch.object(client.session, "get", return_value=resp) as mock_get:
+            # Act
+            client.get()
+
+        # Assert
+        self.assertEqual(client.base_url, "https://exemplo.test/acervo/biblioteca")
+        self.assertEqual(client.max_retentativas, 0)
+        self.assertEqual(client.prazo, 20.0)
+        self.assertEqual(client.session.get_adapter(client.base_url)._pool_maxsize, 3)
+        conexao, leitura = mock_get.call_args.kwargs["timeout"]
+        self.assertEqual(conexao, 0.5)
+        self.assertLessEqual(leitura, 8.0)
+
+    def test_servico_desconhecido(self):
+        with self.assertRaises(ImproperlyConfigured):
+            obter_upstream("disciplinas")
+
+    def test_catalogo_usa_timeout_da_lista(self):
+        """A lista completa tem timeout próprio; sem TIMEOUT_LISTA, vale o de leitura."""
+        self.assertEqual(criar_cliente("discentes").timeout, 3.0)
+        self.assertEqual(criar_cliente("discentes", catalogo=True).timeout, 5.0)
+        self.assertEqual(criar_cliente("livros", catalogo=True).timeout, 8.0)
+
+    def test_kwargs_sobrescrevem_o_registro(self):
+        client = criar_cliente("livros", url="http://127.0.0.1:8099/acervo/biblioteca", prazo=1.0)
+
+        self.assertEqual(client.base_url, "http://127.0.0.1:8099/acervo/biblioteca")
+        self.assertEqual(client.prazo, 1.0)
+        self.assertEqual(client.timeout, 8.0)
@@ -0,0 +1,170 @@
+"""Testes da lista de espera das disciplinas."""
+
+from django.test import TestCase
+from django.urls import reverse
+
+from core.models import Discente, Disciplina, EsperaDisciplina, MatriculaDisciplina
+from core.services.enrollment_service_v2 import EnrollmentServiceV2
+from core.services.waitlist_service import WaitlistService
+
+
+class WaitlistServiceTestCase(TestCase):
+
+    def setUp(self):
+        self.discentes = [
+            Discente.objects.create(
+                id=i,
+                nome=f"Discente {i}",
+                curso="Ciência da Computação",
+                modalidade="Presencial",
+                status_academico="Ativo"
+            )
+            for i in range(1, 5)
+        ]
+        self.disciplina = Disciplina.objects.create(
+            id=1,
+            curso="Ciência da Computação",
+            nome="Compiladores",
+            vagas=1
+        )
+        # O discente 1 ocupa a única vaga
+        EnrollmentServiceV2.adicionar_disciplina(self.discentes[0], self.disciplina)
+
+    def _entrar(self, *indices):
+        for i in indices:
+            sucesso, msg = WaitlistService.entrar(self.discentes[i], self.disciplina)
+            self.assertTrue(sucesso, msg)
+
+    def test_entrar_exige_disciplina_lotada(self):
+        """Com vaga disponível a matrícula é direta, não pela fila."""
+        # Arrange
+        Disciplina.objects.filter(pk=1).update(vagas=1)
+
+        # Act
+        sucesso, msg = WaitlistService.entrar(self.discentes[1], self.disciplina)
+
+        # Assert
+        self.assertFalse(sucesso)
+        self.assertIn("vagas", msg)
+
+    def test_entrar_recusa_matriculado_e_repetido(self):
+        # Act
+        matriculado = WaitlistService.entrar(self.discentes[0], self.disciplina)
+        self._entrar(1)
+        repetido = WaitlistService.entrar(self.discentes[1], self.disciplina)
+
+        # Assert
+        self.assertFalse(matriculado[0])
+        self.assertFalse(repetido[0])
+        self.assertIn("já está na lista", repetido[1])
+
+    def test_posicao_segue_ordem_de_chegada(self):
+        """FIFO: a saída do meio da fila faz quem está atrás subir."""
+        # Arrange
+        self._entrar(1, 2, 3)
+
+        # Act
+        WaitlistService.sair(self.discentes[2], self.disciplina)
+
+        # Assert
+        with self.assertNumQueries(1):
+            self.assertEqual(WaitlistService.posicao(self.discentes[3], self.disciplina), 2)
+        self.assertEqual(WaitlistService.posicao(self.discentes[1], self.disciplina), 1)
+        self.assertIsNone(WaitlistService.posicao(self.discentes[2], self.disciplina))
+        self.assertEqual(WaitlistService.tamanho(self.disciplina), 2)
+
+    def test_exclusao_do_discente_nao_desalinha_a_fila(self):
+        """A entrada apagada em cascata não deixa buraco nas senhas."""
+        # Arrange
+        self._entrar(1, 2, 3)
+
+        # Act
+        self.discentes[2].delete()
+
+        # Assert
+        self.assertEqual(WaitlistService.posicao(self.discentes[1], self.disciplina), 1)
+        with self.assertNumQueries(1):
+            self.assertEqual(WaitlistService.posicao(self.discentes[3], self.disciplina), 2)
+        self.assertEqual(WaitlistService.tamanho(self.disciplina), 2)
+
+    def test_exclusao_de_varios_discentes_compacta_a_fila(self):
+        # Arrange
+        self._entrar(1, 2, 3)
+
+        # Act
+        Discente.objects.filter(pk__in=[2, 3]).delete()
+
+        # Assert
+        self.assertEqual(WaitlistService.posicao(self.discentes[3], self.disciplina), 1)
+        self.assertEqual(WaitlistService.tamanho(self.disciplina), 1)
+
+    def test_remocao_promove_a_cabeca_da_fila(self):
+        """A vaga liberada vai para o primeiro da fila na mesma transação."""
+        # Arrange
+        self._entrar(1, 2)
+
+        # Act
+        sucesso, _ = EnrollmentServiceV2.remover_disciplina(self.discentes[0], self.disciplina)
+
+        # Assert
+        self.assertTrue(sucesso)
+        self.disciplina.refresh_from_db()
+        self.assertEqual(self.disciplina.vagas, 0)
+        self.assertTrue(MatriculaDisciplina.objects.filter(
+            matricula__discente=self.discentes[1], disciplina=self.disciplina, ativa=True
+        ).exists())
+        promovida = EsperaDisciplina.objects.get(discente=self.discentes[1])
+        self.assertFalse(promovida.ativa)
+        self.assertIsNotNone(promovida.promovida_em)
+        self.assertEqual(WaitlistService.posicao(self.discentes[2], self.disciplina), 1)
+
+    def test_promocao_pula_quem_deixou_de_ser_elegivel(self):
+        """A cabeça trancada sai da fila e a vaga vai para o próximo."""
+        # Arrange
+        self._entrar(1, 2)
+        Discente.objects.filter(pk=2).update(status_academico="Trancado")
+
+        # Act
+        EnrollmentServiceV2.remover_disciplina(self.discentes[0], self.disciplina)
+
+        # Assert
+        esperas = {e.discente_id: e for e in EsperaDisciplina.objects.all()}
+        self.assertFalse(esperas[2].ativa)
+        self.assertIsNone(esperas[2].promovida_em)
+        self.assertIsNotNone(esperas[3].promovida_em)
+        self.assertEqual(WaitlistService.tamanho(self.disciplina), 0)
+        self.assertEqual(Disciplina.objects.get(pk=1).vagas, 0)
+
+    def test_remocao_sem_fila_devolve_a_vaga(self):
+        # Act
+        EnrollmentServiceV2.remover_disciplina(self.discentes[0], self.disciplina)
+
+        # Assert
+        self.assertEqual(Disciplina.objects.get(pk=1).vagas, 1)
+
+    def test_matricular_em_disciplina_lotada_entra_na_lista(self):
+        """Pela view, o pedido de matrícula sem vaga vira entrada na fila."""
+        # Act
+        self.client.post(reverse('core:matricular'), {
+            'discente_id': 2, 'disciplina_id': 1, 'redirect': 'student_dashboard',
+        })
+
+        # Assert
+        self.assertEqual(WaitlistService.posicao(self.discentes[1], self.disciplina), 1)
+        self.assertFalse(MatriculaDisciplina.objects.filter(matricula__discente=self.discentes[1]).exists())
+
+    def test_dashboard_mostra_posicao_e_permite_sair(self):
+        # Arrange
+        self._entrar(1, 2)
+
+        # Act
+        resposta = self.client.get(reverse('core:student_dashboard', args=[3]))
+        self.client.post(reverse('core:sair_lista_espera'), {
+            'discente_id': 2, 'disciplina_id': 1, 'redirect': 'student_dashboard',
+        })
+
+        # Assert
+        self.assertContains(resposta, "Posição 2 na lista")
+        self.assertContains(resposta, "Entrar na Lista de Espera")
+        self.assertIsNone(WaitlistService.posicao(self.discentes[1], self.disciplina))
+        self.assertEqual(WaitlistService.posicao(self.discentes[2], self.disciplina), 1)
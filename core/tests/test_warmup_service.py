@@ -0,0 +1,53 @@
+"""Testes do aquecimento em background e do estado de prontidão."""
+
+import threading
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from core.services.warmup_service import WarmupService
+
+
+class WarmupServiceTestCase(SimpleTestCase):
+    """Testes do WarmupService (sem acesso às APIs externas)."""
+
+    def test_background_reporta_warming_e_depois_ready(self):
+        """Enquanto sincroniza o estado é warming; ao terminar, ready."""
+        # Arrange
+        liberar = threading.Event()
+
+        def sincronizar():
+            liberar.wait(timeout=5)
+            return True, "ok"
+
+        # Act
+        thread = WarmupService.iniciar_em_background(sincronizar)
+        estado_durante = WarmupService.estado()
+        liberar.set()
+        thread.join(timeout=5)
+
+        # Assert
+        self.assertEqual(estado_durante, WarmupService.WARMING)
+        self.assertEqual(WarmupService.estado(), WarmupService.READY)
+        self.assertIsNotNone(WarmupService.concluido_em())
+
+    def test_falha_reporta_degraded(self):
+        """Falha (ou exceção) na sincronização deixa o estado degraded."""
+        def sincronizar():
+            raise RuntimeError("upstream fora do ar")
+
+        sucesso, msg = WarmupService.executar(sincronizar)
+
+        self.assertFalse(sucesso)
+        self.assertIn("upstream fora do ar", msg)
+        self.assertEqual(WarmupService.estado(), WarmupService.DEGRADED)
+
+    def test_endpoint_health(self):
+        """O endpoint de saúde expõe o estado atual em JSON."""
+        WarmupService.executar(lambda: (True, "Sistema inicializado"))
+
+        resp = self.client.get(reverse('core:health'))
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()['estado'], 'ready')
+        self.assertEqual(resp.json()['mensagem'], 'Sistema inicializado')
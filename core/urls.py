@@ -13,6 +13,7 @@ urlpatterns = [
     path('student/<int:discente_id>/', views.student_dashboard, name='student_dashboard'),
 
     # Sistema
+    path('health/', views.health, name='health'),
     path('reset-database/', views.reset_database, name='reset_database'),
     path('sincronizar-dados/', views.sincronizar_dados, name='sincronizar_dados'),
 
@@ -27,7 +28,9 @@ urlpatterns = [
 
     # Simulações (Escrita local)
     path('matricular/', views.matricular, name='matricular'),
+    path('matricular-lote/', views.matricular_lote, name='matricular_lote'),
     path('cancelar-matricula/', views.cancelar_matricula, name='cancelar_matricula'),
+    path('sair-lista-espera/', views.sair_lista_espera, name='sair_lista_espera'),
     path('reservar/', views.reservar_livro, name='reservar_livro'),
     path('cancelar-reserva/', views.cancelar_reserva, name='cancelar_reserva'),
 
@@ -9,16 +9,19 @@ import shutil
 from datetime import datetime
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.http import Http404
+from django.http import Http404, JsonResponse
 from django.db.models import Q, Count
 
 from .services.enrollment_service_v2 import EnrollmentServiceV2
 from .services.reservation_service_v2 import ReservationServiceV2
+from .services.waitlist_service import WaitlistService
 from .services.initialization_service import InitializationService
+from .services.warmup_service import WarmupService
+from .gateways.circuit_breaker import estado_breakers
+from .gateways.hedging import estado_hedgers
 from .models import (
     Discente, Disciplina, Livro,
-    Matricula, MatriculaDisciplina, ReservaLivro,
-    MatriculaSimulada, ReservaSimulada
+    MatriculaDisciplina, ReservaLivro,
 )
 
 
@@ -27,6 +30,29 @@ def portal(request):
     return render(request, 'core/portal.html')
 
 
+def health(request):
+    """Estado de prontidão do sistema (warming, ready ou degraded).
+
+    Inclui o estado do circuit breaker de cada microsserviço e as métricas
+    de hedging (quantos hedges foram disparados e quantos venceram). Responde
+    sempre 200: mesmo aquecendo ou degradado, as views servem os dados
+    locais disponíveis.
+    """
+    return JsonResponse({
+        **WarmupService.resumo(),
+        'circuitos': estado_breakers(),
+        'hedging': estado_hedgers(),
+    })
+
+
+def _avisar_sem_dados(request):
+    """Avisa que não há dados locais, diferenciando sincronização em andamento."""
+    if WarmupService.aquecendo():
+        messages.info(request, "Sincronização com os microsserviços em andamento. Recarregue em instantes.")
+    else:
+        messages.warning(request, "Sistema não inicializado. Execute: python manage.py inicializar_sistema")
+
+
 def index(request):
     """Página inicial antiga do sistema (mantida para compatibilidade)."""
     return render(request, 'core/index.html')
@@ -59,7 +85,7 @@ def discentes_list(request):
 
     # Verificar se sistema está inicializado
     if not discentes.exists():
-        messages.warning(request, "Sistema não inicializado. Execute: python manage.py inicializar_sistema")
+        _avisar_sem_dados(request)
 
     return render(request, 'core/discentes_list.html', {
         'discentes': discentes,
@@ -98,7 +124,7 @@ def disciplinas_list(request):
     disciplinas_qs = Disciplina.objects.all().order_by('nome')
 
     if not disciplinas_qs.exists():
-        messages.warning(request, "Sistema não inicializado. Execute: python manage.py inicializar_sistema")
+        _avisar_sem_dados(request)
 
     curso_filtro = request.GET.get('curso')
     if curso_filtro:
@@ -118,7 +144,7 @@ def livros_list(request):
     livros_qs = Livro.objects.all().order_by('titulo')
 
     if not livros_qs.exists():
-        messages.warning(request, "Sistema não inicializado. Execute: python manage.py inicializar_sistema")
+        _avisar_sem_dados(request)
 
     status_filtro = request.GET.get('status')
     if status_filtro:
@@ -131,7 +157,11 @@ def livros_list(request):
 
 
 def matricular(request):
-    """Adiciona disciplina à matrícula de um discente."""
+    """Adiciona disciplina à matrícula de um discente.
+
+    Disciplina lotada: o pedido vira entrada na lista de espera, como o
+    pedido de reserva de um livro reservado vira entrada na fila.
+    """
     if request.method != 'POST':
         return redirect('core:index')
 
@@ -149,6 +179,11 @@ def matricular(request):
 
         sucesso, mensagem = EnrollmentServiceV2.adicionar_disciplina(discente, disciplina)
 
+        if not sucesso:
+            disciplina.refresh_from_db(fields=['vagas'])
+            if disciplina.vagas <= 0:
+                sucesso, mensagem = WaitlistService.entrar(discente, disciplina)
+
         if sucesso:
             messages.success(request, mensagem)
         else:
@@ -168,6 +203,50 @@ def matricular(request):
     return redirect('core:discente_detail', discente_id=discente_id)
 
 
+def matricular_lote(request):
+    """Adiciona várias disciplinas à matrícula de um discente de uma vez.
+
+    Aceita `disciplina_ids` repetido no POST ou uma lista separada por
+    vírgulas; cada disciplina recebe sua própria mensagem.
+    """
+    if request.method != 'POST':
+        return redirect('core:index')
+
+    discente_id = request.POST.get('discente_id')
+    valores = request.POST.getlist('disciplina_ids')
+    redirect_to = request.POST.get('redirect', 'discente_detail')
+
+    ids_texto = [i.strip() for valor in valores for i in valor.split(',') if i.strip()]
+    if not discente_id or not ids_texto:
+        messages.error(request, "Informe o ID do discente e ao menos uma disciplina.")
+        return redirect('core:index')
+
+    try:
+        discente = Discente.objects.get(id=int(discente_id))
+        disciplina_ids = [int(i) for i in ids_texto]
+
+        resultados = EnrollmentServiceV2.adicionar_disciplinas(discente, disciplina_ids)
+
+        for sucesso, mensagem in resultados.values():
+            if sucesso:
+                messages.success(request, mensagem)
+            else:
+                messages.error(request, mensagem)
+
+    except Discente.DoesNotExist:
+        messages.error(request, "Discente não encontrado.")
+    except ValueError:
+        messages.error(request, "IDs inválidos. Digite números inteiros.")
+    except Exception as e:
+        messages.error(request, f"Erro inesperado: {str(e)}")
+
+    if redirect_to == 'student_dashboard':
+        return redirect('core:student_dashboard', discente_id=discente_id)
+    elif redirect_to == 'admin_dashboard':
+        return redirect('core:admin_dashboard')
+    return redirect('core:discente_detail', discente_id=discente_id)
+
+
 def cancelar_matricula(request):
     """Remove disciplina da matrícula."""
     if request.method != 'POST':
@@ -208,6 +287,44 @@ def cancelar_matricula(request):
     return redirect('core:discente_detail', discente_id=discente_id)
 
 
+def sair_lista_espera(request):
+    """Tira o discente da lista de espera de uma disciplina."""
+    if request.method != 'POST':
+        return redirect('core:index')
+
+    discente_id = request.POST.get('discente_id')
+    disciplina_id = request.POST.get('disciplina_id')
+    redirect_to = request.POST.get('redirect', 'discente_detail')
+
+    if not discente_id or not disciplina_id:
+        messages.error(request, "Informe o ID do discente e da disciplina.")
+        return redirect('core:index')
+
+    try:
+        discente = Discente.objects.get(id=int(discente_id))
+        disciplina = Disciplina.objects.get(id=int(disciplina_id))
+
+        sucesso, mensagem = WaitlistService.sair(discente, disciplina)
+
+        if sucesso:
+            messages.success(request, mensagem)
+        else:
+            messages.warning(request, mensagem)
+
+    except (Discente.DoesNotExist, Disciplina.DoesNotExist):
+        messages.error(request, "Discente ou disciplina não encontrados.")
+    except ValueError:
+        messages.error(request, "IDs inválidos.")
+    except Exception as e:
+        messages.error(request, f"Erro inesperado: {str(e)}")
+
+    if redirect_to == 'student_dashboard':
+        return redirect('core:student_dashboard', discente_id=discente_id)
+    elif redirect_to == 'admin_dashboard':
+        return redirect('core:admin_dashboard')
+    return redirect('core:discente_detail', discente_id=discente_id)
+
+
 def reservar_livro(request):
     """Reserva um livro para um discente."""
     if request.method != 'POST':
@@ -339,38 +456,47 @@ def minhas_reservas(request, discente_id):
 def sincronizar_dados(request):
     """Inicializa ou reinicializa o sistema consumindo dados dos microsserviços.
 
-    Útil para testes e demonstração.
+    Com `SINCRONIZACAO_INCREMENTAL` ativo, aplica apenas a diferença entre o
+    upstream e o cache local. Útil para testes e demonstração.
     """
-    if request.method == 'POST':
-        sucesso, msg = InitializationService.inicializar_sistema(forcar_reinicializacao=True)
+    sucesso, msg = _sincronizar()
 
-        if sucesso:
-            messages.success(request, msg)
-        else:
-            messages.error(request, msg)
+    if sucesso:
+        messages.success(request, msg)
+    else:
+        messages.error(request, msg)
 
+    if request.method == 'POST':
         # Verifica se há um parâmetro de redirect
         redirect_to = request.POST.get('redirect', 'core:index')
         if redirect_to == 'admin_dashboard':
             return redirect('core:admin_dashboard')
-        return redirect('core:index')
 
-    # Se não for POST, redireciona para inicialização
-    sucesso, msg = InitializationService.inicializar_sistema(forcar_reinicializacao=True)
+    return redirect('core:index')
 
-    if sucesso:
-        messages.success(request, msg)
-    else:
-        messages.error(request, msg)
 
-    return redirect('core:index')
+def _sincronizar() -> tuple[bool, str]:
+    """Executa a sincronização no modo configurado nas settings."""
+    from django.conf import settings
+
+    if getattr(settings, 'SINCRONIZACAO_INCREMENTAL', False):
+        return WarmupService.executar(InitializationService.sincronizar_incremental)
+    return WarmupService.executar(
+        lambda: InitializationService.inicializar_sistema(forcar_reinicializacao=True)
+    )
 
 
 def reset_database(request):
-    """Reinicializa o banco de dados - cria backup e recarrega dados da API."""
+    """Reinicializa o banco de dados - cria backup e recarrega dados da API.
+
+    Com `modo=incremental` no POST, não apaga as tabelas: apenas aplica a
+    diferença em relação ao upstream, mantendo matrículas e reservas.
+    """
     if request.method != 'POST':
         return redirect('core:portal')
 
+    incremental = request.POST.get('modo') == 'incremental'
+
     try:
         # Criar backup do banco de dados
         from django.conf import settings
@@ -386,18 +512,19 @@ def reset_database(request):
             shutil.copy2(db_path, backup_path)
             messages.success(request, f'Backup criado: {backup_path}')
 
-        # Limpar banco de dados (deletar todos os dados)
-        MatriculaDisciplina.objects.all().delete()
-        Matricula.objects.all().delete()
-        ReservaLivro.objects.all().delete()
-        Discente.objects.all().delete()
-        Disciplina.objects.all().delete()
-        Livro.objects.all().delete()
-        MatriculaSimulada.objects.all().delete()
-        ReservaSimulada.objects.all().delete()
-
-        # Reinicializar sistema com dados da API
-        sucesso, msg = InitializationService.inicializar_sistema(forcar_reinicializacao=True)
+        if incremental:
+            sucesso, msg = InitializationService.sincronizar_incremental()
+            if sucesso:
+                messages.success(request, msg)
+            else:
+                messages.error(request, 'Erro ao sincronizar: ' + msg)
+            return redirect('core:portal')
+
+        # Limpar o banco e reinicializar com dados da API (na mesma transação;
+        # um reset concorrente aguarda o que já está em andamento)
+        sucesso, msg = InitializationService.inicializar_sistema(
+            forcar_reinicializacao=True, limpar=True
+        )
 
         if sucesso:
             messages.success(request, 'Banco de dados reinicializado com sucesso! ' + msg)
@@ -454,6 +581,12 @@ def student_dashboard(request, discente_id):
         discente, apenas_ativas=True
     )
 
+    # Filas de reserva em que o discente aguarda (com a posição)
+    filas_reserva = ReservationServiceV2.listar_filas(discente)
+
+    # Listas de espera de disciplinas em que o discente aguarda (com a posição)
+    listas_espera = WaitlistService.listar_esperas(discente)
+
     # Obter disciplinas disponíveis (excluindo as já matriculadas)
     disciplinas_matriculadas_ids = [m.disciplina.id for m in matriculas_ativas]
     disciplinas_disponiveis = Disciplina.objects.exclude(
@@ -499,6 +632,8 @@ def student_dashboard(request, discente_id):
         'discente': discente,
         'matriculas_ativas': matriculas_ativas,
         'reservas_ativas': reservas_ativas,
+        'filas_reserva': filas_reserva,
+        'listas_espera': listas_espera,
         'disciplinas_disponiveis': disciplinas_disponiveis,
         'livros_disponiveis': livros_disponiveis,
         'cursos_disponiveis': cursos_disponiveis,
@@ -533,8 +668,8 @@ def admin_dashboard(request):
         'discente', 'livro'
     ).order_by('-reservada_em')
 
-    # Última sincronização (você pode adicionar um modelo para rastrear isso)
-    last_sync = None  # TODO: implementar rastreamento de sincronização
+    # Última sincronização concluída neste processo
+    last_sync = WarmupService.concluido_em()
 
     return render(request, 'core/admin_dashboard.html', {
         'total_discentes': total_discentes,
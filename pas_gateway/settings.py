@@ -1,5 +1,6 @@
 from pathlib import Path
 import os
+import tempfile
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -57,6 +58,23 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Escritas concorrentes (matrículas disputando vagas) esperam a trava
+        # em vez de falhar: BEGIN IMMEDIATE evita o "database is locked" na
+        # promoção de leitura para escrita, e o timeout é o tempo de espera.
+        # Vale para todo transaction.atomic: nenhum bloco atômico deve
+        # esperar a rede (a sincronização busca os dados antes de abrir a
+        # transação).
+        "OPTIONS": {
+            "transaction_mode": "IMMEDIATE",
+            "timeout": 20,
+        },
+        # Banco de teste em arquivo (no diretório temporário, fora do
+        # repositório): o SQLite em memória compartilhada usa travas por
+        # tabela que não respeitam o timeout, e os testes de concorrência
+        # das vagas dependem dele.
+        "TEST": {
+            "NAME": Path(tempfile.gettempdir()) / "pas_gateway_test_db.sqlite3",
+        },
     }
 }
 
@@ -86,3 +104,121 @@ STATICFILES_DIRS = [
 ]
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Pool de conexões HTTP (keep-alive) usado pelos gateways dos microsserviços.
+GATEWAY_HTTP_POOL_CONNECTIONS = int(os.environ.get("GATEWAY_HTTP_POOL_CONNECTIONS", 4))
+GATEWAY_HTTP_POOL_MAXSIZE = int(os.environ.get("GATEWAY_HTTP_POOL_MAXSIZE", 10))
+
+# Tamanho dos lotes de bulk_create/bulk_update na carga inicial dos dados.
+INICIALIZACAO_BATCH_SIZE = int(os.environ.get("INICIALIZACAO_BATCH_SIZE", 500))
+
+# Se True, o startup (e a sincronização manual) aplica só a diferença entre o
+# upstream e o cache local, mantendo matrículas e reservas. Se False (padrão),
+# o startup limpa todas as tabelas e recarrega tudo.
+SINCRONIZACAO_INCREMENTAL = os.environ.get("SINCRONIZACAO_INCREMENTAL", "0") == "1"
+
+# Se True, a sincronização de startup roda em um thread de background e o
+# servidor atende imediatamente com os dados locais (estado em /health/).
+INICIALIZACAO_EM_BACKGROUND = os.environ.get("INICIALIZACAO_EM_BACKGROUND", "0") == "1"
+
+# Snapshot em disco (JSON + gzip) do último payload completo dos microsserviços.
+# Com SNAPSHOT_HABILITADO, cada sincronização bem-sucedida grava o snapshot e o
+# startup hidrata o cache a partir dele antes de atualizar em background.
+SNAPSHOT_HABILITADO = os.environ.get("SNAPSHOT_HABILITADO", "0") == "1"
+SNAPSHOT_PATH = os.environ.get("SNAPSHOT_PATH", str(BASE_DIR / "snapshot.json.gz"))
+
+# Máximo de URLs com ETag/Last-Modified guardados para GETs condicionais.
+GATEWAY_HTTP_VALIDADORES_MAX = int(os.environ.get("GATEWAY_HTTP_VALIDADORES_MAX", 1024))
+
+# Cache em memória (TTL + LRU) das consultas de discente por ID, em segundos.
+# GATEWAY_DISCENTE_CACHE_STALE > 0 ativa o stale-while-revalidate.
+GATEWAY_DISCENTE_CACHE_MAX = int(os.environ.get("GATEWAY_DISCENTE_CACHE_MAX", 1024))
+GATEWAY_DISCENTE_CACHE_TTL = float(os.environ.get("GATEWAY_DISCENTE_CACHE_TTL", 60))
+GATEWAY_DISCENTE_CACHE_TTL_NEGATIVO = float(os.environ.get("GATEWAY_DISCENTE_CACHE_TTL_NEGATIVO", 10))
+GATEWAY_DISCENTE_CACHE_STALE = float(os.environ.get("GATEWAY_DISCENTE_CACHE_STALE", 0))
+
+# Retentativas de GET (falhas de conexão, 5xx e 429) com backoff exponencial
+# e jitter: espera aleatória entre 0 e min(BACKOFF_MAX, BACKOFF_BASE * 2^n).
+GATEWAY_HTTP_RETENTATIVAS = int(os.environ.get("GATEWAY_HTTP_RETENTATIVAS", 2))
+GATEWAY_HTTP_BACKOFF_BASE = float(os.environ.get("GATEWAY_HTTP_BACKOFF_BASE", 0.2))
+GATEWAY_HTTP_BACKOFF_MAX = float(os.environ.get("GATEWAY_HTTP_BACKOFF_MAX", 2.0))
+
+# Circuit breaker por URL base: abre quando a taxa de falha nas últimas
+# JANELA chamadas (mínimo MIN_CHAMADAS) atinge TAXA_FALHA; fica aberto por
+# COOLDOWN segundos e então deixa passar uma chamada de teste.
+GATEWAY_CIRCUITO_JANELA = int(os.environ.get("GATEWAY_CIRCUITO_JANELA", 20))
+GATEWAY_CIRCUITO_MIN_CHAMADAS = int(os.environ.get("GATEWAY_CIRCUITO_MIN_CHAMADAS", 5))
+GATEWAY_CIRCUITO_TAXA_FALHA = float(os.environ.get("GATEWAY_CIRCUITO_TAXA_FALHA", 0.5))
+GATEWAY_CIRCUITO_COOLDOWN = float(os.environ.get("GATEWAY_CIRCUITO_COOLDOWN", 30))
+
+# URLs base dos microsserviços. GATEWAY_UPSTREAM_LOCAL aponta os três para o
+# servidor fake (python manage.py servidor_fake), ex.: http://127.0.0.1:8099
+GATEWAY_UPSTREAM_LOCAL = os.environ.get("GATEWAY_UPSTREAM_LOCAL", "").rstrip("/")
+MS_ALUNO_BASE_URL = os.environ.get(
+    "MS_ALUNO_BASE_URL",
+    f"{GATEWAY_UPSTREAM_LOCAL}/msAluno" if GATEWAY_UPSTREAM_LOCAL
+    else "https://rmi6vdpsq8.execute-api.us-east-2.amazonaws.com/msAluno",
+)
+MS_DISCIPLINA_BASE_URL = os.environ.get(
+    "MS_DISCIPLINA_BASE_URL",
+    f"{GATEWAY_UPSTREAM_LOCAL}/disciplinaServico/msDisciplina" if GATEWAY_UPSTREAM_LOCAL
+    else "https://sswfuybfs8.execute-api.us-east-2.amazonaws.com/disciplinaServico/msDisciplina",
+)
+MS_BIBLIOTECA_BASE_URL = os.environ.get(
+    "MS_BIBLIOTECA_BASE_URL",
+    f"{GATEWAY_UPSTREAM_LOCAL}/acervo/biblioteca" if GATEWAY_UPSTREAM_LOCAL
+    else "https://qiiw8bgxka.execute-api.us-east-2.amazonaws.com/acervo/biblioteca",
+)
+
+
+# Hedging (GATEWAY_<SERVICO>_HEDGE=1): se a tentativa não responder dentro do
+# PERCENTIL de latência recente (mínimo ATRASO_MIN segundos), dispara um
+# segundo GET idêntico e usa a primeira resposta. CARGA_MAX limita a fração
+# de requisições que podem gerar hedge. THREADS é o pool das cópias; a
+# tentativa original roda na thread de quem chama.
+GATEWAY_HEDGE_PERCENTIL = float(os.environ.get("GATEWAY_HEDGE_PERCENTIL", 95))
+GATEWAY_HEDGE_ATRASO_MIN = float(os.environ.get("GATEWAY_HEDGE_ATRASO_MIN", 0.05))
+GATEWAY_HEDGE_CARGA_MAX = float(os.environ.get("GATEWAY_HEDGE_CARGA_MAX", 0.1))
+GATEWAY_HEDGE_THREADS = int(os.environ.get("GATEWAY_HEDGE_THREADS", 16))
+
+
+# Registro dos microsserviços: URL e ajustes de cada serviço. Todos os
+# gateways (e o UnifiedGateway) criam seus clientes a partir daqui. Cada
+# valor pode ser sobrescrito por variável de ambiente, ex.:
+# GATEWAY_LIVROS_TIMEOUT_LEITURA=8 ou GATEWAY_DISCENTES_POOL=20.
+# TIMEOUT_*: segundos (TIMEOUT_LISTA é a leitura do catálogo completo no
+# UnifiedGateway; padrão: TIMEOUT_LEITURA); POOL: conexões keep-alive;
+# RETENTATIVAS e PRAZO: orçamento de retentativas (PRAZO é o total em segundos); CACHE_TTL:
+# segundos em cache na memória (0 desliga); HEDGE: requisições com hedge.
+def _upstream(
+    nome: str,
+    url: str,
+    timeout_leitura: float,
+    cache_ttl: float = 0.0,
+    timeout_lista: float | None = None,
+) -> dict:
+    prefixo = f"GATEWAY_{nome.upper()}_"
+    leitura = float(os.environ.get(prefixo + "TIMEOUT_LEITURA", timeout_leitura))
+    return {
+        "URL": url,
+        "TIMEOUT_CONEXAO": float(os.environ.get(prefixo + "TIMEOUT_CONEXAO", 2.0)),
+        "TIMEOUT_LEITURA": leitura,
+        "TIMEOUT_LISTA": float(os.environ.get(
+            prefixo + "TIMEOUT_LISTA", timeout_lista if timeout_lista is not None else leitura
+        )),
+        "POOL": int(os.environ.get(prefixo + "POOL", GATEWAY_HTTP_POOL_MAXSIZE)),
+        "RETENTATIVAS": int(os.environ.get(prefixo + "RETENTATIVAS", GATEWAY_HTTP_RETENTATIVAS)),
+        "PRAZO": float(os.environ.get(prefixo + "PRAZO", 12.0)),
+        "CACHE_TTL": float(os.environ.get(prefixo + "CACHE_TTL", cache_ttl)),
+        "HEDGE": os.environ.get(prefixo + "HEDGE", "0") == "1",
+    }
+
+
+GATEWAY_UPSTREAMS = {
+    # Consulta por ID em 3s; a lista completa de discentes mantém os 5s
+    "discentes": _upstream(
+        "discentes", MS_ALUNO_BASE_URL, 3.0, cache_ttl=GATEWAY_DISCENTE_CACHE_TTL, timeout_lista=5.0
+    ),
+    "disciplinas": _upstream("disciplinas", MS_DISCIPLINA_BASE_URL, 5.0),
+    "livros": _upstream("livros", MS_BIBLIOTECA_BASE_URL, 5.0),
+}